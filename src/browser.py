@@ -0,0 +1,136 @@
+import json
+import threading
+from collections import defaultdict
+
+# Resource types Chrome should never download while scraping
+BLOCKED_EXTENSIONS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+]
+
+# Trackers and ad networks commonly embedded in WordPress themes
+DENY_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "adservice.google.com", "facebook.net", "facebook.com", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "tawk.to", "fonts.googleapis.com", "fonts.gstatic.com",
+    "youtube.com", "ytimg.com", "maps.googleapis.com", "gravatar.com",
+]
+
+# First-party hosts; with allow_only=True every other host fails to resolve
+ALLOW_DOMAINS = ["brokeragebd.com"]
+
+
+class BrowserProfile:
+    """Chrome settings for scraping: headless, eager loads, blocked resources."""
+
+    def __init__(self, headless=True, page_load_strategy="eager", block_resources=True,
+                 allow_only=False, allow_domains=None, deny_domains=None,
+                 window_size=(1280, 900), track_bandwidth=True):
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_resources = block_resources
+        self.allow_only = allow_only
+        self.allow_domains = list(ALLOW_DOMAINS if allow_domains is None else allow_domains)
+        self.deny_domains = list(DENY_DOMAINS if deny_domains is None else deny_domains)
+        self.window_size = window_size
+        self.track_bandwidth = track_bandwidth
+
+    def options(self):
+        """Build the Chrome Options for this profile."""
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        else:
+            options.add_argument("--start-maximized")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.page_load_strategy = self.page_load_strategy
+
+        if self.block_resources:
+            # Never decode images, even when they slip past the URL patterns
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.allow_only and self.allow_domains:
+            # Anything not on the allow list fails DNS, so third parties are never contacted
+            excludes = ", ".join(f"EXCLUDE {d}, EXCLUDE *.{d}" for d in self.allow_domains)
+            options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {excludes}")
+        if self.track_bandwidth:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return options
+
+    def blocked_url_patterns(self):
+        patterns = list(BLOCKED_EXTENSIONS) if self.block_resources else []
+        for domain in self.deny_domains:
+            if domain not in self.allow_domains:
+                patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+        return patterns
+
+    def create_driver(self, driver_path):
+        """Start Chrome with this profile and install the request blocklist.
+
+        With no `driver_path`, Selenium Manager locates a matching chromedriver.
+        """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        service = Service(driver_path)
+        driver = webdriver.Chrome(service=service, options=self.options())
+        patterns = self.blocked_url_patterns()
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return driver
+
+
+class BandwidthMeter:
+    """Count requests, bytes and blocked requests from Chrome's performance log."""
+
+    def __init__(self):
+        self.pages = 0
+        self.totals = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def collect(self, driver):
+        """Drain the performance log after a page load and add it to the totals.
+
+        Returns this page's {"requests", "bytes", "blocked"} counters.
+        """
+        page = {"requests": 0, "bytes": 0, "blocked": 0}
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return page
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            if method == "Network.requestWillBeSent":
+                page["requests"] += 1
+            elif method == "Network.loadingFinished":
+                page["bytes"] += int(message.get("params", {}).get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and message.get("params", {}).get("blockedReason"):
+                page["blocked"] += 1
+        with self._lock:
+            self.pages += 1
+            for key, value in page.items():
+                self.totals[key] += value
+        return page
+
+    def report(self):
+        with self._lock:
+            pages = self.pages
+            totals = dict(self.totals)
+        if not pages:
+            return
+        print(f"\nBrowser traffic over {pages} pages:")
+        print(f"  - Requests: {totals.get('requests', 0)} ({totals.get('requests', 0) / pages:.1f}/page)")
+        print(f"  - Downloaded: {totals.get('bytes', 0) / 1e6:.1f} MB ({totals.get('bytes', 0) / pages / 1e3:.0f} KB/page)")
+        print(f"  - Blocked requests: {totals.get('blocked', 0)}")
@@ -1,46 +1,191 @@
-import pandas as pd
+import argparse
+import os
 import re
-from utils import save_clean_data
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+from utils import save_clean_data, save_dataset, apply_schema, ensure_dir, CLEAN_DIR
+from slug_parser import parse_column
+from units import parse_price, parse_prices, parse_areas
+from near_dups import drop_near_duplicates
+from locations import normalize_locations
+from cube import AggregateCube, update_cube, CUBE_PATH
 
 def clean_price(price_str):
     """Convert prices like 'Tk 1.2 Crore' or '45 lakh' → numeric."""
-    if not isinstance(price_str, str):
+    return parse_price(price_str)
+
+def extract_area(title):
+    """Extract area from title (e.g. '1200 sqft')."""
+    if not isinstance(title, str):
         return None
+    match = re.search(r"(\d{3,5})\s*(sqft|sq\s?ft|sft|ft)", title.lower())
+    return int(match.group(1)) if match else None
 
-    price_str = price_str.lower().replace(",", "")
+def clean_dataset(path="data/raw/brokeragebd_raw.csv", store_format=None, near_duplicates=False,
+                  cube_path=None):
+    """Clean the raw data and save a structured dataset.
 
-    if "crore" in price_str:
-        num = float(re.findall(r"[\d.]+", price_str)[0])
-        return num * 10000000  # 1 crore = 10,000,000
+    Prices are re-parsed from the Price text with the same engine the
+    scraper uses (falling back to Price_BDT), and missing areas are taken
+    from the listing URL's slug. Every listing gets a canonical Neighborhood
+    and Sub_Area from the Dhaka gazetteer in locations.py. The result
+    carries the typed utils.LISTING_SCHEMA; with `store_format` ("parquet" or "arrow") it is
+    also written to the date-partitioned store as "listings_clean".
+    With `near_duplicates`, listings reposted under another URL are given a
+    shared Cluster_ID and only the first of each cluster is kept. With
+    `cube_path`, today's rows of that aggregate cube are rebuilt from the
+    result.
+    """
+    df = clean_rows(pd.read_csv(path, dtype=str, na_values=["N/A"]))
+    df = df.drop_duplicates()
+    if near_duplicates:
+        df = drop_near_duplicates(df)
 
-    if "lakh" in price_str:
-        num = float(re.findall(r"[\d.]+", price_str)[0])
-        return num * 100000  # 1 lakh = 100,000
+    save_clean_data(df, "brokeragebd_clean.csv")
+    if store_format:
+        save_dataset(df, "listings_clean", fmt=store_format)
+    if cube_path:
+        update_cube(df, cube_path=cube_path)
+    return df
 
-    match = re.findall(r"[\d.]+", price_str)
-    return float(match[0]) if match else None
+def clean_rows(df):
+    """Parse, type and filter one frame of raw rows (a whole file or one chunk)."""
+    df.columns = df.columns.str.strip()
 
-def extract_area(title):
-    """Extract area from title (e.g. '1200 sqft')."""
-    match = re.search(r"(\d{3,5})\s*(sqft|sft|ft)", title.lower())
-    return int(match.group(1)) if match else None
+    df["Price_BDT"] = parse_prices(df["Price"]).fillna(pd.to_numeric(df["Price_BDT"], errors="coerce"))
+    df["Area_sqft"] = parse_areas(df["Area_sqft"]).fillna(parse_column(df["URL"], "slug")["area_sqft"].astype("float64"))
+    df["Location"] = df["Location"].str.strip()
+    df[["Neighborhood", "Sub_Area"]] = normalize_locations(df["Location"], df["URL"])
 
-def clean_dataset(path="data/raw/brokeragebd_raw.csv"):
-    """Clean the raw data and save a structured dataset."""
-    df = pd.read_csv(path)
+    df = df.dropna(subset=["Price_BDT"])
+    return apply_schema(df)
 
-    df["price_clean"] = df["price"].apply(clean_price)
-    df["area_sqft"] = df["title"].apply(extract_area)
+# Rough pandas footprint of one raw row while a chunk is parsed (strings,
+# parsed columns and temporaries), used to size chunks from a memory budget
+ROW_BYTES_ESTIMATE = 4096
 
-    df["location"] = df["location"].str.strip()
+class FingerprintSet:
+    """Set of 64-bit row fingerprints: a sorted NumPy array, spilled to SQLite when full.
 
-    df = df.drop_duplicates()
-    df = df.dropna(subset=["price_clean"])
+    Up to `max_in_memory` fingerprints are held in RAM (8 bytes each).
+    Beyond that they move to an on-disk SQLite table, so memory stays
+    bounded however many rows have been seen.
+    """
 
-    save_clean_data(df, "brokeragebd_clean.csv")
-    return df
+    def __init__(self, max_in_memory=4_000_000, spill_dir=None):
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        self.values = np.empty(0, dtype=np.uint64)
+        self.db = None
+        self.db_path = None
+        self.count = 0
+
+    def add_new(self, fingerprints):
+        """Add a chunk's fingerprints; returns a mask of the rows not seen before (first per chunk)."""
+        fingerprints = np.asarray(fingerprints, dtype=np.uint64)
+        keep = np.zeros(len(fingerprints), dtype=bool)
+        unique, first = np.unique(fingerprints, return_index=True)
+        if self.db is None:
+            position = np.searchsorted(self.values, unique)
+            seen = np.zeros(len(unique), dtype=bool)
+            inside = position < len(self.values)
+            seen[inside] = self.values[position[inside]] == unique[inside]
+            keep[first[~seen]] = True
+            self.values = np.union1d(self.values, unique[~seen])
+            self.count = len(self.values)
+            if self.count > self.max_in_memory:
+                self._spill()
+            return keep
+
+        signed = unique.view(np.int64)
+        self.db.execute("DELETE FROM chunk")
+        self.db.executemany("INSERT INTO chunk VALUES (?)", ((int(v),) for v in signed))
+        existing = np.fromiter((row[0] for row in self.db.execute(
+            "SELECT chunk.fp FROM chunk JOIN seen ON seen.fp = chunk.fp")), dtype=np.int64)
+        self.db.execute("INSERT OR IGNORE INTO seen SELECT fp FROM chunk")
+        self.db.commit()
+        is_new = ~np.isin(signed, existing)
+        keep[first[is_new]] = True
+        self.count += int(is_new.sum())
+        return keep
+
+    def _spill(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".fingerprints.db", dir=self.spill_dir)
+        os.close(handle)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.execute("PRAGMA journal_mode=OFF")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE seen (fp INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self.db.execute("CREATE TEMP TABLE chunk (fp INTEGER)")
+        self.db.executemany("INSERT INTO seen VALUES (?)", ((int(v),) for v in self.values.view(np.int64)))
+        self.db.commit()
+        print(f"  {self.count:,} row fingerprints, spilling the dedup set to {self.db_path}")
+        self.values = np.empty(0, dtype=np.uint64)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            os.remove(self.db_path)
+            self.db = None
+
+def clean_dataset_streaming(path="data/raw/brokeragebd_raw.csv", filename="brokeragebd_clean.csv",
+                            memory_mb=256, spill_dir=None, cube_path=None):
+    """Clean the raw data chunk by chunk with memory bounded by `memory_mb`.
+
+    Three quarters of the budget sizes the read chunks, the rest holds row
+    fingerprints for deduplication across chunks (spilled to disk beyond
+    that). Each cleaned chunk is appended to CLEAN_DIR/filename, so the
+    output is the same as clean_dataset's without the file ever being in
+    memory at once. With `cube_path`, each chunk is also merged into today's
+    rows of that aggregate cube. Returns the number of rows written.
+    """
+    chunk_rows = max(1_000, int(memory_mb * 2 ** 20 * 0.75 / ROW_BYTES_ESTIMATE))
+    fingerprints = FingerprintSet(max_in_memory=max(10_000, int(memory_mb * 2 ** 20 * 0.25 / 8)), spill_dir=spill_dir)
+    ensure_dir(CLEAN_DIR)
+    output = os.path.join(CLEAN_DIR, filename)
+
+    cube = AggregateCube(cube_path) if cube_path else None
+    rows_in = rows_out = 0
+    first = True
+    try:
+        for chunk in pd.read_csv(path, dtype=str, na_values=["N/A"], chunksize=chunk_rows):
+            rows_in += len(chunk)
+            chunk = clean_rows(chunk)
+            chunk = chunk[fingerprints.add_new(pd.util.hash_pandas_object(chunk, index=False).to_numpy())]
+            chunk.to_csv(output, mode="w" if first else "a", header=first, index=False)
+            if cube:
+                cube.update(chunk, replace=first)
+            first = False
+            rows_out += len(chunk)
+            print(f"  {rows_in:,} rows read, {rows_out:,} written")
+    finally:
+        fingerprints.close()
+        if cube:
+            cube.close()
+
+    if first:
+        pd.DataFrame(columns=clean_rows(pd.read_csv(path, dtype=str, nrows=0)).columns).to_csv(output, index=False)
+    print(f"Saved cleaned data → {output} ({rows_out:,} of {rows_in:,} rows, chunks of {chunk_rows:,})")
+    return rows_out
 
 
 if __name__ == "__main__":
-    df = clean_dataset()
-    print(df.head())
+    parser = argparse.ArgumentParser(description="Clean the raw brokeragebd listings")
+    parser.add_argument("--input", default="data/raw/brokeragebd_raw.csv")
+    parser.add_argument("--store", choices=["parquet", "arrow"],
+                        help="also write a typed, date-partitioned copy to data/store/ (needs pyarrow)")
+    parser.add_argument("--stream", action="store_true",
+                        help="clean in chunks with bounded memory (for inputs larger than RAM)")
+    parser.add_argument("--near-dups", action="store_true",
+                        help="drop listings reposted under a different URL (MinHash over blocked candidates)")
+    parser.add_argument("--cube", nargs="?", const=CUBE_PATH,
+                        help="also update today's rows of the aggregate cube (see cube.py)")
+    parser.add_argument("--memory-mb", type=int, default=256, help="memory budget of --stream")
+    args = parser.parse_args()
+    if args.stream:
+        clean_dataset_streaming(args.input, memory_mb=args.memory_mb, cube_path=args.cube)
+    else:
+        df = clean_dataset(args.input, args.store, args.near_dups, args.cube)
+        print(df.head())
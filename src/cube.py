@@ -0,0 +1,281 @@
+import argparse
+import datetime
+import json
+import math
+import os
+import sqlite3
+import time
+
+CUBE_PATH = "data/store/listings_cube.db"
+
+# Cube key besides scrape_date. The canonical Neighborhood stands in for the
+# raw Location text, which splits one area across several spellings.
+DIMENSIONS = ("Neighborhood", "Property_Type", "For", "Bedroom")
+
+# Measured values: price and price per square foot
+METRICS = ("price", "ppsf")
+
+# Relative accuracy of the quantile sketches (1%)
+SKETCH_ACCURACY = 0.01
+GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+
+def sketch_index(value):
+    """Sketch bucket of a positive value: buckets grow by GAMMA, so any value is within 1% of its bucket's."""
+    return math.ceil(math.log(value) / LOG_GAMMA)
+
+
+def merge_sketches(sketches):
+    """Sum the bucket counts of several sketches ({bucket: count} dicts)."""
+    merged = {}
+    for sketch in sketches:
+        for bucket, count in sketch.items():
+            merged[bucket] = merged.get(bucket, 0) + count
+    return merged
+
+
+def sketch_quantile(sketch, q):
+    """Approximate q-quantile (0..1) of the values counted in a sketch; None if empty."""
+    total = sum(sketch.values())
+    if not total:
+        return None
+    rank = q * (total - 1)
+    seen = 0
+    for bucket in sorted(sketch):
+        seen += sketch[bucket]
+        if seen > rank:
+            return 2 * GAMMA ** bucket / (GAMMA + 1)
+    return 2 * GAMMA ** max(sketch) / (GAMMA + 1)
+
+
+def measure_columns(metric):
+    return [f"{metric}_count", f"{metric}_sum", f"{metric}_sumsq", f"{metric}_min", f"{metric}_max", f"{metric}_sketch"]
+
+
+class AggregateCube:
+    """Pre-aggregated listing statistics in SQLite, keyed by DIMENSIONS and scrape date.
+
+    Each row holds the listing count and, for price and price per sqft, the
+    count, sum, sum of squares, min, max and a mergeable quantile sketch.
+    A new snapshot only touches its own date's rows, and every measure merges
+    by addition, so rows from any set of dates and keys combine into exact
+    means and deviations and quantiles within SKETCH_ACCURACY.
+    """
+
+    def __init__(self, path=CUBE_PATH, dimensions=DIMENSIONS):
+        self.path = path
+        self.dimensions = tuple(dimensions)
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.columns = list(self.dimensions) + ["scrape_date"]
+        self.measures = ["listings"] + [column for metric in METRICS for column in measure_columns(metric)]
+        keys = ", ".join(f'"{column}" TEXT NOT NULL' for column in self.columns)
+        measures = ", ".join(f'"{column}" {"TEXT" if column.endswith("_sketch") else "REAL"}'
+                             for column in self.measures)
+        primary = ", ".join(f'"{column}"' for column in self.columns)
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS cube ({keys}, {measures}, PRIMARY KEY ({primary}))')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS cube_date ON cube (scrape_date)')
+        self.conn.commit()
+
+    def aggregate(self, df, scrape_date):
+        """Cube rows ({key tuple: measures dict}) of one batch of cleaned listings."""
+        import numpy as np
+        import pandas as pd
+
+        keys = pd.DataFrame({dimension: df[dimension].astype("string").fillna("") if dimension in df.columns
+                             else "" for dimension in self.dimensions}, index=df.index)
+        keys["scrape_date"] = str(scrape_date)
+        price = pd.to_numeric(df["Price_BDT"], errors="coerce").astype("float64")
+        area = pd.to_numeric(df["Area_sqft"], errors="coerce").astype("float64")
+        values = {"price": price, "ppsf": price / area.where(area > 0)}
+
+        rows = {key: {"listings": int(count)} for key, count in keys.groupby(self.columns).size().items()}
+        for metric, series in values.items():
+            valid = series.notna() & np.isfinite(series) & (series > 0)
+            frame = keys[valid].assign(value=series[valid])
+            stats = frame.assign(square=frame["value"] ** 2).groupby(self.columns).agg(
+                count=("value", "size"), sum=("value", "sum"), sumsq=("square", "sum"),
+                min=("value", "min"), max=("value", "max"))
+            for key, stat in stats.to_dict("index").items():
+                rows[key].update({f"{metric}_{part}": float(value) for part, value in stat.items()})
+            buckets = np.ceil(np.log(frame["value"].to_numpy()) / LOG_GAMMA).astype("int64")
+            counts = frame[self.columns].assign(bucket=buckets).groupby(self.columns + ["bucket"]).size()
+            for key_and_bucket, count in counts.items():
+                rows[key_and_bucket[:-1]].setdefault(f"{metric}_sketch", {})[int(key_and_bucket[-1])] = int(count)
+        return rows
+
+    def update(self, df, scrape_date=None, replace=False):
+        """Merge a batch of cleaned listings into the scrape date's rows.
+
+        With `replace`, the date's rows are dropped first, so loading a
+        snapshot again does not count it twice; without it the batch adds to
+        them (for chunks of one snapshot). Returns the number of rows touched.
+        """
+        scrape_date = str(scrape_date or datetime.date.today())
+        rows = self.aggregate(df, scrape_date)
+        if replace:
+            self.conn.execute("DELETE FROM cube WHERE scrape_date = ?", (scrape_date,))
+        elif rows:
+            for key, row in self.fetch([("scrape_date", "==", scrape_date)]).items():
+                if key in rows:
+                    rows[key] = merge_measures([rows[key], row])
+        names = ", ".join(f'"{column}"' for column in self.columns + self.measures)
+        placeholders = ", ".join("?" for _ in self.columns + self.measures)
+        self.conn.executemany(f"INSERT OR REPLACE INTO cube ({names}) VALUES ({placeholders})",
+                              [list(key) + [encode(column, row.get(column)) for column in self.measures]
+                               for key, row in rows.items()])
+        self.conn.commit()
+        return len(rows)
+
+    def fetch(self, filters=None):
+        """Cube rows matching `filters` ((column, op, value) tuples, ops ==, !=, <, <=, >, >=, in)."""
+        where, params = [], []
+        for column, op, value in filters or []:
+            if column not in self.columns:
+                raise ValueError(f"Unknown cube column: {column}")
+            if op == "in":
+                values = [str(item) for item in value]
+                where.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+            elif op in ("==", "!=", "<", "<=", ">", ">="):
+                where.append(f'"{column}" {"=" if op == "==" else op} ?')
+                params.append(str(value))
+            else:
+                raise ValueError(f"Unsupported filter op: {op}")
+        sql = f"SELECT * FROM cube{' WHERE ' + ' AND '.join(where) if where else ''}"
+        rows = {}
+        width = len(self.columns)
+        for record in self.conn.execute(sql, params):
+            rows[tuple(record[:width])] = {column: decode(column, value)
+                                           for column, value in zip(self.measures, record[width:])}
+        return rows
+
+    def query(self, group_by=("Neighborhood",), filters=None, quantiles=(0.5, 0.9)):
+        """Statistics per `group_by` combination, merged from the matching cube rows.
+
+        For each metric the result holds count, mean, std, min, max and the
+        asked-for quantiles (e.g. price_p50), one dict per group.
+        """
+        positions = [self.columns.index(column) for column in group_by]
+        groups = {}
+        for key, row in self.fetch(filters).items():
+            groups.setdefault(tuple(key[position] for position in positions), []).append(row)
+
+        result = []
+        for group, rows in sorted(groups.items()):
+            merged = merge_measures(rows)
+            entry = dict(zip(group_by, group))
+            entry["listings"] = int(merged["listings"])
+            for metric in METRICS:
+                entry.update(summarize(merged, metric, quantiles))
+            result.append(entry)
+        return result
+
+    def export_csv(self, path, group_by=None, filters=None):
+        """Write query() rows (by default one per cube key) to a CSV for Tableau or a dashboard."""
+        import csv
+
+        rows = self.query(group_by or self.columns, filters)
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else list(group_by or self.columns))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Saved {len(rows)} aggregate rows → {path}")
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+def encode(column, value):
+    if column.endswith("_sketch"):
+        return json.dumps(value or {})
+    return value
+
+
+def decode(column, value):
+    if column.endswith("_sketch"):
+        return {int(bucket): count for bucket, count in json.loads(value or "{}").items()}
+    return value
+
+
+def merge_measures(rows):
+    """Combine measure dicts: counts and sums add, min/max take the extremes, sketches merge."""
+    merged = {"listings": sum(row.get("listings") or 0 for row in rows)}
+    for metric in METRICS:
+        for part in ("count", "sum", "sumsq"):
+            merged[f"{metric}_{part}"] = sum(row.get(f"{metric}_{part}") or 0 for row in rows)
+        lows = [row[f"{metric}_min"] for row in rows if row.get(f"{metric}_min") is not None]
+        highs = [row[f"{metric}_max"] for row in rows if row.get(f"{metric}_max") is not None]
+        merged[f"{metric}_min"] = min(lows) if lows else None
+        merged[f"{metric}_max"] = max(highs) if highs else None
+        merged[f"{metric}_sketch"] = merge_sketches(row.get(f"{metric}_sketch") or {} for row in rows)
+    return merged
+
+
+def summarize(merged, metric, quantiles):
+    count = merged[f"{metric}_count"]
+    mean = merged[f"{metric}_sum"] / count if count else None
+    variance = merged[f"{metric}_sumsq"] / count - mean ** 2 if count else None
+    summary = {f"{metric}_count": int(count), f"{metric}_mean": mean,
+               f"{metric}_std": math.sqrt(max(variance, 0.0)) if count else None,
+               f"{metric}_min": merged[f"{metric}_min"], f"{metric}_max": merged[f"{metric}_max"]}
+    for q in quantiles:
+        summary[f"{metric}_p{round(q * 100)}"] = sketch_quantile(merged[f"{metric}_sketch"], q)
+    return summary
+
+
+def update_cube(path_or_df, scrape_date=None, cube_path=CUBE_PATH):
+    """Load one cleaned snapshot (a CSV path or a frame) into the cube, replacing that date."""
+    from utils import read_listings
+
+    df = read_listings(path_or_df) if isinstance(path_or_df, str) else path_or_df
+    cube = AggregateCube(cube_path)
+    try:
+        rows = cube.update(df, scrape_date, replace=True)
+    finally:
+        cube.close()
+    print(f"Updated {rows} cube rows for {scrape_date or datetime.date.today()} → {cube_path}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally maintained neighborhood aggregate cube")
+    parser.add_argument("--cube", default=CUBE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update = commands.add_parser("update", help="merge a cleaned snapshot into the cube (replaces its date)")
+    update.add_argument("--input", default="data/cleaned/brokeragebd_clean.csv")
+    update.add_argument("--date", help="scrape date of the snapshot, YYYY-MM-DD (default: today)")
+
+    query = commands.add_parser("query", help="print statistics grouped by cube columns")
+    query.add_argument("--by", nargs="+", default=["Neighborhood"])
+    query.add_argument("--where", nargs="*", default=[], metavar="COLUMN=VALUE")
+
+    export = commands.add_parser("export", help="write pre-aggregated rows to a CSV for dashboards")
+    export.add_argument("--output", default="data/cleaned/listings_cube.csv")
+    export.add_argument("--by", nargs="+")
+
+    args = parser.parse_args()
+    if args.command == "update":
+        update_cube(args.input, args.date, args.cube)
+    else:
+        cube = AggregateCube(args.cube)
+        if args.command == "query":
+            filters = [(item.split("=", 1)[0], "==", item.split("=", 1)[1]) for item in args.where]
+            start = time.perf_counter()
+            rows = cube.query(args.by, filters)
+            elapsed = time.perf_counter() - start
+            for row in rows:
+                print({key: round(value, 1) if isinstance(value, float) else value for key, value in row.items()})
+            print(f"{len(rows)} groups in {elapsed * 1000:.1f} ms")
+        else:
+            cube.export_csv(args.output, args.by)
+        cube.close()
@@ -0,0 +1,235 @@
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Pages a browser session serves before it is replaced with a fresh one
+MAX_PAGES_PER_SESSION = 150
+
+# Replace a session once chromedriver and its Chrome processes use more than
+# this much memory (checked every RSS_CHECK_EVERY pages; needs psutil)
+MAX_SESSION_RSS_MB = 1024
+RSS_CHECK_EVERY = 10
+
+# Error text WebDriver raises once the browser or chromedriver is gone
+CRASH_MARKERS = ("invalid session id", "chrome not reachable", "session deleted", "disconnected",
+                 "tab crashed", "target window already closed", "no such window", "max retries exceeded",
+                 "connection refused", "failed to establish a new connection")
+
+
+def is_session_crash(error):
+    """True if `error` means the browser session died, not that the page was bad."""
+    if isinstance(error, ConnectionError):
+        return True
+    if type(error).__name__ in ("InvalidSessionIdException", "NoSuchWindowException", "MaxRetryError"):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in CRASH_MARKERS)
+
+
+def session_rss_mb(driver):
+    """Resident memory of chromedriver plus every Chrome process under it, or None without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        service = psutil.Process(driver.service.process.pid)
+        processes = [service] + service.children(recursive=True)
+        return sum(process.memory_info().rss for process in processes) / 2 ** 20
+    except Exception:
+        return None
+
+
+class DriverSession:
+    """A started WebDriver and how many pages it has served."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """Warm WebDriver sessions shared by the worker threads.
+
+    Workers check a session out with `acquire()` and hand it back with
+    `release()`. A returned session goes back on the idle list for the next
+    URL unless it has served `max_pages` pages or its memory passed
+    `max_rss_mb`, in which case it is quit and the next acquire starts a
+    fresh one. Sessions that failed are always quit.
+    """
+
+    def __init__(self, create_driver, max_pages=MAX_PAGES_PER_SESSION, max_rss_mb=MAX_SESSION_RSS_MB):
+        self.create_driver = create_driver
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.stats = {"started": 0, "recycled_pages": 0, "recycled_memory": 0, "crashed": 0, "retried": 0}
+        self._idle = []
+        self._sessions = []
+        self._lock = threading.Lock()
+        if max_rss_mb and importlib.util.find_spec("psutil") is None:
+            print(f"Warning: psutil is not installed, so browser sessions are not recycled at {max_rss_mb} MB "
+                  f"(pip install psutil)")
+
+    def acquire(self):
+        """A warm idle session, or a newly started one if none is idle."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        session = DriverSession(self.create_driver())
+        with self._lock:
+            self._sessions.append(session)
+            self.stats["started"] += 1
+        return session
+
+    def release(self, session, failed=False, crashed=False):
+        """Return a session after one page; recycle it if it is spent, failed or crashed."""
+        session.pages += 1
+        reason = None
+        if crashed:
+            reason = "crashed"
+        elif failed:
+            reason = "failed"
+        elif self.max_pages and session.pages >= self.max_pages:
+            reason = "recycled_pages"
+        elif self.max_rss_mb and session.pages % RSS_CHECK_EVERY == 0:
+            rss = session_rss_mb(session.driver)
+            if rss is not None and rss > self.max_rss_mb:
+                print(f"    Browser session at {rss:.0f} MB after {session.pages} pages, restarting it")
+                reason = "recycled_memory"
+
+        if reason is None:
+            with self._lock:
+                self._idle.append(session)
+            return
+        with self._lock:
+            if reason in self.stats:
+                self.stats[reason] += 1
+            if session in self._sessions:
+                self._sessions.remove(session)
+        quit_driver(session.driver)
+
+    def note_retry(self):
+        with self._lock:
+            self.stats["retried"] += 1
+
+    def close(self):
+        """Quit every session the pool has started."""
+        with self._lock:
+            sessions, self._sessions, self._idle = self._sessions, [], []
+        for session in sessions:
+            quit_driver(session.driver)
+
+    def report(self):
+        stats = self.stats
+        if not stats["started"]:
+            return
+        print(f"\nBrowser sessions: {stats['started']} started, {stats['recycled_pages']} recycled after "
+              f"{self.max_pages} pages, {stats['recycled_memory']} over {self.max_rss_mb} MB, "
+              f"{stats['crashed']} crashed ({stats['retried']} URLs retried)")
+
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def scrape_in_parallel(urls, task, create_driver, workers=4, pool=None, crash_retries=2):
+    """Run task(get_driver, url) for every URL on a pool of browser sessions.
+
+    Returns a list of (result, error) tuples in the same order as `urls`;
+    see iter_scrape_in_parallel.
+    """
+    return list(iter_scrape_in_parallel(urls, task, create_driver, workers, pool, crash_retries))
+
+
+def iter_scrape_in_parallel(urls, task, create_driver, workers=4, pool=None, crash_retries=2):
+    """Yield (result, error) for every URL in `urls` order as the workers finish them.
+
+    `get_driver()` checks a warm session out of the pool, starting one on
+    first use, so tasks that can finish without a browser never launch
+    Chrome. A failing URL only loses its own result and its session; if the
+    session crashed, the URL is retried on another session up to
+    `crash_retries` times. Pass a DriverPool to keep its sessions warm
+    across calls; the caller then closes it. Results are handed over as
+    soon as every earlier URL is done, so a consumer that writes them out
+    holds only the few that finished early.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool(create_driver)
+    total = len(urls)
+    done = [0]
+    done_lock = threading.Lock()
+
+    def attempt(url):
+        held = []
+
+        def get_driver():
+            if not held:
+                held.append(pool.acquire())
+            return held[0].driver
+
+        try:
+            result = (task(get_driver, url), None)
+        except Exception as e:
+            result = (None, e)
+        if held:
+            error = result[1]
+            pool.release(held[0], failed=error is not None, crashed=error is not None and is_session_crash(error))
+        return result
+
+    def run_one(idx, url):
+        result = attempt(url)
+        for retry in range(crash_retries):
+            if result[1] is None or not is_session_crash(result[1]):
+                break
+            pool.note_retry()
+            print(f"    Browser session died on {url[:80]}, retrying on another session ({retry + 1}/{crash_retries})")
+            result = attempt(url)
+        with done_lock:
+            done[0] += 1
+            count = done[0]
+        status = "✓" if result[1] is None else f"✗ {result[1]}"
+        print(f"[{count}/{total}] #{idx} {status}: {url[:80]}")
+        return result
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for result in executor.map(run_one, range(1, total + 1), urls):
+                yield result
+    finally:
+        if own_pool:
+            pool.close()
+    elapsed = time.perf_counter() - start
+
+    if total:
+        print(f"Scraped {total} pages with {workers} workers in {elapsed:.1f}s "
+              f"({pages_per_minute(total, elapsed):.1f} pages/min)")
+
+
+def pages_per_minute(pages, seconds):
+    """Throughput helper used by the progress and benchmark reports."""
+    return pages * 60 / seconds if seconds > 0 else 0.0
+
+
+def benchmark_worker_counts(urls, task, create_driver, worker_counts=(1, 2, 4, 8), pool=None):
+    """Scrape the same sample of URLs with each worker count and report pages/min."""
+    report = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = scrape_in_parallel(urls, task, create_driver, workers, pool)
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for _, error in results if error is not None)
+        report[workers] = pages_per_minute(len(urls), elapsed)
+        print(f"  workers={workers}: {report[workers]:.1f} pages/min ({failed} failed)")
+
+    print("\nThroughput by worker count:")
+    print(f"  {'workers':>7} | {'pages/min':>9}")
+    for workers, rate in report.items():
+        print(f"  {workers:>7} | {rate:>9.1f}")
+    return report
@@ -0,0 +1,242 @@
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import zlib
+
+from locations import resolve
+import sinks
+from sinks import RECORD_COLUMNS
+
+HISTORY_PATH = "data/store/history.db"
+
+# A full copy of the listings is kept every this many snapshots, so state_at()
+# replays at most this many deltas
+CHECKPOINT_EVERY = 30
+
+TRACKED_COLUMNS = [column for column in RECORD_COLUMNS if column != "URL"]
+
+
+def to_price(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def record_hash(record):
+    return zlib.crc32(json.dumps([record.get(column) for column in TRACKED_COLUMNS]).encode())
+
+
+def read_records(path):
+    """{URL: record} of a listings file in any sinks format, values kept as text ("N/A" → None)."""
+    records = {}
+    for row in sinks.read_records(path):
+        url = row.get("URL")
+        if not url or url == "N/A" or url in records:
+            continue
+        values = {column: sinks.as_text(row.get(column)) for column in TRACKED_COLUMNS}
+        records[url] = {column: value if value not in ("", "N/A") else None for column, value in values.items()}
+    return records
+
+
+class SnapshotHistory:
+    """Crawl snapshots stored as deltas against the previous one, keyed by URL.
+
+    Each snapshot records only the listings added, removed or changed (with
+    the old and new value of every changed field), plus a full checkpoint
+    every CHECKPOINT_EVERY snapshots. The latest state is kept in `current`
+    for diffing the next crawl. Price changes also go to an indexed table, so
+    per-URL histories and price drops by neighborhood and date are index
+    lookups rather than scans over snapshots.
+    """
+
+    def __init__(self, path=HISTORY_PATH, checkpoint_every=CHECKPOINT_EVERY):
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY, scrape_date TEXT NOT NULL, listings INTEGER,
+                added INTEGER, removed INTEGER, changed INTEGER, checkpoint INTEGER);
+            CREATE TABLE IF NOT EXISTS current (url TEXT PRIMARY KEY, hash INTEGER, record TEXT);
+            CREATE TABLE IF NOT EXISTS changes (
+                snapshot_id INTEGER, url TEXT, kind TEXT, old TEXT, new TEXT);
+            CREATE INDEX IF NOT EXISTS changes_url ON changes (url, snapshot_id);
+            CREATE TABLE IF NOT EXISTS checkpoints (snapshot_id INTEGER, url TEXT, record TEXT);
+            CREATE INDEX IF NOT EXISTS checkpoints_snapshot ON checkpoints (snapshot_id);
+            CREATE TABLE IF NOT EXISTS price_changes (
+                snapshot_id INTEGER, scrape_date TEXT, url TEXT, neighborhood TEXT COLLATE NOCASE,
+                old_price REAL, new_price REAL);
+            CREATE INDEX IF NOT EXISTS price_changes_area ON price_changes (neighborhood, scrape_date);
+            CREATE INDEX IF NOT EXISTS price_changes_url ON price_changes (url, snapshot_id);
+        """)
+        self.conn.commit()
+
+    def add_snapshot(self, records, scrape_date=None):
+        """Store a crawl ({URL: record}) as a delta against the current state.
+
+        Returns counts of added, removed and changed listings. Snapshots must
+        be added in date order: a `scrape_date` before the last snapshot's
+        raises ValueError, since the deltas would be taken against a later
+        state.
+        """
+        scrape_date = str(scrape_date or datetime.date.today())
+        last_date = self.conn.execute("SELECT scrape_date FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        if last_date and scrape_date < last_date[0]:
+            raise ValueError(f"snapshot dated {scrape_date} is older than the last one ({last_date[0]})")
+        current = {url: (hash_, record) for url, hash_, record in self.conn.execute("SELECT url, hash, record FROM current")}
+        number = self.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+        checkpoint = number % self.checkpoint_every == 0
+        snapshot_id = self.conn.execute(
+            "INSERT INTO snapshots (scrape_date, listings, checkpoint) VALUES (?, ?, ?)",
+            (scrape_date, len(records), int(checkpoint))).lastrowid
+
+        changes, prices, upserts = [], [], []
+        for url, record in records.items():
+            hash_ = record_hash(record)
+            if url not in current:
+                changes.append((snapshot_id, url, "added", None, json.dumps(record)))
+                prices.append(self._price_row(snapshot_id, scrape_date, url, record, None))
+                upserts.append((url, hash_, json.dumps(record)))
+                continue
+            if current[url][0] == hash_:
+                continue
+            previous = json.loads(current[url][1])
+            old = {column: previous.get(column) for column in TRACKED_COLUMNS if previous.get(column) != record.get(column)}
+            if not old:
+                continue
+            new = {column: record.get(column) for column in old}
+            changes.append((snapshot_id, url, "changed", json.dumps(old), json.dumps(new)))
+            if "Price_BDT" in old:
+                prices.append(self._price_row(snapshot_id, scrape_date, url, record, previous))
+            upserts.append((url, hash_, json.dumps(record)))
+        removed = [url for url in current if url not in records]
+        changes.extend((snapshot_id, url, "removed", current[url][1], None) for url in removed)
+
+        added = sum(1 for change in changes if change[2] == "added")
+        changed = sum(1 for change in changes if change[2] == "changed")
+        self.conn.executemany("INSERT INTO changes VALUES (?, ?, ?, ?, ?)", changes)
+        self.conn.executemany("INSERT INTO price_changes VALUES (?, ?, ?, ?, ?, ?)",
+                              [row for row in prices if row[5] is not None or row[4] is not None])
+        self.conn.executemany("INSERT OR REPLACE INTO current VALUES (?, ?, ?)", upserts)
+        self.conn.executemany("DELETE FROM current WHERE url = ?", [(url,) for url in removed])
+        if checkpoint:
+            self.conn.executemany("INSERT INTO checkpoints VALUES (?, ?, ?)",
+                                  [(snapshot_id, url, json.dumps(record)) for url, record in records.items()])
+        self.conn.execute("UPDATE snapshots SET added = ?, removed = ?, changed = ? WHERE id = ?",
+                          (added, len(removed), changed, snapshot_id))
+        self.conn.commit()
+        return {"snapshot": snapshot_id, "added": added, "removed": len(removed), "changed": changed,
+                "checkpoint": checkpoint}
+
+    @staticmethod
+    def _price_row(snapshot_id, scrape_date, url, record, previous):
+        neighborhood = resolve(record.get("Location"))[0] or record.get("Location")
+        return (snapshot_id, scrape_date, url, neighborhood,
+                to_price(previous.get("Price_BDT")) if previous else None, to_price(record.get("Price_BDT")))
+
+    def price_history(self, url):
+        """[(scrape_date, price)] of one listing, from when it was first seen."""
+        return [(date, price) for date, price in self.conn.execute(
+            "SELECT scrape_date, new_price FROM price_changes WHERE url = ? ORDER BY snapshot_id", (url,))]
+
+    def price_drops(self, neighborhood=None, since=None, until=None):
+        """Price decreases as dicts (url, scrape_date, old/new price, change %), largest drop first.
+
+        `neighborhood` is a canonical name such as "Gulshan"; `since` and
+        `until` are inclusive YYYY-MM-DD dates.
+        """
+        where, params = ["new_price < old_price", "old_price > 0"], []
+        if neighborhood:
+            where.append("neighborhood = ?")
+            params.append(neighborhood)
+        if since:
+            where.append("scrape_date >= ?")
+            params.append(str(since))
+        if until:
+            where.append("scrape_date <= ?")
+            params.append(str(until))
+        rows = self.conn.execute(
+            f"SELECT url, scrape_date, neighborhood, old_price, new_price FROM price_changes "
+            f"WHERE {' AND '.join(where)} ORDER BY (new_price - old_price) / old_price", params)
+        return [{"url": url, "scrape_date": date, "neighborhood": area, "old_price": old, "new_price": new,
+                 "change_pct": round((new - old) / old * 100, 2)} for url, date, area, old, new in rows]
+
+    def state_at(self, scrape_date):
+        """{URL: record} as of the last snapshot on or before `scrape_date`.
+
+        Starts from the latest checkpoint at or before it and replays the
+        deltas after that checkpoint.
+        """
+        last = self.conn.execute("SELECT MAX(id) FROM snapshots WHERE scrape_date <= ?",
+                                 (str(scrape_date),)).fetchone()[0]
+        if last is None:
+            return {}
+        base = self.conn.execute("SELECT MAX(id) FROM snapshots WHERE checkpoint = 1 AND id <= ?",
+                                 (last,)).fetchone()[0]
+        state = {url: json.loads(record) for url, record in self.conn.execute(
+            "SELECT url, record FROM checkpoints WHERE snapshot_id = ?", (base,))}
+        for url, kind, new in self.conn.execute(
+                "SELECT url, kind, new FROM changes WHERE snapshot_id > ? AND snapshot_id <= ? "
+                "ORDER BY snapshot_id", (base, last)):
+            if kind == "removed":
+                state.pop(url, None)
+            elif kind == "added":
+                state[url] = json.loads(new)
+            else:
+                state[url].update(json.loads(new))
+        return state
+
+    def snapshots(self):
+        return [dict(zip(("id", "scrape_date", "listings", "added", "removed", "changed", "checkpoint"), row))
+                for row in self.conn.execute("SELECT id, scrape_date, listings, added, removed, changed, "
+                                             "checkpoint FROM snapshots ORDER BY id")]
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delta-encoded crawl history and price-change timelines")
+    parser.add_argument("--db", default=HISTORY_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="store a crawl as a delta against the previous one")
+    add.add_argument("--input", default="data/raw/brokeragebd_raw.csv")
+    add.add_argument("--date", help="scrape date, YYYY-MM-DD (default: today)")
+
+    history = commands.add_parser("history", help="price history of one listing")
+    history.add_argument("url")
+
+    drops = commands.add_parser("drops", help="price drops, largest first")
+    drops.add_argument("--neighborhood")
+    drops.add_argument("--since", help="YYYY-MM-DD (default: first day of this month)")
+    drops.add_argument("--until")
+
+    commands.add_parser("log", help="list stored snapshots")
+
+    args = parser.parse_args()
+    store = SnapshotHistory(args.db)
+    if args.command == "add":
+        try:
+            print(store.add_snapshot(read_records(args.input), args.date))
+        except ValueError as e:
+            store.close()
+            parser.error(str(e))
+    elif args.command == "history":
+        for date, price in store.price_history(args.url):
+            print(f"{date}  {price:,.0f}" if price is not None else f"{date}  N/A")
+    elif args.command == "drops":
+        since = args.since or datetime.date.today().replace(day=1)
+        for drop in store.price_drops(args.neighborhood, since, args.until):
+            print(drop)
+    else:
+        for snapshot in store.snapshots():
+            print(snapshot)
+    store.close()
@@ -0,0 +1,157 @@
+import functools
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+INDEX_NAME = "index.jsonl"
+
+
+class HtmlArchive:
+    """Content-addressed archive of every fetched page, one gzip segment per run.
+
+    Each page body is written once as its own gzip member in
+    `segment-<run_id>.gz` (so `zcat` reads a whole segment) and an index line
+    records url, kind, sha1 and the member's offset/length. A body whose
+    sha1 is already archived by any run is not written again; its index line
+    points at the existing copy.
+
+    Not opened by default: `store()` does nothing until `open()` is called.
+    """
+
+    def __init__(self):
+        self.folder = None
+        self.segment_name = None
+        self.known = {}
+        self.stored = 0
+        self.deduplicated = 0
+        self._segment = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self._segment is not None
+
+    def open(self, folder, run_id=None):
+        """Start this run's segment in `folder`, reading the existing index for dedup."""
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.known = {entry["sha1"]: (entry["segment"], entry["offset"], entry["length"])
+                      for entry in load_index(folder)}
+        run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self.segment_name = f"segment-{run_id}.gz"
+        self._segment = open(os.path.join(folder, self.segment_name), "ab")
+        self._index = open(os.path.join(folder, INDEX_NAME), "a", encoding="utf-8")
+
+    def store(self, url, html, kind):
+        """Archive one page; `kind` is "listing" or "detail"."""
+        if not self.enabled or not html:
+            return
+        body = html.encode("utf-8")
+        sha1 = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            location = self.known.get(sha1)
+            if location is None:
+                member = gzip.compress(body, compresslevel=6)
+                offset = self._segment.tell()
+                self._segment.write(member)
+                # Body on disk before its index line: an index line never points past the segment's end
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+                location = self.known[sha1] = (self.segment_name, offset, len(member))
+                self.stored += 1
+            else:
+                self.deduplicated += 1
+            segment, offset, length = location
+            entry = {"url": url, "kind": kind, "sha1": sha1, "segment": segment,
+                     "offset": offset, "length": length, "fetched_at": time.time()}
+            self._index.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._segment is None:
+                return
+            self._segment.close()
+            self._index.close()
+            self._segment = self._index = None
+
+    def report(self):
+        if self.stored or self.deduplicated:
+            print(f"\nHTML archive: {self.stored} pages stored, {self.deduplicated} unchanged "
+                  f"→ {os.path.join(self.folder, self.segment_name)}")
+
+
+def load_index(folder):
+    """Every index entry in `folder`, oldest first; truncated lines are skipped."""
+    path = os.path.join(folder, INDEX_NAME)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def latest_entries(folder, kind):
+    """url → newest index entry of `kind`, in the order the URLs were first archived."""
+    latest = {}
+    for entry in load_index(folder):
+        if entry["kind"] == kind:
+            latest[entry["url"]] = entry
+    return latest
+
+
+def read_page(folder, entry, handle=None):
+    """HTML of one archived page."""
+    if handle is None:
+        with open(os.path.join(folder, entry["segment"]), "rb") as f:
+            return read_page(folder, entry, f)
+    handle.seek(entry["offset"])
+    return gzip.decompress(handle.read(entry["length"])).decode("utf-8")
+
+
+def _map_batch(folder, batch, func):
+    handles = {}
+    results = []
+    try:
+        for entry in batch:
+            handle = handles.get(entry["segment"])
+            if handle is None:
+                handle = handles[entry["segment"]] = open(os.path.join(folder, entry["segment"]), "rb")
+            try:
+                results.append(func(entry["url"], read_page(folder, entry, handle)))
+            except Exception as e:
+                print(f"    Could not re-extract {entry['url'][:80]}: {e}")
+                results.append(None)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return results
+
+
+def map_pages(folder, entries, func, workers=None, batch_size=200):
+    """[func(url, html)] for the archived pages, in entry order, across `workers` processes.
+
+    `func` must be a module-level function so it can be sent to the worker
+    processes; a page it raises on yields None.
+    """
+    batches = [entries[i:i + batch_size] for i in range(0, len(entries), batch_size)]
+    task = functools.partial(_map_batch, folder, func=func)
+    if workers == 1 or len(batches) <= 1:
+        return [result for batch in batches for result in task(batch)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for done, batch_results in enumerate(executor.map(task, batches), 1):
+            results.extend(batch_results)
+            if done % 10 == 0 or done == len(batches):
+                print(f"  Re-parsed {len(results)}/{len(entries)} pages")
+    return results
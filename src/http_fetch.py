@@ -0,0 +1,42 @@
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+
+def create_session(pool_size=16, retries=2, scheduler=None):
+    """Keep-alive HTTP session with a connection pool sized for the worker count.
+
+    With a scheduler.HostScheduler attached, every get() through this module
+    is paced per host and throttled answers are retried by the scheduler
+    instead of urllib3.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    retry = Retry(total=0 if scheduler else retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.scheduler = scheduler
+    return session
+
+
+def get(session, url, timeout=15, **kwargs):
+    """GET through the session's scheduler when it has one."""
+    scheduler = getattr(session, "scheduler", None)
+    if scheduler is not None:
+        return scheduler.request(session, url, timeout=timeout, **kwargs)
+    return session.get(url, timeout=timeout, **kwargs)
+
+
+def fetch_html(session, url, timeout=15):
+    """GET a page and return its HTML, raising on HTTP errors."""
+    response = get(session, url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+from sinks import read_records
+
+
+def card_fingerprint(card):
+    """Stable hash of the listing-card fields that change when a listing is edited."""
+    parts = []
+    for key in ("price", "title", "location"):
+        value = card.get(key) or ""
+        parts.append(" ".join(str(value).lower().split()))
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def load_snapshot(index_path, output_path):
+    """Load the previous run's URL → fingerprint index and URL → record rows.
+
+    `output_path` is the previous output in any sinks format. If only the
+    output exists (first incremental run), its URLs are known but have no
+    fingerprint yet; they are treated as unchanged.
+    """
+    records = {}
+    for row in read_records(output_path):
+        if row.get("URL"):
+            records[row["URL"]] = row
+
+    fingerprints = {url: None for url in records}
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            fingerprints.update(json.load(f))
+    return fingerprints, records
+
+
+def save_snapshot_index(index_path, fingerprints):
+    folder = os.path.dirname(index_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(fingerprints, f)
+    os.replace(tmp_path, index_path)
+
+
+class ChangeTracker:
+    """Classify listing cards against the previous snapshot and decide when to stop paginating."""
+
+    def __init__(self, fingerprints, stop_after_pages=3):
+        self.previous = fingerprints
+        self.current = {}
+        self.stop_after_pages = stop_after_pages
+        self.to_visit = set()
+        self.unchanged_streak = 0
+        self._page_has_changes = False
+        self.stopped_early = False
+        self.failed_pages = 0
+        # Set by the crawler when every listing page was read (e.g. from the sitemap)
+        self.complete = False
+        self.dropped = set()
+
+    def observe(self, url, card):
+        """Record a card seen on the current listing page; returns 'new', 'changed' or 'unchanged'."""
+        fingerprint = card_fingerprint(card)
+        self.current[url] = fingerprint
+        if url not in self.previous:
+            status = "new"
+        elif self.previous[url] is not None and self.previous[url] != fingerprint:
+            status = "changed"
+        else:
+            status = "unchanged"
+        if status != "unchanged":
+            self.to_visit.add(url)
+            self._page_has_changes = True
+        return status
+
+    def replay(self, cards):
+        """Observe (url, card) pairs journaled before a resume; they belong to no page of this run."""
+        for url, card in cards:
+            self.observe(url, card)
+        self._page_has_changes = False
+
+    def end_page(self):
+        """Close the current listing page; True once enough pages in a row had nothing new."""
+        if self._page_has_changes:
+            self.unchanged_streak = 0
+        else:
+            self.unchanged_streak += 1
+        self._page_has_changes = False
+        self.stopped_early = self.unchanged_streak >= self.stop_after_pages
+        return self.stopped_early
+
+    def page_failed(self):
+        """Note a listing page that could not be read; it neither extends nor breaks the unchanged streak."""
+        self.failed_pages += 1
+        self._page_has_changes = False
+
+    def needs_visit(self, url):
+        return url in self.to_visit or url not in self.previous
+
+    def carried_over(self, seen_urls):
+        """Previous URLs not re-seen in this run that are probably still listed.
+
+        Listing pages are ordered newest first and the snapshot index keeps
+        that order, so a previous listing ranked before the last one re-seen
+        sat on a page that was crawled: if it was not there, it was delisted.
+        Only listings ranked after it (past the early stop) are carried over.
+        With failed pages every unseen listing is kept, since it may have been
+        on one of them; after a complete crawl none is.
+        """
+        seen = set(seen_urls)
+        unseen = [url for url in self.previous if url not in seen]
+        if self.failed_pages:
+            carried = unseen
+        elif self.complete:
+            carried = []
+        else:
+            ranks = {url: rank for rank, url in enumerate(self.previous)}
+            last_seen = max((ranks[url] for url in seen if url in ranks), default=-1)
+            carried = [url for url in unseen if ranks[url] > last_seen]
+        self.dropped = set(unseen) - set(carried)
+        return carried
+
+    def merged_index(self):
+        """Fingerprints seen in this run, in page order, then the previous ones not seen or dropped."""
+        merged = dict(self.current)
+        for url, fingerprint in self.previous.items():
+            if url not in merged and url not in self.dropped:
+                merged[url] = fingerprint
+        return merged
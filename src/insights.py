@@ -0,0 +1,387 @@
+import argparse
+import csv
+import json
+import math
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from array import array
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DATA_PATH = "data/cleaned/brokeragebd_clean.csv"
+
+NUMERIC_COLUMNS = ("Area_sqft", "Price_BDT", "Bedroom", "Bathroom", "Floor")
+CATEGORY_COLUMNS = ("Location", "Neighborhood", "Sub_Area", "For", "Property_Type")
+
+# Named metrics for /stats and /distribution; ppsf is Price_BDT / Area_sqft
+METRICS = {"price": "Price_BDT", "area": "Area_sqft", "ppsf": "ppsf",
+           "bedroom": "Bedroom", "bathroom": "Bathroom", "floor": "Floor"}
+
+CACHE_SIZE = 1024
+
+
+def to_number(text):
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return math.nan
+    return value if math.isfinite(value) else math.nan
+
+
+def parse_number(name, text):
+    """A numeric filter value; ValueError (answered with 400) if it is not a number."""
+    value = to_number(text)
+    if value != value:
+        raise ValueError(f"{name} must be a number, got {text!r}")
+    return value
+
+
+def parse_count(name, text, minimum=0):
+    """A whole-number query parameter of at least `minimum`; ValueError (answered with 400) otherwise."""
+    value = int(text)
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+    return value
+
+
+def quantile(sorted_values, q):
+    """Linear-interpolated q-quantile (0..1) of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = q * (len(sorted_values) - 1)
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class ListingIndex:
+    """The cleaned listings held column by column, with a posting list per category value.
+
+    Numeric columns are float arrays (NaN for missing) and every category
+    column maps each lower-cased value, and the part before its first comma
+    ("mirpur" for "Mirpur, Dhaka"), to the sorted row numbers holding it.
+    Filters intersect posting lists, so a query only reads the rows it needs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.columns = {}
+        self.postings = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            names = reader.fieldnames or []
+            for name in names:
+                self.columns[name] = array("d") if name in NUMERIC_COLUMNS else []
+            for row in reader:
+                for name in names:
+                    value = row[name]
+                    self.columns[name].append(to_number(value) if name in NUMERIC_COLUMNS
+                                              else (value if value not in ("", "N/A") else None))
+        self.size = len(self.columns[names[0]]) if names else 0
+        if "Price_BDT" in self.columns and "Area_sqft" in self.columns:
+            self.columns["ppsf"] = array("d", (price / area if area > 0 else math.nan
+                                               for price, area in zip(self.columns["Price_BDT"],
+                                                                      self.columns["Area_sqft"])))
+        for name in CATEGORY_COLUMNS:
+            if name not in self.columns:
+                continue
+            postings = {}
+            for row, value in enumerate(self.columns[name]):
+                if value is None:
+                    continue
+                keys = {value.lower(), value.split(",")[0].strip().lower()}
+                for key in keys:
+                    postings.setdefault(key, array("i")).append(row)
+            self.postings[name] = postings
+
+    def select(self, filters):
+        """Row numbers matching `filters`: {column: [values]} for categories or numbers,
+        {"min_<column>": x, "max_<column>": y} for numeric ranges."""
+        rows = None
+        ranges = []
+        for name, values in sorted(filters.items(), key=lambda item: self._selectivity(*item)):
+            if name.startswith(("min_", "max_")):
+                ranges.append((name[4:], name[:3], parse_number(name, values[0])))
+                continue
+            if name in self.postings:
+                matched = set()
+                for value in values:
+                    matched.update(self.postings[name].get(value.lower(), ()))
+            elif name in self.columns and isinstance(self.columns[name], array):
+                numbers = {parse_number(name, value) for value in values}
+                column = self.columns[name]
+                matched = {row for row in (rows if rows is not None else range(self.size)) if column[row] in numbers}
+            else:
+                raise KeyError(name)
+            rows = matched if rows is None else rows & matched
+            if not rows:
+                return []
+        rows = sorted(rows) if rows is not None else range(self.size)
+        for name, bound, limit in ranges:
+            if name not in self.columns or not isinstance(self.columns[name], array):
+                raise KeyError(name)
+            column = self.columns[name]
+            rows = [row for row in rows if (column[row] >= limit if bound == "min" else column[row] <= limit)]
+        return list(rows)
+
+    def _selectivity(self, name, values):
+        # Smallest posting lists first, numeric scans and ranges last
+        if name in self.postings:
+            return sum(len(self.postings[name].get(value.lower(), ())) for value in values)
+        return self.size + (1 if name.startswith(("min_", "max_")) else 0)
+
+    def values(self, column, rows):
+        data = self.columns[column]
+        return sorted(value for value in (data[row] for row in rows) if value == value)
+
+    def stats(self, column, rows, quantiles=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        values = self.values(column, rows)
+        count = len(values)
+        mean = sum(values) / count if count else None
+        result = {"count": count, "mean": mean,
+                  "std": math.sqrt(sum((value - mean) ** 2 for value in values) / count) if count else None,
+                  "min": values[0] if values else None, "max": values[-1] if values else None}
+        for q in quantiles:
+            result[f"p{round(q * 100)}"] = quantile(values, q)
+        return result
+
+    def distribution(self, column, rows, bins=10):
+        """Counts per value for category and small-integer columns, else `bins` equal-width bins."""
+        if bins < 1:
+            raise ValueError(f"bins must be at least 1, got {bins}")
+        data = self.columns[column]
+        if not isinstance(data, array) or column in ("Bedroom", "Bathroom", "Floor"):
+            counts = {}
+            for row in rows:
+                value = data[row]
+                if value is None or value != value:
+                    continue
+                key = str(int(value)) if isinstance(value, float) else value
+                counts[key] = counts.get(key, 0) + 1
+            return dict(sorted(counts.items(), key=lambda item: -item[1]))
+        values = self.values(column, rows)
+        if not values:
+            return {}
+        low, high = values[0], values[-1]
+        width = (high - low) / bins or 1.0
+        counts = [0] * bins
+        for value in values:
+            counts[min(int((value - low) / width), bins - 1)] += 1
+        return {f"{low + i * width:.0f}-{low + (i + 1) * width:.0f}": count for i, count in enumerate(counts)}
+
+    def listings(self, rows, limit=20, offset=0):
+        names = [name for name in self.columns if name != "ppsf"]
+        result = []
+        for row in rows[offset:offset + limit]:
+            record = {}
+            for name in names:
+                value = self.columns[name][row]
+                record[name] = None if isinstance(value, float) and value != value else value
+            result.append(record)
+        return result
+
+
+class InsightsService:
+    """Answers /stats, /distribution and /listings queries from a ListingIndex.
+
+    Responses are kept in an LRU cache keyed by the normalized query. The
+    dataset file is checked on every request; when a new snapshot has been
+    published (its mtime or size changed) the index is rebuilt and the cache
+    cleared.
+    """
+
+    def __init__(self, path=DATA_PATH, cache_size=CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()
+        self.version = None
+        self.index = None
+        self.refresh()
+
+    def snapshot_version(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self, force=False):
+        """Reload the dataset if its file changed (or `force`); returns True if it was reloaded."""
+        version = self.snapshot_version()
+        if not force and version == self.version:
+            return False
+        start = time.perf_counter()
+        index = ListingIndex(self.path)
+        with self.lock:
+            self.index, self.version = index, version
+            self.cache.clear()
+        print(f"Loaded {index.size:,} listings from {self.path} in {time.perf_counter() - start:.2f}s")
+        return True
+
+    def handle(self, path, params):
+        """JSON-ready response for an endpoint and its query parameters ({name: [values]})."""
+        self.refresh()
+        if path == "/health":
+            return self.answer(self.index, path, params)
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key]
+            index = self.index
+        response = self.answer(index, path, dict(params))
+        with self.lock:
+            self.misses += 1
+            self.cache[key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return response
+
+    def answer(self, index, path, params):
+        if path == "/health":
+            return {"listings": index.size, "cache_entries": len(self.cache), "hits": self.hits,
+                    "misses": self.misses}
+        if path == "/stats":
+            metric = METRICS[params.pop("metric", ["price"])[0]]
+            rows = index.select(params)
+            return {"metric": metric, "filters": params, **index.stats(metric, rows)}
+        if path == "/distribution":
+            column = params.pop("column", ["Bedroom"])[0]
+            column = METRICS.get(column, column)
+            bins = parse_count("bins", params.pop("bins", ["10"])[0], minimum=1)
+            if column not in index.columns:
+                raise KeyError(column)
+            rows = index.select(params)
+            return {"column": column, "filters": params, "count": len(rows),
+                    "distribution": index.distribution(column, rows, bins)}
+        if path == "/listings":
+            limit = parse_count("limit", params.pop("limit", ["20"])[0])
+            offset = parse_count("offset", params.pop("offset", ["0"])[0])
+            rows = index.select(params)
+            return {"count": len(rows), "listings": index.listings(rows, limit, offset)}
+        raise LookupError(path)
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            params = {name: [item for value in values for item in value.split(",")]
+                      for name, values in urllib.parse.parse_qs(url.query).items()}
+            try:
+                status, body = 200, service.handle(url.path, params)
+            except (KeyError, ValueError) as e:
+                status, body = 400, {"error": f"bad query: {e}"}
+            except LookupError as e:
+                status, body = 404, {"error": f"unknown endpoint: {e}"}
+            except OSError as e:
+                # The dataset is missing or unreadable, e.g. while a new snapshot is being published
+                status, body = 503, {"error": f"dataset unavailable: {e}"}
+            self.send_json(status, body)
+
+        def do_POST(self):
+            if urllib.parse.urlsplit(self.path).path != "/reload":
+                self.send_json(404, {"error": "unknown endpoint"})
+                return
+            try:
+                self.send_json(200, {"reloaded": service.refresh(force=True)})
+            except OSError as e:
+                self.send_json(503, {"error": f"dataset unavailable: {e}"})
+
+        def send_json(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(path=DATA_PATH, host="127.0.0.1", port=8765):
+    service = InsightsService(path)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Serving insights for {path} on http://{host}:{port} (/stats, /distribution, /listings, /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# Queries the load test cycles through
+LOAD_TEST_QUERIES = [
+    "/stats?metric=ppsf&Location=Mirpur&Bedroom=3&Property_Type=Flat",
+    "/stats?metric=price&Location=Gulshan",
+    "/stats?metric=price&For=Sell&min_Area_sqft=1000&max_Area_sqft=2000",
+    "/distribution?column=Bedroom&Location=Bashundhara",
+    "/distribution?column=price&bins=20",
+    "/listings?Location=Uttara&limit=10",
+    "/health",
+]
+
+
+def load_test(base_url="http://127.0.0.1:8765", requests=5000, concurrency=8, queries=LOAD_TEST_QUERIES):
+    """Send `requests` GETs from `concurrency` threads and print p50/p99 latency and requests/s."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        local = []
+        for number in counter:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + queries[number % len(queries)]) as response:
+                    response.read()
+            except OSError:
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies):,} requests in {elapsed:.2f}s ({concurrency} threads, {errors[0]} errors)")
+    if latencies:
+        print(f"  {len(latencies) / elapsed:,.0f} requests/s | p50 {quantile(latencies, 0.5) * 1000:.2f} ms "
+              f"| p99 {quantile(latencies, 0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON service for listing insights")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_command = commands.add_parser("serve", help="serve the cleaned dataset")
+    serve_command.add_argument("--input", default=DATA_PATH)
+    serve_command.add_argument("--host", default="127.0.0.1")
+    serve_command.add_argument("--port", type=int, default=8765)
+
+    load_command = commands.add_parser("loadtest", help="measure latency and throughput of a running service")
+    load_command.add_argument("--url", default="http://127.0.0.1:8765")
+    load_command.add_argument("--requests", type=int, default=5000)
+    load_command.add_argument("--concurrency", type=int, default=8)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(args.input, args.host, args.port)
+    else:
+        load_test(args.url, args.requests, args.concurrency)
@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+
+
+class CrawlJournal:
+    """Append-only JSON Lines journal of crawl progress with batched fsync.
+
+    Every discovered listing page, card and finished detail record is
+    written as one line. Lines are fsynced in batches (every `fsync_every`
+    entries or `fsync_interval` seconds), so a crash loses at most one batch.
+    """
+
+    def __init__(self, path, resume=False, fsync_every=50, fsync_interval=5.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        if resume:
+            drop_torn_line(path)
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def log(self, kind, **fields):
+        """Append one entry and fsync if the current batch is full or old enough."""
+        line = json.dumps({"kind": kind, **fields}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._pending += 1
+            if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def log_page(self, page_num, page_url):
+        self.log("page", page=page_num, url=page_url)
+
+    def log_card(self, url, card):
+        self.log("card", url=url, card=card)
+
+    def log_record(self, record):
+        self.log("record", record=record)
+
+    def mark_step_done(self, step):
+        self.log("done", step=step)
+        self.flush()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+
+def drop_torn_line(path):
+    """Cut a last line left without its newline by a crash, so appended entries start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Walk back to the last complete line
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                f.truncate(position - step + newline + 1)
+                return
+            position -= step
+        f.truncate(0)
+
+
+def load_journal(path):
+    """Rebuild crawl state from a journal; a torn last line from a crash is skipped."""
+    state = {"urls": [], "cards": {}, "records": {}, "last_page": None, "done_steps": set()}
+    if not os.path.exists(path):
+        return state
+
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            kind = entry.get("kind")
+            if kind == "page":
+                state["last_page"] = (entry["page"], entry["url"])
+            elif kind == "card":
+                url = entry["url"]
+                if url not in seen:
+                    seen.add(url)
+                    state["urls"].append(url)
+                state["cards"][url] = entry["card"]
+            elif kind == "record":
+                state["records"][entry["record"]["URL"]] = entry["record"]
+            elif kind == "done":
+                state["done_steps"].add(entry["step"])
+    return state
@@ -0,0 +1,260 @@
+import argparse
+import difflib
+import functools
+import re
+import time
+from collections import deque
+
+# Dhaka neighborhoods and the spellings they appear under in addresses,
+# titles and URL slugs
+NEIGHBORHOODS = {
+    "Adabor": ("adabor",),
+    "Aftabnagar": ("aftabnagar", "aftab nagar"),
+    "Badda": ("badda",),
+    "Banani": ("banani",),
+    "Banani DOHS": ("banani dohs",),
+    "Banashree": ("banashree", "banasree"),
+    "Baridhara": ("baridhara",),
+    "Baridhara DOHS": ("baridhara dohs",),
+    "Bashundhara": ("bashundhara", "bashundhara r a", "bashundhara ra"),
+    "Cantonment": ("cantonment", "dhaka cantonment"),
+    "Dhanmondi": ("dhanmondi",),
+    "Eskaton": ("eskaton",),
+    "Gulshan": ("gulshan",),
+    "Jatrabari": ("jatrabari",),
+    "Kalabagan": ("kalabagan",),
+    "Khilgaon": ("khilgaon",),
+    "Khilkhet": ("khilkhet",),
+    "Lalmatia": ("lalmatia",),
+    "Madani Avenue": ("madani avenue",),
+    "Malibagh": ("malibagh",),
+    "Mirpur": ("mirpur",),
+    "Mirpur DOHS": ("mirpur dohs",),
+    "Moghbazar": ("moghbazar", "mogbazar"),
+    "Mohakhali": ("mohakhali",),
+    "Mohakhali DOHS": ("mohakhali dohs",),
+    "Mohammadpur": ("mohammadpur", "mohammedpur"),
+    "Motijheel": ("motijheel",),
+    "Niketan": ("niketan",),
+    "Purbachal": ("purbachal",),
+    "Rampura": ("rampura",),
+    "Ramna": ("ramna",),
+    "Savar": ("savar",),
+    "Shantinagar": ("shantinagar", "shanti nagar"),
+    "Shyamoli": ("shyamoli",),
+    "Tejgaon": ("tejgaon",),
+    "Uttara": ("uttara",),
+    "Uttarkhan": ("uttarkhan",),
+    "Vatara": ("vatara",),
+    "Wari": ("wari",),
+}
+
+# Numbered sub-areas: Mirpur sections, Uttara sectors, Gulshan 1/2...
+NUMBERED_SUB_AREAS = {
+    "Mirpur": ("section", range(1, 15)),
+    "Uttara": ("sector", range(1, 19)),
+    "Gulshan": ("", range(1, 3)),
+    "Banashree": ("block", range(1, 10)),
+}
+
+# Sub-areas with their own names, by neighborhood
+NAMED_SUB_AREAS = {
+    "Mirpur": {"Pallabi": ("pallabi",), "Kazipara": ("kazipara",), "Shewrapara": ("shewrapara",)},
+    "Dhanmondi": {"Jigatola": ("jigatola",), "Zigatola": ("zigatola",)},
+    "Badda": {"Merul Badda": ("merul badda",), "Middle Badda": ("middle badda",), "Uttar Badda": ("uttar badda",)},
+    "Mohammadpur": {"Shyamoli Housing": ("shyamoli housing",), "Tajmahal Road": ("tajmahal road",)},
+}
+
+
+def numbered_aliases(neighborhood, word, number):
+    base = neighborhood.lower()
+    aliases = [f"{base} {number}"]
+    if word:
+        aliases += [f"{base} {word} {number}", f"{word} {number} {base}"]
+    return aliases
+
+
+def gazetteer_entries():
+    """(alias, (neighborhood, sub_area)) pairs of the whole gazetteer."""
+    for neighborhood, aliases in NEIGHBORHOODS.items():
+        for alias in aliases:
+            yield alias, (neighborhood, None)
+    for neighborhood, (word, numbers) in NUMBERED_SUB_AREAS.items():
+        for number in numbers:
+            for alias in numbered_aliases(neighborhood, word, number):
+                yield alias, (neighborhood, f"{neighborhood} {number}")
+    for neighborhood, sub_areas in NAMED_SUB_AREAS.items():
+        for sub_area, aliases in sub_areas.items():
+            for alias in aliases:
+                yield alias, (neighborhood, sub_area)
+
+
+WORD = re.compile(r'[a-z0-9]+')
+
+# Texts are compared by words, so a "dhaka" suffix or dashes from a slug never matter
+IGNORED_WORDS = {"dhaka", "bangladesh"}
+
+FUZZY_CUTOFF = 0.85
+
+CACHE_SIZE = 65536
+
+
+def words(text):
+    return WORD.findall(text.lower())
+
+
+class Automaton:
+    """Aho-Corasick automaton over words: finds every alias in a text in one pass.
+
+    Matches are whole words (aliases and texts are matched as word
+    sequences), and the longest alias wins, so "mirpur 10" beats "mirpur".
+    """
+
+    def __init__(self, entries):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]  # (alias length in words, value) of the longest alias ending here
+        for alias, value in entries:
+            state = 0
+            for word in alias.split():
+                if word not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.goto[state][word] = len(self.goto) - 1
+                state = self.goto[state][word]
+            length = len(alias.split())
+            if self.output[state] is None or self.output[state][0] < length:
+                self.output[state] = (length, value)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                inherited = self.output[self.fail[child]]
+                if inherited and (self.output[child] is None or self.output[child][0] < inherited[0]):
+                    self.output[child] = inherited
+
+    def longest(self, tokens):
+        """Value of the longest alias in `tokens` (the first one on ties), or None."""
+        state = 0
+        best = None
+        for word in tokens:
+            while state and word not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(word, 0)
+            found = self.output[state]
+            if found and (best is None or found[0] > best[0]):
+                best = found
+        return best[1] if best else None
+
+
+AUTOMATON = Automaton(gazetteer_entries())
+ALIASES = {alias: value for alias, value in gazetteer_entries()}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def fuzzy_lookup(word):
+    """Closest single-word alias to a misspelt word ('basundhara' → Bashundhara)."""
+    match = difflib.get_close_matches(word, [alias for alias in ALIASES if " " not in alias], n=1,
+                                      cutoff=FUZZY_CUTOFF)
+    return ALIASES[match[0]] if match else None
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _resolve(text):
+    tokens = [word for word in words(text) if word not in IGNORED_WORDS]
+    found = AUTOMATON.longest(tokens)
+    if found:
+        return found
+    for index, word in enumerate(tokens):
+        if len(word) < 4 or word.isdigit():
+            continue
+        found = fuzzy_lookup(word)
+        if found:
+            # Retry with the corrected spelling so "basundhara 2"-style sub-areas still match
+            corrected = tokens[:index] + found[0].lower().split() + tokens[index + 1:]
+            return AUTOMATON.longest(corrected) or found
+    return None, None
+
+
+def resolve(text):
+    """(neighborhood, sub_area) of a location text, address or slug; (None, None) if unknown.
+
+    Examples: 'Uttara, Dhaka' → ('Uttara', None), 'mirpur-10' → ('Mirpur',
+    'Mirpur 10'), 'Basundhara' → ('Bashundhara', None).
+    """
+    if not isinstance(text, str) or not text or text == "N/A":
+        return None, None
+    return _resolve(text)
+
+
+def resolve_column(values):
+    """Resolve a pandas Series of location texts into Neighborhood and Sub_Area columns.
+
+    Each distinct text is looked up once and the results are mapped back by
+    factorize codes, so millions of rows cost one lookup per distinct string.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    rows = [resolve(value) for value in uniques]
+    rows.append((None, None))  # Row for missing values (code -1)
+    table = pd.DataFrame.from_records(rows, columns=["Neighborhood", "Sub_Area"])
+    result = table.take(np.where(codes < 0, len(rows) - 1, codes))
+    result.index = values.index
+    return result
+
+
+def normalize_locations(locations, urls=None):
+    """Neighborhood and Sub_Area for listings from their Location text and, if given, URLs.
+
+    The Location text decides the neighborhood; the URL slug (e.g.
+    '...-in-mirpur-2/') fills a missing neighborhood and supplies the sub-area
+    when it names the same neighborhood.
+    """
+    from slug_parser import parse_column
+
+    result = resolve_column(locations)
+    if urls is None:
+        return result
+    slug = resolve_column(parse_column(urls, "slug")["location"])
+    neighborhood = result["Neighborhood"].fillna(slug["Neighborhood"])
+    same = slug["Neighborhood"] == neighborhood
+    result["Sub_Area"] = slug["Sub_Area"].where(same & slug["Sub_Area"].notna(), result["Sub_Area"])
+    result["Neighborhood"] = neighborhood
+    return result
+
+
+def benchmark(path="data/raw/brokeragebd_raw.csv", rows=2_000_000):
+    """Time normalize_locations on resampled listings, with a cold and a warm cache."""
+    import pandas as pd
+
+    raw = pd.read_csv(path, usecols=["Location", "URL"], dtype=str)
+    sample = raw.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+    print(f"{len(sample):,} rows, {sample['Location'].nunique()} distinct locations, "
+          f"{sample['URL'].nunique()} distinct URLs")
+    for label in ("cold cache", "warm cache"):
+        if label == "cold cache":
+            _resolve.cache_clear()
+            fuzzy_lookup.cache_clear()
+        start = time.perf_counter()
+        result = normalize_locations(sample["Location"], sample["URL"])
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<11} {elapsed:6.2f}s  {len(sample) / elapsed:>12,.0f} rows/s")
+    print(f"  {result['Neighborhood'].nunique()} neighborhoods, {result['Sub_Area'].nunique()} sub-areas, "
+          f"{result['Neighborhood'].isna().sum()} rows unresolved")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark location normalization against the Dhaka gazetteer")
+    parser.add_argument("--input", default="data/raw/brokeragebd_raw.csv")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+    benchmark(args.input, args.rows)
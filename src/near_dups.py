@@ -0,0 +1,213 @@
+import argparse
+import functools
+import random
+import re
+import time
+import zlib
+
+# MinHash signature length and its split into LSH bands. 16 bands of 4 rows
+# make two slugs with Jaccard 0.6 share a band ~88% of the time and two with
+# Jaccard 0.2 only ~3% of the time.
+NUM_PERM = 64
+BANDS = 16
+
+# Estimated Jaccard similarity above which two slugs in one block are the same listing
+THRESHOLD = 0.6
+
+# Two listings are only the same flat if their prices differ by at most this
+# fraction of the higher one (1%: "1.39 Crore" against "1.4 Crore")
+PRICE_TOLERANCE = 0.01
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(20240601)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+SLUG_TOKEN = re.compile(r'[a-z0-9]+')
+# WordPress appends "-2", "-3"... to a reposted title's slug
+REPOST_SUFFIX = re.compile(r'-\d{1,2}$')
+# Unit code brokers end a slug with, e.g. "e9" in "...-in-uttara-e9" (unit E, 9th floor)
+UNIT_CODE = re.compile(r'^[a-z]{1,2}\d{1,3}$')
+
+CACHE_SIZE = 65536
+
+
+def normalize_location(location):
+    """'Uttara, Dhaka ' → 'uttara'; None for missing values."""
+    if not isinstance(location, str) or not location or location == "N/A":
+        return None
+    tokens = SLUG_TOKEN.findall(location.lower())
+    if tokens and tokens[-1] == "dhaka" and len(tokens) > 1:
+        tokens.pop()
+    return " ".join(tokens) or None
+
+
+def missing(value):
+    return value is None or value != value
+
+
+def prices_match(first, second, tolerance=PRICE_TOLERANCE):
+    """True if two prices are equal within `tolerance`, or both are missing."""
+    if missing(first) or missing(second):
+        return missing(first) and missing(second)
+    return abs(first - second) <= tolerance * max(abs(first), abs(second))
+
+
+def block_key(location, area, bedrooms, floor=None):
+    """Candidate block of a listing: (normalized location, area, bedrooms, floor).
+
+    None when the location, area or bedroom count is missing: such a listing
+    cannot be told apart from others, so it is never matched.
+    """
+    location = normalize_location(location)
+    if location is None or missing(area) or missing(bedrooms):
+        return None
+    return location, int(area), int(bedrooms), None if missing(floor) else int(floor)
+
+
+def slug_words(url):
+    """Words of a listing URL's slug, without the repost suffix."""
+    slug = url.rstrip("/").rsplit("/", 1)[-1].lower()
+    return SLUG_TOKEN.findall(REPOST_SUFFIX.sub("", slug))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def unit_code(url):
+    """Trailing unit code of a slug ("e9"), or None; listings with different codes are different flats."""
+    words = slug_words(url)
+    return words[-1] if words and UNIT_CODE.match(words[-1]) else None
+
+
+def shingles(url):
+    """Words and word pairs of a listing URL's slug, without the repost suffix."""
+    words = slug_words(url)
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def signature(url):
+    """MinHash signature (NUM_PERM values) of a URL's slug shingles; cached per URL."""
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(url)] or [0]
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) & MAX_HASH for a, b in PERMUTATIONS)
+
+
+def similarity(first, second):
+    """Jaccard similarity estimated from two MinHash signatures."""
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+
+class Clusters:
+    """Union-find over row positions; the root of a cluster is its earliest row."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, row):
+        while self.parent[row] != row:
+            self.parent[row] = self.parent[self.parent[row]]
+            row = self.parent[row]
+        return row
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def cluster_rows(keys, urls, prices=None, threshold=THRESHOLD):
+    """Cluster IDs (0, 1, 2... in order of first appearance) for listings given block keys, URLs and prices.
+
+    Rows are compared only inside their block, and inside a block only with
+    rows that share an LSH band with them, so the work grows with the number
+    of rows rather than the number of pairs. A pair matches when the slugs
+    are similar, the unit codes are the same and the prices agree within
+    PRICE_TOLERANCE. Rows with a None key are never matched.
+    """
+    rows_per_band = NUM_PERM // BANDS
+    prices = prices if prices is not None else [None] * len(keys)
+    clusters = Clusters(len(keys))
+    blocks = {}
+    for row, key in enumerate(keys):
+        if key is not None and isinstance(urls[row], str) and urls[row] and urls[row] != "N/A":
+            blocks.setdefault(key, []).append(row)
+
+    def same_listing(first, second, sig):
+        return (unit_code(urls[first]) == unit_code(urls[second])
+                and prices_match(prices[first], prices[second])
+                and similarity(signature(urls[first]), sig) >= threshold)
+
+    for rows in blocks.values():
+        if len(rows) < 2:
+            continue
+        buckets = {}
+        for row in rows:
+            sig = signature(urls[row])
+            for band in range(BANDS):
+                bucket = buckets.setdefault((band, sig[band * rows_per_band:(band + 1) * rows_per_band]), [])
+                for other in bucket:
+                    if clusters.find(other) == clusters.find(row):
+                        break
+                    if same_listing(other, row, sig):
+                        clusters.union(other, row)
+                        break
+                bucket.append(row)
+
+    ids = {}
+    return [ids.setdefault(clusters.find(row), len(ids)) for row in range(len(keys))]
+
+
+def assign_clusters(df, threshold=THRESHOLD, column="Cluster_ID"):
+    """Add a near-duplicate cluster ID column to a listings frame.
+
+    Listings are blocked on (Neighborhood, or the normalized Location
+    without one, Area_sqft, Bedroom, Floor) and matched by MinHash/LSH on
+    their URL slugs, with the same unit code and price, so a flat reposted
+    under a new URL shares the ID of the first listing.
+    """
+    import pandas as pd
+
+    def values(name):
+        return [None if value is pd.NA else value for value in df[name].astype(object)]
+
+    location = "Neighborhood" if "Neighborhood" in df.columns else "Location"
+    keys = [block_key(*row) for row in zip(values(location), values("Area_sqft"),
+                                            values("Bedroom"), values("Floor"))]
+    prices = [None if missing(price) else float(price) for price in values("Price_BDT")]
+    df = df.copy()
+    df[column] = pd.array(cluster_rows(keys, values("URL"), prices, threshold), dtype="Int64")
+    return df
+
+
+def drop_near_duplicates(df, threshold=THRESHOLD, column="Cluster_ID"):
+    """assign_clusters, then keep the first listing of every cluster."""
+    df = assign_clusters(df, threshold, column)
+    return df.drop_duplicates(subset=[column])
+
+
+def benchmark(path="data/raw/brokeragebd_raw.csv", sizes=(10_000, 100_000, 1_000_000)):
+    """Time assign_clusters on reposted copies of the raw listings to show linear scaling."""
+    import pandas as pd
+
+    from units import parse_prices
+
+    raw = pd.read_csv(path, dtype=str, na_values=["N/A"])
+    raw["Price_BDT"] = parse_prices(raw["Price"])
+    for size in sizes:
+        sample = raw.sample(size, replace=True, random_state=0).reset_index(drop=True)
+        # Each copy of a listing is a repost under a new URL (a distinct slug suffix)
+        sample["URL"] = sample["URL"].str.rstrip("/") + "-" + (sample.index % 50).astype(str) + "/"
+        signature.cache_clear()
+        start = time.perf_counter()
+        result = assign_clusters(sample)
+        elapsed = time.perf_counter() - start
+        print(f"  {size:>9,} rows  {elapsed:7.2f}s  {size / elapsed:>10,.0f} rows/s  "
+              f"{result['Cluster_ID'].nunique():,} clusters")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate clustering on resampled listings")
+    parser.add_argument("--input", default="data/raw/brokeragebd_raw.csv")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    benchmark(args.input, args.sizes)
@@ -0,0 +1,447 @@
+import json
+import re
+from lxml import html as lxml_html
+from telemetry import metrics
+
+PRICE_KEYWORDS = ['BDT', 'Tk', 'Lakh', 'Crore', 'lakh', 'crore']
+
+# Fields a detail page must yield before we trust the HTTP-only result
+REQUIRED_FIELDS = ("area_sqft", "price", "location")
+
+
+def empty_detail():
+    """Detail dict with every field scrape_property_detail returns."""
+    return {
+        "area_sqft": None,
+        "bedrooms": None,
+        "bathrooms": None,
+        "floor": None,
+        "for_rent_sell": None,
+        "price": None,
+        "location": None,
+        "property_type": None
+    }
+
+
+def missing_required(detail):
+    """Names of required fields the parser could not fill."""
+    return [field for field in REQUIRED_FIELDS if not detail.get(field)]
+
+
+# Houzez detail-table labels → detail fields
+DETAIL_LABELS = {
+    "property size": "area_sqft",
+    "size": "area_sqft",
+    "area size": "area_sqft",
+    "bedroom": "bedrooms",
+    "bedrooms": "bedrooms",
+    "bathroom": "bathrooms",
+    "bathrooms": "bathrooms",
+    "floor": "floor",
+    "floor no": "floor",
+    "level": "floor",
+    "price": "price",
+    "property type": "property_type",
+    "property status": "for_rent_sell",
+}
+
+# schema.org types that map onto our property types
+SCHEMA_TYPES = {"apartment": "Apartment", "house": "House", "singlefamilyresidence": "House"}
+
+
+def parse_html(page_source):
+    """Parse a page into an lxml tree."""
+    return lxml_html.fromstring(page_source)
+
+
+def strip_scripts(tree):
+    """Remove scripts and styles so text extraction only sees page content."""
+    for elem in tree.xpath('//script | //style | //noscript'):
+        elem.drop_tree()
+    return tree
+
+
+def element_text(elem):
+    """Whitespace-normalized text of an element and its children."""
+    return " ".join(elem.text_content().split())
+
+
+def text_blocks(tree):
+    """(own_text, element) for every element with direct text, in document order.
+
+    This is the local equivalent of XPath `contains(text(), ...)`: it looks at
+    an element's own text nodes only, so ancestors up to <html> are not matched.
+    """
+    blocks = []
+    for elem in tree.iter():
+        if not isinstance(elem.tag, str):
+            continue
+        parts = [elem.text] + [child.tail for child in elem]
+        own = " ".join(part.strip() for part in parts if part and part.strip())
+        if own:
+            blocks.append((own, elem))
+    return blocks
+
+
+def find_by_class(tree, fragment, tag="*"):
+    """Elements whose class attribute contains `fragment` (CSS [class*=...])."""
+    return tree.xpath(f'//{tag}[contains(@class, "{fragment}")]')
+
+
+def first_int(text, low=None, high=None):
+    """First integer in `text` (commas ignored), optionally within [low, high]."""
+    for number in re.findall(r'\d+', str(text).replace(',', '')):
+        value = int(number)
+        if (low is None or value >= low) and (high is None or value <= high):
+            return value
+    return None
+
+
+def normalize_property_type(text):
+    text = text.lower()
+    if "flat" in text:
+        return "Flat"
+    elif "apartment" in text:
+        return "Apartment"
+    elif "house" in text or "duplex" in text:
+        return "House"
+    return None
+
+
+def normalize_for_rent_sell(text):
+    text = text.lower()
+    if "rent" in text:
+        return "Rent"
+    elif "sale" in text or "sell" in text:
+        return "Sell"
+    return None
+
+
+def set_field(detail, field, raw):
+    """Convert a structured value to the field's type and set it if still empty."""
+    if detail[field] is not None or raw in (None, ""):
+        return
+    raw = " ".join(str(raw).split())
+    if field == "area_sqft":
+        value = first_int(raw, 100, 100000)
+    elif field in ("bedrooms", "bathrooms", "floor"):
+        value = first_int(raw)
+    elif field == "property_type":
+        value = normalize_property_type(raw)
+    elif field == "for_rent_sell":
+        value = normalize_for_rent_sell(raw)
+    else:
+        value = raw
+    if value is not None:
+        detail[field] = value
+
+
+def json_ld_objects(tree):
+    """Every JSON object embedded in <script type="application/ld+json">, flattened."""
+    objects = []
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text_content())
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                objects.append(item)
+                stack.extend(item.get("@graph", []))
+    return objects
+
+
+def extract_json_ld(tree, detail):
+    for obj in json_ld_objects(tree):
+        types = obj.get("@type", [])
+        types = [types] if isinstance(types, str) else types
+        for schema_type in types:
+            set_field(detail, "property_type", SCHEMA_TYPES.get(str(schema_type).lower()))
+
+        floor_size = obj.get("floorSize")
+        if isinstance(floor_size, dict):
+            set_field(detail, "area_sqft", floor_size.get("value"))
+        set_field(detail, "bedrooms", obj.get("numberOfBedrooms") or obj.get("numberOfRooms"))
+        set_field(detail, "bathrooms", obj.get("numberOfBathroomsTotal"))
+
+        offers = obj.get("offers")
+        offers = offers[0] if isinstance(offers, list) and offers else offers
+        if isinstance(offers, dict) and offers.get("price"):
+            set_field(detail, "price", f"{offers.get('priceCurrency', 'BDT')} {offers['price']}")
+
+        address = obj.get("address")
+        if isinstance(address, dict):
+            parts = [address.get("addressLocality"), address.get("addressRegion")]
+            set_field(detail, "location", ", ".join(p for p in parts if p))
+
+
+def extract_detail_table(tree, detail):
+    """Houzez '#property-detail-wrap' and '#property-address-wrap' label/value lists."""
+    for item in tree.xpath('//*[contains(@class, "detail-wrap")]//li'):
+        label = item.xpath('./strong')
+        value = item.xpath('./span')
+        if not label or not value:
+            continue
+        field = DETAIL_LABELS.get(element_text(label[0]).rstrip(':').strip().lower())
+        if field:
+            set_field(detail, field, element_text(value[0]))
+
+    address = {}
+    for item in tree.xpath('//*[contains(@class, "address-wrap")]//li'):
+        label = item.xpath('./strong')
+        value = item.xpath('./span')
+        if label and value:
+            address[element_text(label[0]).rstrip(':').strip().lower()] = element_text(value[0])
+    parts = [address.get("area"), address.get("city")]
+    set_field(detail, "location", ", ".join(p for p in parts if p) or address.get("address"))
+
+
+def extract_meta(tree, detail):
+    """Price and listing text from OpenGraph/product meta tags."""
+    meta = {}
+    for elem in tree.xpath('//meta[@property or @name]'):
+        key = (elem.get("property") or elem.get("name")).lower()
+        meta.setdefault(key, elem.get("content") or "")
+
+    amount = meta.get("product:price:amount") or meta.get("og:price:amount")
+    if amount:
+        currency = meta.get("product:price:currency") or meta.get("og:price:currency") or "BDT"
+        set_field(detail, "price", f"{currency} {amount}")
+    return " ".join(filter(None, [meta.get("og:title"), meta.get("og:description")]))
+
+
+def extract_area(blocks):
+    for own, elem in blocks:
+        if 'sft' in own or 'sqft' in own or 'Sq Ft' in own:
+            area_match = re.search(r'(\d+)', element_text(elem).replace(',', ''))
+            if area_match:
+                area_val = int(area_match.group(1))
+                if 100 <= area_val <= 10000:  # Reasonable range for sqft
+                    return area_val
+    return None
+
+
+def extract_bedrooms(blocks):
+    for own, elem in blocks:
+        if 'bedroom' in own.lower():
+            bedroom_match = re.search(r'(\d+)[-\s]*bedroom', element_text(elem).lower())
+            if bedroom_match:
+                return int(bedroom_match.group(1))
+    return None
+
+
+def extract_bathrooms(blocks):
+    for own, elem in blocks:
+        if 'bath' in own.lower():
+            bathroom_match = re.search(r'(\d+)[-\s]*(?:bathroom|bath)', element_text(elem).lower())
+            if bathroom_match:
+                return int(bathroom_match.group(1))
+    return None
+
+
+def extract_floor(blocks):
+    for own, elem in blocks:
+        own_lower = own.lower()
+        if 'floor' in own_lower or 'level' in own_lower:
+            floor_text = element_text(elem).lower()
+            # Look for patterns like "3rd Floor", "Floor 5", "5th floor", etc.
+            floor_match = re.search(r'(?:floor|level)[\s:]*(\d+)', floor_text)
+            if not floor_match:
+                floor_match = re.search(r'(\d+)(?:st|nd|rd|th)?[\s]*(?:floor|level)', floor_text)
+            if floor_match:
+                return int(floor_match.group(1))
+    return None
+
+
+def extract_price(tree, blocks):
+    candidates = find_by_class(tree, "item-price", tag="span") + find_by_class(tree, "price")
+    candidates += [elem for own, elem in blocks if any(k in own for k in ['BDT', 'Tk', 'Lakh', 'Crore'])]
+    for elem in candidates:
+        price_text = element_text(elem)
+        if any(keyword in price_text for keyword in PRICE_KEYWORDS):
+            return price_text
+    return None
+
+
+def extract_location(tree):
+    candidates = tree.xpath('//address') + find_by_class(tree, "location") + find_by_class(tree, "address")
+    for elem in candidates:
+        loc_text = element_text(elem)
+        if loc_text and loc_text != "N/A" and len(loc_text) > 2:
+            return loc_text
+    return None
+
+
+def extract_property_type(blocks, url):
+    for own, elem in blocks:
+        if 'Flat' in own or 'Apartment' in own or 'House' in own:
+            type_text = element_text(elem).lower()
+            if "flat" in type_text:
+                return "Flat"
+            elif "apartment" in type_text:
+                return "Apartment"
+            elif "house" in type_text:
+                return "House"
+
+    # Also check URL
+    url_lower = url.lower()
+    if "flat" in url_lower:
+        return "Flat"
+    elif "apartment" in url_lower:
+        return "Apartment"
+    elif "house" in url_lower:
+        return "House"
+    return None
+
+
+def extract_for_rent_sell(tree, url, price):
+    for_rent_sell = None
+
+    # Check URL first
+    url_lower = url.lower()
+    if "rent" in url_lower:
+        for_rent_sell = "Rent"
+    elif "sale" in url_lower or "sell" in url_lower:
+        for_rent_sell = "Sell"
+
+    # Also check page content
+    if not for_rent_sell:
+        body = tree.xpath('//body')
+        page_text = element_text(body[0] if body else tree).lower()
+        if "for rent" in page_text or "available for rent" in page_text:
+            for_rent_sell = "Rent"
+        elif "for sale" in page_text or "available for sale" in page_text:
+            for_rent_sell = "Sell"
+
+    # Check price text for rent indicators
+    if price:
+        price_lower = price.lower()
+        if "per month" in price_lower or "monthly" in price_lower or "rent" in price_lower:
+            for_rent_sell = "Rent"
+        elif "crore" in price_lower or "lakh" in price_lower:
+            if not for_rent_sell:
+                for_rent_sell = "Sell"
+    return for_rent_sell
+
+
+def parse_property_detail(page_source, url):
+    """Extract the detail fields from a property page's HTML without a browser.
+
+    Structured sources (JSON-LD, the Houzez detail table, meta tags) are read
+    first; the text heuristics only run for fields they left empty.
+    """
+    detail = empty_detail()
+    tree = parse_html(page_source)
+
+    before = dict(detail) if metrics.enabled else None
+    extract_json_ld(tree, detail)
+    before = count_selector_hits("json_ld", before, detail)
+    strip_scripts(tree)
+    extract_detail_table(tree, detail)
+    before = count_selector_hits("detail_table", before, detail)
+    meta_text = extract_meta(tree, detail)
+    before = count_selector_hits("meta", before, detail)
+
+    if all(detail[field] is not None for field in detail):
+        return detail
+
+    blocks = text_blocks(tree)
+    if meta_text:
+        meta_elem = lxml_html.Element("div")
+        meta_elem.text = meta_text
+        blocks.append((meta_text, meta_elem))
+
+    if detail["area_sqft"] is None:
+        detail["area_sqft"] = extract_area(blocks)
+    if detail["bedrooms"] is None:
+        detail["bedrooms"] = extract_bedrooms(blocks)
+    if detail["price"] is None:
+        detail["price"] = extract_price(tree, blocks)
+    if detail["bathrooms"] is None:
+        detail["bathrooms"] = extract_bathrooms(blocks)
+    if detail["floor"] is None:
+        detail["floor"] = extract_floor(blocks)
+    if detail["for_rent_sell"] is None:
+        detail["for_rent_sell"] = extract_for_rent_sell(tree, url, detail["price"])
+    if detail["property_type"] is None:
+        detail["property_type"] = extract_property_type(blocks, url)
+    if detail["location"] is None:
+        detail["location"] = extract_location(tree)
+    count_selector_hits("heuristic", before, detail)
+    return detail
+
+
+def count_selector_hits(source, before, detail):
+    """Count, per field, which extraction stage was tried on it and whether it filled it.
+
+    `before` is the detail as it was before the stage ran (None when
+    telemetry is off); returns the snapshot to pass to the next stage.
+    """
+    if before is None:
+        return None
+    for field, value in before.items():
+        if value is None:
+            metrics.count("selector_tried", field=field, source=source)
+            if detail[field] is not None:
+                metrics.count("selector_hit", field=field, source=source)
+    return dict(detail)
+
+
+# A single listing's URL: /property/<slug>/, not the archive or its /property/page/N/ pages
+PROPERTY_URL = re.compile(r'/property/(?!page/)[^/?#]+/?$')
+
+
+def parse_listing_cards(page_source, base_url):
+    """(url, card) pairs for every property on a listing page, in page order.
+
+    Reads the Houzez cards first and then any other /property/ links, the
+    same sources Step 1 uses in the browser.
+    """
+    tree = parse_html(page_source)
+    tree.make_links_absolute(base_url)
+    strip_scripts(tree)
+
+    cards = []
+    seen = set()
+    for card in tree.xpath('//div[contains(@class, "item-listing-wrap")]'):
+        # The title link first: the thumbnail link before it has no text
+        links = card.xpath('.//h2[contains(@class, "item-title")]//a[@href]') or \
+            card.xpath('.//a[contains(@href, "/property/")]')
+        if not links:
+            continue
+        url = links[0].get("href").split("#")[0]
+        if not PROPERTY_URL.search(url) or url in seen:
+            continue
+        seen.add(url)
+
+        address = card.xpath('.//address | .//*[contains(@class, "address") or contains(@class, "location")]')
+        price = card.xpath('.//*[contains(@class, "item-price")] | .//*[contains(@class, "price")]')
+        cards.append((url, {
+            "title": element_text(links[0]) or links[0].get("title") or "N/A",
+            "location": element_text(address[0]) if address else None,
+            "price": element_text(price[0]) if price else None
+        }))
+
+    for link in tree.xpath('//a[contains(@href, "/property/")]'):
+        url = link.get("href").split("#")[0]
+        if url in seen or not PROPERTY_URL.search(url):
+            continue
+        seen.add(url)
+        cards.append((url, {"title": element_text(link) or link.get("title") or "N/A", "location": None, "price": None}))
+    return cards
+
+
+def parse_pagination_links(page_source, base_url):
+    """Absolute hrefs of every pagination link on a listing page."""
+    tree = parse_html(page_source)
+    tree.make_links_absolute(base_url)
+    links = tree.xpath(
+        '//*[contains(@class, "pagination") or contains(@class, "page-numbers") or contains(@class, "pager")]//a[@href]'
+        ' | //a[contains(@class, "page-numbers")][@href]'
+        ' | //nav//a[@href] | //*[@role="navigation"]//a[@href]'
+    )
+    return [link.get("href") for link in links]
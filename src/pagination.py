@@ -0,0 +1,79 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http_fetch import fetch_html
+from page_parser import parse_listing_cards, parse_pagination_links
+from telemetry import metrics
+
+# Page-number patterns seen on WordPress/Houzez sites, most specific first
+PAGE_PATTERNS = [
+    re.compile(r'(/page/)(\d+)(/?)', re.IGNORECASE),
+    re.compile(r'([?&]paged=)(\d+)()', re.IGNORECASE),
+    re.compile(r'([?&]page=)(\d+)()', re.IGNORECASE),
+]
+
+
+def detect_page_template(hrefs):
+    """Learn the listing URL template and the highest page number from pagination links.
+
+    Returns (template, total_pages) where template contains '{page}', or
+    (None, 0) if none of the known patterns match.
+    """
+    for pattern in PAGE_PATTERNS:
+        template = None
+        total_pages = 0
+        for href in hrefs:
+            match = pattern.search(href)
+            if not match:
+                continue
+            number = int(match.group(2))
+            if number > total_pages:
+                total_pages = number
+                template = href[:match.start()] + match.group(1) + "{page}" + match.group(3) + href[match.end():]
+        if template:
+            return template, total_pages
+    return None, 0
+
+
+def discover_pagination(session, start_url):
+    """Fetch the first listing page once and learn its pagination template and page count."""
+    html = fetch_html(session, start_url)
+    template, total_pages = detect_page_template(parse_pagination_links(html, start_url))
+    return template, total_pages, html
+
+
+def crawl_listing_pages(session, start_url, template, first_page, last_page, workers=8, first_html=None, archive=None):
+    """Fetch listing pages concurrently and yield (page_num, page_url, cards) in page order.
+
+    Pages are submitted in windows of 2 × workers, so a consumer that stops
+    early (e.g. incremental mode) leaves at most one window of wasted fetches.
+    A page that fails to download yields None instead of a card list,
+    so it can be told apart from a page with no listings. Each page's HTML
+    is stored in `archive` (an html_archive.HtmlArchive) when one is given.
+    """
+    def page_url(page_num):
+        return start_url if page_num == 1 else template.format(page=page_num)
+
+    def fetch_page(page_num):
+        url = page_url(page_num)
+        try:
+            if page_num == 1 and first_html:
+                html = first_html
+            else:
+                with metrics.timer("fetch_seconds", kind="listing", via="http"):
+                    html = fetch_html(session, url)
+                metrics.count("pages_fetched", kind="listing", via="http")
+            if archive is not None:
+                archive.store(url, html, "listing")
+            with metrics.timer("parse_seconds", kind="listing"):
+                return page_num, url, parse_listing_cards(html, url)
+        except Exception as e:
+            metrics.count("fetch_errors", kind="listing", via="http")
+            print(f"    Error fetching listing page {page_num}: {e}")
+            return page_num, url, None
+
+    window = max(1, workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for window_start in range(first_page, last_page + 1, window):
+            pages = range(window_start, min(window_start + window, last_page + 1))
+            for result in executor.map(fetch_page, pages):
+                yield result
@@ -0,0 +1,381 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+
+MODEL_DIR = "data/store/models/"
+
+NUMERIC_FEATURES = ("Area_sqft", "Bedroom", "Bathroom", "Floor")
+# One-hot features; Neighborhood falls back to Location in frames cleaned before it existed.
+# Rent and sale prices differ by two orders of magnitude, so For is one of them.
+CATEGORY_FEATURES = ("Neighborhood", "For", "Property_Type")
+
+TARGET = "Price_BDT"
+
+RIDGE_ALPHA = 1.0
+
+
+def category_column(df, name):
+    if name == "Neighborhood" and name not in df.columns:
+        name = "Location"
+    if name not in df.columns:
+        import pandas as pd
+        return pd.Series("", index=df.index, dtype="string")
+    return df[name].astype("string").fillna("")
+
+
+def training_rows(df):
+    """Rows usable for training: a positive price."""
+    import pandas as pd
+
+    price = pd.to_numeric(df[TARGET], errors="coerce")
+    return df[price > 0]
+
+
+def hashed_columns(df):
+    return [column for column in (TARGET,) + NUMERIC_FEATURES + CATEGORY_FEATURES + ("Location",)
+            if column in df.columns]
+
+
+def data_hash(df, backend, alpha):
+    """Hash of the training data and settings, naming the cached model file."""
+    import pandas as pd
+
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df[hashed_columns(df)], index=False).to_numpy().tobytes())
+    digest.update(f"{backend}:{alpha}".encode())
+    return digest.hexdigest()[:16]
+
+
+def row_keys(df):
+    """(key, hash) Series per row: the URL (or the hash, for frames without URLs) and a hash of its values."""
+    import pandas as pd
+
+    hashes = pd.util.hash_pandas_object(df[hashed_columns(df)], index=False).astype("string")
+    hashes.index = df.index
+    keys = df["URL"].astype("string").fillna(hashes) if "URL" in df.columns else hashes
+    return keys, hashes
+
+
+def unseen_rows(df, fingerprints):
+    """Rows of `df` that are new or changed since `fingerprints` (key → hash), which is updated in place.
+
+    A URL listed twice in `df` counts once, with its last row, so folding in
+    a whole snapshot only adds the listings that appeared or changed.
+    """
+    import numpy as np
+
+    keys, hashes = row_keys(df)
+    changed = np.array([fingerprints.get(key) != value for key, value in zip(keys, hashes)], dtype=bool)
+    fresh = ~keys.duplicated(keep="last").to_numpy() & changed
+    fingerprints.update(zip(keys[fresh], hashes[fresh]))
+    return df[fresh]
+
+
+class RidgePriceModel:
+    """Closed-form ridge regression of log price on standardized numbers and one-hot categories.
+
+    Only the normal equations (XᵀX and Xᵀy) are kept, so partial_fit() adds
+    a new snapshot's rows and re-solves without revisiting old data. A hash
+    of each folded-in row is kept by URL, so listings still live in the next
+    snapshot are not counted twice; only new or changed ones are added.
+    One-hot columns are numbered in the order their values were first seen,
+    so new category values append zero rows and columns to the matrices.
+    """
+
+    backend = "ridge"
+
+    def __init__(self, alpha=RIDGE_ALPHA):
+        import numpy as np
+
+        self.alpha = alpha
+        self.means = None
+        self.scales = None
+        self.onehots = []  # [name, value] of each one-hot column
+        self.xtx = np.zeros((0, 0))
+        self.xty = np.zeros(0)
+        self.rows = 0
+        self.weights = None
+        self.fingerprints = {}  # URL → hash of the row last folded in
+
+    @property
+    def feature_names(self):
+        return (["intercept"] + list(NUMERIC_FEATURES) + [f"{name}_missing" for name in NUMERIC_FEATURES]
+                + [f"{name}={value}" for name, value in self.onehots])
+
+    def numeric(self, df):
+        import numpy as np
+        import pandas as pd
+
+        return np.column_stack([pd.to_numeric(df[name], errors="coerce").astype("float64").to_numpy()
+                                if name in df.columns else np.full(len(df), np.nan) for name in NUMERIC_FEATURES])
+
+    def design(self, df, grow=False):
+        """Design matrix of `df`: intercept, standardized numbers (mean-imputed), missing flags, one-hots.
+
+        With `grow`, unseen category values are added to the vocabulary;
+        otherwise they get an all-zero one-hot row (the baseline).
+        """
+        import numpy as np
+        import pandas as pd
+
+        values = self.numeric(df)
+        missing = np.isnan(values)
+        scaled = np.where(missing, 0.0, (values - self.means) / self.scales)
+        columns = {name: category_column(df, name) for name in CATEGORY_FEATURES}
+        if grow:
+            known = {tuple(pair) for pair in self.onehots}
+            for name, column in columns.items():
+                self.onehots += [[name, value] for value in sorted(set(column.unique()) - {""})
+                                 if (name, value) not in known]
+        onehot = np.zeros((len(df), len(self.onehots)))
+        for name, column in columns.items():
+            positions = [(value, i) for i, (other, value) in enumerate(self.onehots) if other == name]
+            codes = pd.Index([value for value, _ in positions], dtype=object).get_indexer(column.astype(object))
+            hit = codes >= 0
+            onehot[np.flatnonzero(hit), np.array([i for _, i in positions], dtype="int64")[codes[hit]]] = 1.0
+        return np.hstack([np.ones((len(df), 1)), scaled, missing.astype("float64"), onehot])
+
+    def partial_fit(self, df):
+        """Add `df`'s new or changed priced rows to the normal equations and re-solve.
+
+        A batch without such rows leaves a fitted model unchanged; the first
+        fit raises ValueError, as there is nothing to solve for.
+        """
+        import numpy as np
+
+        df = training_rows(df)
+        if df.empty and self.weights is None:
+            raise ValueError(f"No rows with a positive {TARGET} to train on")
+        df = unseen_rows(df, self.fingerprints)
+        if df.empty:
+            return self
+        if self.means is None:
+            values = self.numeric(df)
+            self.means = np.nan_to_num(np.nanmean(values, axis=0))
+            self.scales = np.nan_to_num(np.nanstd(values, axis=0), nan=1.0)
+            self.scales[self.scales == 0] = 1.0
+        x = self.design(df, grow=True)
+        y = np.log(df[TARGET].astype("float64").to_numpy())
+        size = x.shape[1]
+        if size > len(self.xty):
+            xtx = np.zeros((size, size))
+            xtx[:len(self.xty), :len(self.xty)] = self.xtx
+            self.xtx = xtx
+            self.xty = np.concatenate([self.xty, np.zeros(size - len(self.xty))])
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.rows += len(df)
+        self.solve()
+        return self
+
+    fit = partial_fit
+
+    def solve(self):
+        import numpy as np
+
+        penalty = np.full(len(self.xty), self.alpha)
+        penalty[0] = 0.0  # Intercept is not shrunk
+        self.weights = np.linalg.solve(self.xtx + np.diag(penalty), self.xty)
+
+    def predict(self, df):
+        """Estimated prices (BDT) for every row of `df`, in one matrix product."""
+        import numpy as np
+
+        return np.exp(self.design(df) @ self.weights)
+
+    def save(self, path):
+        import numpy as np
+
+        meta = {"alpha": self.alpha, "rows": self.rows, "onehots": self.onehots, "fingerprints": self.fingerprints}
+        np.savez(path, means=self.means, scales=self.scales, xtx=self.xtx, xty=self.xty,
+                 weights=self.weights, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            model = cls(meta["alpha"])
+            model.means, model.scales = data["means"], data["scales"]
+            model.xtx, model.xty, model.weights = data["xtx"], data["xty"], data["weights"]
+        model.rows = meta["rows"]
+        model.onehots = meta["onehots"]
+        model.fingerprints = meta.get("fingerprints", {})
+        return model
+
+
+def import_sklearn():
+    try:
+        import sklearn.ensemble
+        return sklearn
+    except ImportError:
+        raise ImportError("The gradient-boosting backend needs scikit-learn: pip install scikit-learn")
+
+
+class BoostedPriceModel:
+    """Gradient-boosted trees (scikit-learn's HistGradientBoostingRegressor) on the same features.
+
+    Trees cannot absorb new rows, so partial_fit() retrains on all rows seen
+    so far, keeping the latest row per URL. A batch with nothing new or
+    changed does not retrain.
+    """
+
+    backend = "gbm"
+
+    def __init__(self, **params):
+        self.params = params
+        self.categories = {name: [] for name in CATEGORY_FEATURES}
+        self.model = None
+        self.seen = None
+        self.fingerprints = {}
+
+    def design(self, df):
+        import numpy as np
+        import pandas as pd
+
+        columns = [pd.to_numeric(df[name], errors="coerce").astype("float64").to_numpy()
+                   if name in df.columns else np.full(len(df), np.nan) for name in NUMERIC_FEATURES]
+        for name in CATEGORY_FEATURES:
+            codes = pd.Index(self.categories[name]).get_indexer(category_column(df, name)).astype("float64")
+            columns.append(np.where(codes >= 0, codes, np.nan))
+        return np.column_stack(columns)
+
+    def partial_fit(self, df):
+        import numpy as np
+        import pandas as pd
+
+        sklearn = import_sklearn()
+        df = training_rows(df)
+        if df.empty and self.model is None:
+            raise ValueError(f"No rows with a positive {TARGET} to train on")
+        df = unseen_rows(df, self.fingerprints)
+        if df.empty:
+            return self
+        if self.seen is not None:
+            df = pd.concat([self.seen, df], ignore_index=True)
+            df = df[~row_keys(df)[0].duplicated(keep="last")].reset_index(drop=True)
+        self.seen = df
+        for name in CATEGORY_FEATURES:
+            self.categories[name] = sorted(set(category_column(self.seen, name).unique()) - {""})
+        categorical = [False] * len(NUMERIC_FEATURES) + [True] * len(CATEGORY_FEATURES)
+        self.model = sklearn.ensemble.HistGradientBoostingRegressor(categorical_features=categorical, **self.params)
+        self.model.fit(self.design(self.seen), np.log(self.seen[TARGET].astype("float64").to_numpy()))
+        return self
+
+    fit = partial_fit
+
+    def predict(self, df):
+        import numpy as np
+
+        return np.exp(self.model.predict(self.design(df)))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+BACKENDS = {"ridge": (RidgePriceModel, ".npz"), "gbm": (BoostedPriceModel, ".pkl")}
+
+
+def train_or_load(df, backend="ridge", alpha=RIDGE_ALPHA, model_dir=MODEL_DIR):
+    """Model trained on `df`, loaded from model_dir when the same data was trained on before."""
+    model_class, suffix = BACKENDS[backend]
+    df = training_rows(df)
+    path = os.path.join(model_dir, f"{backend}-{data_hash(df, backend, alpha)}{suffix}")
+    if os.path.exists(path):
+        print(f"Loaded cached model → {path}")
+        return model_class.load(path)
+    start = time.perf_counter()
+    model = model_class(alpha) if backend == "ridge" else model_class()
+    model.fit(df)
+    os.makedirs(model_dir, exist_ok=True)
+    model.save(path)
+    print(f"Trained {backend} on {len(df):,} rows in {time.perf_counter() - start:.2f}s → {path}")
+    return model
+
+
+def refit(model_path, df, model_dir=MODEL_DIR):
+    """Fold a new snapshot into a saved model and save the result under the new data's hash."""
+    backend = "ridge" if model_path.endswith(".npz") else "gbm"
+    model_class, suffix = BACKENDS[backend]
+    df = training_rows(df)
+    # Named after the old model and the new rows, so refitting the same snapshot again is a cache hit
+    previous = os.path.splitext(os.path.basename(model_path))[0]
+    name = hashlib.sha256(f"{previous}:{data_hash(df, backend, '')}".encode()).hexdigest()[:16]
+    path = os.path.join(model_dir, f"{backend}-{name}{suffix}")
+    if os.path.exists(path):
+        print(f"Loaded cached model → {path}")
+        return model_class.load(path)
+    model = model_class.load(model_path).partial_fit(df)
+    os.makedirs(model_dir, exist_ok=True)
+    model.save(path)
+    print(f"Refit {model_path} with {len(df):,} rows → {path}")
+    return model
+
+
+def benchmark(path="data/cleaned/brokeragebd_clean.csv", rows=1_000_000, backend="ridge"):
+    """Time scoring `rows` resampled listings in one batch against a per-row loop."""
+    from utils import read_listings
+
+    df = read_listings(path)
+    model = train_or_load(df, backend)
+    sample = df.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+
+    start = time.perf_counter()
+    estimates = model.predict(sample)
+    elapsed = time.perf_counter() - start
+    print(f"  batch   {len(sample):,} rows in {elapsed:6.2f}s  {len(sample) / elapsed:>12,.0f} rows/s")
+
+    subset = sample.head(2_000)
+    start = time.perf_counter()
+    for i in range(len(subset)):
+        model.predict(subset.iloc[i:i + 1])
+    per_row = (time.perf_counter() - start) / len(subset)
+    print(f"  per row {1 / per_row:>28,.0f} rows/s ({per_row * len(sample):,.0f}s for all rows)")
+    return estimates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch price estimation for cleaned listings")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="ridge")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="train (or load the cached model for) the cleaned data")
+    train.add_argument("--input", default="data/cleaned/brokeragebd_clean.csv")
+
+    predict = commands.add_parser("predict", help="add Estimated_Price_BDT to a listings CSV")
+    predict.add_argument("--input", default="data/cleaned/brokeragebd_clean.csv")
+    predict.add_argument("--training", default="data/cleaned/brokeragebd_clean.csv")
+    predict.add_argument("--output", default="data/cleaned/price_estimates.csv")
+
+    refit_command = commands.add_parser("refit", help="fold a new snapshot into a saved model")
+    refit_command.add_argument("model")
+    refit_command.add_argument("--input", required=True)
+
+    bench = commands.add_parser("benchmark", help="time batch scoring of resampled listings")
+    bench.add_argument("--input", default="data/cleaned/brokeragebd_clean.csv")
+    bench.add_argument("--rows", type=int, default=1_000_000)
+
+    args = parser.parse_args()
+    from utils import read_listings
+
+    if args.command == "train":
+        model = train_or_load(read_listings(args.input), args.backend)
+    elif args.command == "predict":
+        model = train_or_load(read_listings(args.training), args.backend)
+        df = read_listings(args.input)
+        df["Estimated_Price_BDT"] = model.predict(df).round(-3)
+        df.to_csv(args.output, index=False)
+        print(f"Saved {len(df):,} estimates → {args.output}")
+    elif args.command == "refit":
+        refit(args.model, read_listings(args.input))
+    else:
+        benchmark(args.input, args.rows, args.backend)
@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+import urllib.parse
+from telemetry import metrics
+
+
+class ThrottledError(Exception):
+    """The host kept answering 429/5xx or empty pages after every retry."""
+
+
+class HostState:
+    """Token bucket, concurrency cap and backoff state for one host."""
+
+    def __init__(self, rate, burst, max_concurrency):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.backoff_until = 0.0
+        self.healthy_streak = 0
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+
+
+class HostScheduler:
+    """Pace concurrent fetches per host and adapt the rate to how the host responds.
+
+    Each host gets a token bucket (`rate` requests/second, bursts of
+    `burst`) and at most `max_concurrency` requests in flight. A 429, 5xx or
+    empty page halves the host's rate and pauses it with exponential
+    backoff plus full jitter (honouring Retry-After up to `max_backoff`).
+    Every `increase_after` healthy responses in a row raise the rate by
+    `increase_step`, up to `max_rate`.
+    """
+
+    def __init__(self, rate=2.0, burst=4, max_concurrency=8, min_rate=0.2, max_rate=20.0,
+                 increase_after=20, increase_step=0.5, base_backoff=1.0, max_backoff=60.0, max_retries=5):
+        self.initial_rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_after = increase_after
+        self.increase_step = increase_step
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.hosts = {}
+        self.stats = {"requests": 0, "throttled": 0, "retries": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostState(self.initial_rate, self.burst, self.max_concurrency)
+            return self.hosts[host]
+
+    def _take_token(self, state):
+        """Block until the host is out of backoff and has a token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                state.tokens = min(state.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                if now < state.backoff_until:
+                    delay = state.backoff_until - now
+                elif state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                else:
+                    delay = (1 - state.tokens) / state.rate
+            time.sleep(delay)
+
+    def _on_throttled(self, state, attempt, retry_after=None):
+        with self._lock:
+            state.rate = max(self.min_rate, state.rate / 2)
+            state.tokens = min(state.tokens, 0)
+            state.healthy_streak = 0
+            delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+            state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+            self.stats["throttled"] += 1
+        metrics.count("http_throttled")
+
+    def _on_healthy(self, state):
+        with self._lock:
+            state.healthy_streak += 1
+            if state.healthy_streak >= self.increase_after:
+                state.rate = min(self.max_rate, state.rate + self.increase_step)
+                state.healthy_streak = 0
+
+    def request(self, session, url, timeout=15, **kwargs):
+        """GET `url` through the host's bucket, retrying throttled answers with backoff."""
+        state = self._host(url)
+        for attempt in range(self.max_retries + 1):
+            self._take_token(state)
+            with state.slots:
+                with self._lock:
+                    self.stats["requests"] += 1
+                    if attempt:
+                        self.stats["retries"] += 1
+                try:
+                    response = session.get(url, timeout=timeout, **kwargs)
+                except Exception:
+                    if attempt == self.max_retries:
+                        with self._lock:
+                            self.stats["failed"] += 1
+                        raise
+                    self._on_throttled(state, attempt)
+                    continue
+
+            throttled = response.status_code == 429 or response.status_code >= 500
+            if throttled or (response.status_code == 200 and not response.content.strip()):
+                self._on_throttled(state, attempt, parse_retry_after(response.headers.get("Retry-After")))
+                continue
+            self._on_healthy(state)
+            return response
+
+        with self._lock:
+            self.stats["failed"] += 1
+        raise ThrottledError(f"{url} still throttled after {self.max_retries} retries")
+
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+            rates = {host: state.rate for host, state in self.hosts.items()}
+        if not stats["requests"]:
+            return
+        print(f"\nHTTP scheduler: {stats['requests']} requests, {stats['throttled']} throttled, "
+              f"{stats['retries']} retries, {stats['failed']} failed")
+        for host, rate in rates.items():
+            print(f"  - {host}: settled at {rate:.2f} req/s")
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header given in seconds; None for dates or junk."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
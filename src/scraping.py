@@ -1,353 +1,161 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import pandas as pd
-import time
+import os
 import re
+import sys
+import time
+import json
+import argparse
+import functools
 import urllib.parse
-from utils import save_raw_data
+from utils import RAW_DIR
+from driver_pool import DriverPool, iter_scrape_in_parallel, benchmark_worker_counts, is_session_crash
+from http_fetch import create_session, fetch_html
+from page_parser import parse_property_detail, missing_required, empty_detail, parse_listing_cards
+from pagination import discover_pagination, crawl_listing_pages
+from wp_source import fetch_sitemap_urls, fetch_rest_records
+from journal import CrawlJournal, load_journal
+from incremental import ChangeTracker, card_fingerprint, load_snapshot, save_snapshot_index
+from browser import BrowserProfile, BandwidthMeter
+from scheduler import HostScheduler
+from waits import WaitEngine, dom_ready, element_present, page_changed, count_grew, count_stable
+from telemetry import metrics
+from html_archive import HtmlArchive, latest_entries, map_pages
+from sinks import open_sink, print_summary
+from slug_parser import parse_title, parse_slug
+from units import parse_price
 
-# ChromeDriver path
-CHROME_DRIVER_PATH = r"E:\chromedriver-win64\chromedriver-win64\chromedriver.exe"
+# Selenium, requests and pandas are imported only inside the functions that
+# need them, so `--help`, `parse` and the other non-browser commands start
+# instantly.
+
+# ChromeDriver path; when unset, Selenium Manager finds a matching driver
+CHROME_DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
 
 # URL to scrape
 URL = "https://brokeragebd.com/"
 
-def normalize_price(price_str):
-    """Convert price strings containing Crore/Lakh/Thousand into numeric BDT."""
-    if not isinstance(price_str, str):
-        return None
+# Where the raw listings are written
+RAW_OUTPUT_PATH = os.path.join(RAW_DIR, "brokeragebd_raw.csv")
 
-    price = price_str.lower().replace(",", "").replace("bdt", "").replace("tk", "").strip()
-    if not price:
-        return None
+MAX_PAGES = 500  # Listing pages to walk at most
 
-    multiplier = 1
-    if "crore" in price:
-        multiplier = 10_000_000
-    elif "lakh" in price or "lac" in price:
-        multiplier = 100_000
-    elif "thousand" in price or "k" in price:
-        multiplier = 1_000
+# Number of browser sessions used to visit detail pages in Step 2
+NUM_WORKERS = 4
 
-    numbers = re.findall(r"[\d.]+", price)
-    if not numbers:
-        return None
+# Step 2 browser sessions are reused across pages and replaced after this many
+# pages or once their memory passes this many MB (memory check needs psutil)
+SESSION_MAX_PAGES = 150
+SESSION_MAX_RSS_MB = 1024
+
+# Headless Chrome with eager page loads; images, fonts, media and known
+# trackers/ads are blocked. Set allow_only=True to also block every host
+# outside ALLOW_DOMAINS.
+BROWSER_PROFILE = BrowserProfile(headless=True, page_load_strategy="eager", block_resources=True)
+
+# Requests, bytes and blocked requests per browser page
+bandwidth = BandwidthMeter()
+
+# "direct" learns the pagination URL template once and fetches listing pages
+# concurrently over HTTP; "click" drives the browser through each page
+LISTING_MODE = "direct"
+LISTING_WORKERS = 8
+
+# Politeness: starting requests/second per host and requests in flight per host.
+# The scheduler backs off on 429/5xx/empty pages and speeds up while healthy.
+REQUEST_RATE = 2.0
+MAX_HOST_CONCURRENCY = 8
+
+# Append-only journal of crawl progress used by --resume
+JOURNAL_PATH = "data/raw/crawl_journal.jsonl"
 
-    value = float(numbers[0]) * multiplier
-    return round(value, 2)
+# Incremental mode: fingerprints of the last snapshot's cards, and how many
+# listing pages in a row with only known, unchanged cards end pagination
+SNAPSHOT_INDEX_PATH = "data/raw/brokeragebd_index.json"
+INCREMENTAL_STOP_AFTER_PAGES = 3
 
+# Timeout budgets (seconds) for the readiness waits that replace fixed sleeps
+PAGE_LOAD_TIMEOUT = 15
+SCROLL_GROWTH_TIMEOUT = 2.5
+NAVIGATION_TIMEOUT = 10
+URL_PROBE_TIMEOUT = 5
+
+LISTING_CARD_SELECTOR = 'div.item-listing-wrap'
+
+# Records how long every wait actually took; printed at the end of the run
+waits = WaitEngine()
+
+# "http" fetches detail pages without a browser and falls back to Selenium only
+# when required fields are missing; "selenium" always renders the page in Chrome
+FETCH_MODE = "http"
+
+# Detail URLs used by `crawl --benchmark-workers` for the pages/min report
+BENCHMARK_SAMPLE_SIZE = 40
+
+# Seconds between metric snapshots written during a run with --metrics
+METRICS_INTERVAL = 30
+
+# Every fetched listing and detail page is kept here (one gzip segment per run)
+# so `reextract` can rebuild the CSV with improved extractors without a re-crawl
+ARCHIVE_DIR = "data/raw/html_archive/"
+archive = HtmlArchive()
+
+def normalize_price(price_str):
+    """Convert price strings containing Crore/Lakh/Thousand into numeric BDT."""
+    return parse_price(price_str)
 
 def extract_info_from_title(title):
     """Extract area, bedrooms, location, and For (Rent/Sell) from title.
     Example: '1437 sft 3-bedroom flat is ready for sale in Uttara'
     """
-    info = {"area_sqft": None, "bedrooms": None, "location": None, "for_rent_sell": None}
-    
-    if title and title != "N/A":
-        title_lower = title.lower()
-        # Extract area: "1437 sft" or "1437sft"
-        area_match = re.search(r'(\d+)\s*sft', title_lower)
-        if area_match:
-            info["area_sqft"] = int(area_match.group(1))
-        
-        # Extract bedrooms: "3-bedroom" or "3 bedroom"
-        bedroom_match = re.search(r'(\d+)[-\s]*bedroom', title_lower)
-        if bedroom_match:
-            info["bedrooms"] = int(bedroom_match.group(1))
-        
-        # Extract location: text after "in" (e.g., "in Uttara")
-        location_match = re.search(r'in\s+([^,]+?)(?:\s|$|,|\.)', title, re.IGNORECASE)
-        if location_match:
-            info["location"] = location_match.group(1).strip()
-        
-        # Extract For (Rent/Sell) from title
-        if "for rent" in title_lower or "rent" in title_lower:
-            info["for_rent_sell"] = "Rent"
-        elif "for sale" in title_lower or "sale" in title_lower:
-            info["for_rent_sell"] = "Sell"
-    
-    return info
+    return parse_title(title)
 
 def extract_info_from_url(url):
-    """Extract area, bedrooms, location, and For (Rent/Sell) from URL structure."""
-    info = {"area_sqft": None, "bedrooms": None, "location": None, "for_rent_sell": None, "property_type": None}
-    
-    if url and url != "N/A":
-        url_lower = url.lower()
-        # Pattern: ...1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/
-        area_match = re.search(r'(\d+)-sft', url_lower)
-        bedroom_match = re.search(r'(\d+)-bedroom', url_lower)
-        location_match = re.search(r'in-([^/]+)', url_lower)
-        
-        if area_match:
-            info["area_sqft"] = int(area_match.group(1))
-        if bedroom_match:
-            info["bedrooms"] = int(bedroom_match.group(1))
-        if location_match:
-            info["location"] = location_match.group(1).replace('-', ' ').title()
-        
-        # Extract For (Rent/Sell) from URL
-        if "for-rent" in url_lower or "rent" in url_lower:
-            info["for_rent_sell"] = "Rent"
-        elif "for-sale" in url_lower or "sale" in url_lower:
-            info["for_rent_sell"] = "Sell"
-        
-        # Extract property type from URL
-        if "flat" in url_lower:
-            info["property_type"] = "Flat"
-        elif "apartment" in url_lower:
-            info["property_type"] = "Apartment"
-        elif "house" in url_lower:
-            info["property_type"] = "House"
-    
-    return info
+    """Extract area, bedrooms, location, For (Rent/Sell) and property type from URL structure."""
+    return parse_slug(url)
 
 def scrape_property_detail(driver, url):
-    """Scrape detailed information from individual property page."""
-    detail = {
-        "area_sqft": None,
-        "bedrooms": None,
-        "bathrooms": None,
-        "floor": None,
-        "for_rent_sell": None,
-        "price": None,
-        "location": None,
-        "property_type": None
-    }
-    
+    """Scrape detailed information from individual property page.
+
+    Takes a single page_source snapshot and parses it locally, so each page
+    costs one WebDriver round-trip instead of one per selector.
+    """
     try:
-        driver.get(url)
-        time.sleep(2)  # Wait for page to load
-        
-        # Try to find area - look for text containing "sft" or "sqft"
-        try:
-            # Try multiple approaches
-            area_xpaths = [
-                "//*[contains(text(), 'sft') or contains(text(), 'sqft') or contains(text(), 'Sq Ft')]",
-                "//*[contains(., 'sft') or contains(., 'sqft')]"
-            ]
-            for xpath in area_xpaths:
-                try:
-                    area_elems = driver.find_elements(By.XPATH, xpath)
-                    for elem in area_elems:
-                        area_text = elem.text
-                        area_match = re.search(r'(\d+)', area_text.replace(',', ''))
-                        if area_match:
-                            area_val = int(area_match.group(1))
-                            if 100 <= area_val <= 10000:  # Reasonable range for sqft
-                                detail["area_sqft"] = area_val
-                                break
-                    if detail["area_sqft"]:
-                        break
-                except:
-                    continue
-        except:
-            pass
-        
-        # Try to find bedrooms
-        try:
-            bedroom_xpaths = [
-                "//*[contains(text(), 'Bedroom') or contains(text(), 'bedroom')]",
-                "//*[contains(., 'bedroom')]"
-            ]
-            for xpath in bedroom_xpaths:
-                try:
-                    bedroom_elems = driver.find_elements(By.XPATH, xpath)
-                    for elem in bedroom_elems:
-                        bedroom_text = elem.text
-                        bedroom_match = re.search(r'(\d+)[-\s]*bedroom', bedroom_text.lower())
-                        if bedroom_match:
-                            detail["bedrooms"] = int(bedroom_match.group(1))
-                            break
-                    if detail["bedrooms"]:
-                        break
-                except:
-                    continue
-        except:
-            pass
-        
-        # Try to find price - look for "BDT", "Tk", "Lakh", "Crore"
-        price_selectors = [
-            'span.item-price',
-            '.price',
-            '[class*="price"]',
-            '//*[contains(text(), "BDT")]',
-            '//*[contains(text(), "Tk")]',
-            '//*[contains(text(), "Lakh")]',
-            '//*[contains(text(), "Crore")]'
-        ]
-        for selector in price_selectors:
-            try:
-                if selector.startswith('//'):
-                    price_elems = driver.find_elements(By.XPATH, selector)
-                else:
-                    price_elems = driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                for price_elem in price_elems:
-                    price_text = price_elem.text.strip()
-                    if any(keyword in price_text for keyword in ['BDT', 'Tk', 'Lakh', 'Crore', 'lakh', 'crore']):
-                        detail["price"] = price_text
-                        break
-                
-                if detail["price"]:
-                    break
-            except:
-                continue
-        
-        # Try to find bathrooms
-        try:
-            bathroom_xpaths = [
-                "//*[contains(text(), 'Bathroom') or contains(text(), 'bathroom')]",
-                "//*[contains(., 'bathroom')]",
-                "//*[contains(text(), 'Bath') or contains(text(), 'bath')]"
-            ]
-            for xpath in bathroom_xpaths:
-                try:
-                    bathroom_elems = driver.find_elements(By.XPATH, xpath)
-                    for elem in bathroom_elems:
-                        bathroom_text = elem.text
-                        bathroom_match = re.search(r'(\d+)[-\s]*(?:bathroom|bath)', bathroom_text.lower())
-                        if bathroom_match:
-                            detail["bathrooms"] = int(bathroom_match.group(1))
-                            break
-                    if detail["bathrooms"]:
-                        break
-                except:
-                    continue
-        except:
-            pass
-        
-        # Try to find floor
-        try:
-            floor_xpaths = [
-                "//*[contains(text(), 'Floor') or contains(text(), 'floor')]",
-                "//*[contains(., 'floor')]",
-                "//*[contains(text(), 'Level') or contains(text(), 'level')]"
-            ]
-            for xpath in floor_xpaths:
-                try:
-                    floor_elems = driver.find_elements(By.XPATH, xpath)
-                    for elem in floor_elems:
-                        floor_text = elem.text
-                        # Look for patterns like "3rd Floor", "Floor 5", "5th floor", etc.
-                        floor_match = re.search(r'(?:floor|level)[\s:]*(\d+)', floor_text.lower())
-                        if not floor_match:
-                            floor_match = re.search(r'(\d+)(?:st|nd|rd|th)?[\s]*(?:floor|level)', floor_text.lower())
-                        if floor_match:
-                            detail["floor"] = int(floor_match.group(1))
-                            break
-                    if detail["floor"]:
-                        break
-                except:
-                    continue
-        except:
-            pass
-        
-        # Try to find For (Rent/Sell) - check URL and page content
-        try:
-            # Check URL first
-            url_lower = url.lower()
-            if "rent" in url_lower:
-                detail["for_rent_sell"] = "Rent"
-            elif "sale" in url_lower or "sell" in url_lower:
-                detail["for_rent_sell"] = "Sell"
-            
-            # Also check page content
-            if not detail["for_rent_sell"]:
-                page_text = driver.find_element(By.TAG_NAME, "body").text.lower()
-                if "for rent" in page_text or "available for rent" in page_text:
-                    detail["for_rent_sell"] = "Rent"
-                elif "for sale" in page_text or "available for sale" in page_text:
-                    detail["for_rent_sell"] = "Sell"
-            
-            # Check price text for rent indicators
-            if detail["price"]:
-                price_lower = detail["price"].lower()
-                if "per month" in price_lower or "monthly" in price_lower or "rent" in price_lower:
-                    detail["for_rent_sell"] = "Rent"
-                elif "crore" in price_lower or "lakh" in price_lower:
-                    if not detail["for_rent_sell"]:
-                        detail["for_rent_sell"] = "Sell"
-        except:
-            pass
-        
-        # Try to find property type
-        try:
-            property_type_xpaths = [
-                "//*[contains(text(), 'Flat') or contains(text(), 'Apartment') or contains(text(), 'House')]",
-                "//*[contains(., 'property type')]"
-            ]
-            for xpath in property_type_xpaths:
-                try:
-                    type_elems = driver.find_elements(By.XPATH, xpath)
-                    for elem in type_elems:
-                        type_text = elem.text.lower()
-                        if "flat" in type_text:
-                            detail["property_type"] = "Flat"
-                            break
-                        elif "apartment" in type_text:
-                            detail["property_type"] = "Apartment"
-                            break
-                        elif "house" in type_text:
-                            detail["property_type"] = "House"
-                            break
-                    if detail["property_type"]:
-                        break
-                except:
-                    continue
-            
-            # Also check URL
-            if not detail["property_type"]:
-                url_lower = url.lower()
-                if "flat" in url_lower:
-                    detail["property_type"] = "Flat"
-                elif "apartment" in url_lower:
-                    detail["property_type"] = "Apartment"
-                elif "house" in url_lower:
-                    detail["property_type"] = "House"
-        except:
-            pass
-        
-        # Try to find location
-        location_selectors = [
-            'address.item-address',
-            '.location',
-            '[class*="location"]',
-            '[class*="address"]',
-            '//address',
-            '//*[contains(@class, "location")]',
-            '//*[contains(@class, "address")]'
-        ]
-        for selector in location_selectors:
-            try:
-                if selector.startswith('//'):
-                    location_elems = driver.find_elements(By.XPATH, selector)
-                else:
-                    location_elems = driver.find_elements(By.CSS_SELECTOR, selector)
-                
-                for location_elem in location_elems:
-                    loc_text = location_elem.text.strip()
-                    if loc_text and loc_text != "N/A" and len(loc_text) > 2:
-                        detail["location"] = loc_text
-                        break
-                
-                if detail["location"]:
-                    break
-            except:
-                continue
-            
+        with metrics.timer("fetch_seconds", kind="detail", via="selenium"):
+            driver.get(url)
+            waits.wait(driver, dom_ready(), PAGE_LOAD_TIMEOUT, "detail_ready")
+            page_source = driver.page_source
+        metrics.count("pages_fetched", kind="detail", via="selenium")
+        archive.store(url, page_source, "detail")
+        bandwidth.collect(driver)
+        with metrics.timer("parse_seconds", kind="detail"):
+            return parse_property_detail(page_source, url)
     except Exception as e:
+        metrics.count("fetch_errors", kind="detail", via="selenium")
+        if is_session_crash(e):
+            raise  # The pool restarts the browser and retries this URL
         print(f"    Error scraping detail page: {e}")
     
-    return detail
+    return empty_detail()
+
+def wait_for_listing_page(driver, label="listing"):
+    """Wait until the document is complete and listing cards are present."""
+    waits.wait(driver, dom_ready(), PAGE_LOAD_TIMEOUT, f"{label}_ready")
+    return waits.wait(driver, element_present(LISTING_CARD_SELECTOR), PAGE_LOAD_TIMEOUT, f"{label}_cards")
+
+def click_and_wait(driver, element):
+    """Click a pagination link and wait for the next listing page instead of sleeping."""
+    from selenium.webdriver.common.by import By
+
+    old_url = driver.current_url
+    old_cards = driver.find_elements(By.CSS_SELECTOR, LISTING_CARD_SELECTOR)
+    driver.execute_script("arguments[0].scrollIntoView(true);", element)
+    element.click()
+    waits.wait(driver, page_changed(old_url, old_cards[0] if old_cards else None), NAVIGATION_TIMEOUT, "pagination_click")
+    wait_for_listing_page(driver)
 
 def find_and_click_next_button(driver):
     """Find and click the next page button. Returns True if successful, False otherwise."""
+    from selenium.webdriver.common.by import By
+
     next_selectors = [
         "//a[contains(text(), 'Next')]",
         "//a[contains(text(), 'next')]",
@@ -379,10 +187,7 @@ def find_and_click_next_button(driver):
                     continue  # Skip numbered pages for now
                 elif any(indicator in link_text.lower() for indicator in ['next', '→', '›', '»', '>']):
                     if link.is_displayed() and link.is_enabled():
-                        driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                        time.sleep(0.5)
-                        link.click()
-                        time.sleep(3)
+                        click_and_wait(driver, link)
                         return True
             except:
                 continue
@@ -399,10 +204,7 @@ def find_and_click_next_button(driver):
                         # Check if it's not disabled
                         classes = next_button.get_attribute("class") or ""
                         if "disabled" not in classes.lower():
-                            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                            time.sleep(0.5)
-                            next_button.click()
-                            time.sleep(3)  # Wait for page to load
+                            click_and_wait(driver, next_button)
                             return True
                 except:
                     continue
@@ -411,705 +213,1060 @@ def find_and_click_next_button(driver):
     
     return False
 
-# Setup Chrome driver
-options = Options()
-options.add_argument("--start-maximized")
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_experimental_option("excludeSwitches", ["enable-automation"])
-
-service = Service(CHROME_DRIVER_PATH)
-driver = webdriver.Chrome(service=service, options=options)
-
-print("="*60)
-print("Starting scraping process...")
-print("="*60)
-
-# Step 1: Collect all URLs from all pages
-print("\n" + "="*60)
-print("STEP 1: Collecting all property URLs from all pages...")
-print("="*60)
-
-all_urls = []
-all_titles = []
-all_card_data = {}  # Store basic card data for each URL
-page_num = 1
-max_pages = 500  # Increased limit to get more listings
-previous_page_urls = set()  # Track URLs from previous page to detect duplicates
-
-while page_num <= max_pages:
-    print(f"\n--- Page {page_num} ---")
+def create_driver(driver_path=CHROME_DRIVER_PATH, profile=BROWSER_PROFILE):
+    """Start a new Chrome session with the scraper's browser profile."""
+    return profile.create_driver(driver_path)
+
+def build_record(url, card_info, detail):
+    """Combine all sources into one record: detail page > title > URL > card."""
+    title = card_info.get("title", "N/A")
+    card_location = card_info.get("location")
+    card_price = card_info.get("price")
+
+    # Extract info from title
+    title_info = extract_info_from_title(title)
+
+    # Extract info from URL
+    url_info = extract_info_from_url(url)
+
+    area_sqft = detail["area_sqft"] or title_info["area_sqft"] or url_info["area_sqft"]
+    bedrooms = detail["bedrooms"] or title_info["bedrooms"] or url_info["bedrooms"]
+    price = detail["price"] or card_price
+    price_numeric = normalize_price(price) if price else None
+    location = detail["location"] or card_location or title_info["location"] or url_info["location"]
+    floor = detail["floor"]
+    for_rent_sell = detail["for_rent_sell"] or title_info["for_rent_sell"] or url_info["for_rent_sell"]
+    bathrooms = detail["bathrooms"]
+    property_type = detail["property_type"] or url_info["property_type"]
+
+    # Build the data record with all columns
+    return {
+        "Location": location if location else "N/A",
+        "Area_sqft": area_sqft if area_sqft else "N/A",
+        "Price": price if price else "N/A",
+        "Price_BDT": price_numeric if price_numeric else "N/A",
+        "Bedroom": bedrooms if bedrooms else "N/A",
+        "Bathroom": bathrooms if bathrooms else "N/A",
+        "Floor": floor if floor else "N/A",
+        "For": for_rent_sell if for_rent_sell else "N/A",
+        "Property_Type": property_type if property_type else "N/A",
+        "URL": url
+    }
+
+def build_fallback_record(url, card_info):
+    """Build a record from card, title and URL data when the detail page failed."""
+    title_info = extract_info_from_title(card_info.get("title", ""))
+    url_info = extract_info_from_url(url)
+
+    # Normalize price if available
+    price_text = card_info.get("price") or "N/A"
+    price_bdt = normalize_price(price_text) if price_text != "N/A" else None
+
+    return {
+        "Location": card_info.get("location") or title_info["location"] or url_info["location"] or "N/A",
+        "Area_sqft": title_info["area_sqft"] or url_info["area_sqft"] or "N/A",
+        "Price": price_text,
+        "Price_BDT": price_bdt if price_bdt else "N/A",
+        "Bedroom": title_info["bedrooms"] or url_info["bedrooms"] or "N/A",
+        "Bathroom": "N/A",
+        "Floor": "N/A",
+        "For": title_info["for_rent_sell"] or url_info["for_rent_sell"] or "N/A",
+        "Property_Type": url_info["property_type"] or "N/A",
+        "URL": url
+    }
+
+def scrape_detail_fast(session, get_driver, url):
+    """Fetch a detail page over HTTP and parse it locally, using Selenium only as a fallback."""
+    try:
+        with metrics.timer("fetch_seconds", kind="detail", via="http"):
+            html = fetch_html(session, url)
+        metrics.count("pages_fetched", kind="detail", via="http")
+        archive.store(url, html, "detail")
+        with metrics.timer("parse_seconds", kind="detail"):
+            detail = parse_property_detail(html, url)
+        missing = missing_required(detail)
+        if not missing:
+            return detail
+        metrics.count("selenium_fallbacks", reason="missing_fields")
+        print(f"    Missing {', '.join(missing)} over HTTP, falling back to Selenium")
+    except Exception as e:
+        metrics.count("selenium_fallbacks", reason="http_error")
+        print(f"    HTTP fetch failed ({e}), falling back to Selenium")
+    return scrape_property_detail(get_driver(), url)
+
+def crawl_by_clicking(driver, all_urls, all_card_data, journal, tracker=None, page_num=1, open_url=URL, max_pages=MAX_PAGES):
+    """Walk the listing pages in the browser, clicking through the pagination.
+
+    Fallback for Step 1 when no pagination template is found. New URLs and
+    card data are added to `all_urls`/`all_card_data` in place; returns the
+    last page number reached.
+    """
+    from selenium.webdriver.common.by import By
+
+    previous_page_urls = set()  # Track URLs from previous page to detect duplicates
     
-    if page_num == 1:
-        print("Opening website...")
-        driver.get(URL)
-    else:
-        # Already navigated by clicking next button
-        pass
+    while page_num <= max_pages:
+        print(f"\n--- Page {page_num} ---")
     
-    # Wait for the page to load
-    try:
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.item-listing-wrap')))
-        print("Page loaded successfully.")
-    except TimeoutException:
-        print("Error: Page took too long to load or element not found.")
-        break
+        if open_url:
+            print("Opening website...")
+            driver.get(open_url)
+            open_url = None
+        else:
+            # Already navigated by clicking next button
+            pass
+    
+        # Wait for the page to load
+        with metrics.timer("fetch_seconds", kind="listing", via="selenium"):
+            loaded = wait_for_listing_page(driver)
+        if loaded:
+            print("Page loaded successfully.")
+            metrics.count("pages_fetched", kind="listing", via="selenium")
+            journal.log_page(page_num, driver.current_url)
+            bandwidth.collect(driver)
+        else:
+            print("Error: Page took too long to load or element not found.")
+            break
     
-    # Scroll to load all listings on current page (for infinite scroll or lazy loading)
-    print("Scrolling to load all listings...")
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    scroll_attempts = 0
-    max_scrolls = 15  # Increased scroll attempts
-    no_change_count = 0
+        # Scroll to load all listings on current page (for infinite scroll or lazy loading)
+        print("Scrolling to load all listings...")
+        scroll_attempts = 0
+        max_scrolls = 15  # Increased scroll attempts
+        no_change_count = 0
+        scroll_start = time.perf_counter()
     
-    while scroll_attempts < max_scrolls:
-        # Scroll down
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2.5)  # Wait for content to load
+        while scroll_attempts < max_scrolls:
+            last_height = driver.execute_script("return document.body.scrollHeight")
+            card_count = len(driver.find_elements(By.CSS_SELECTOR, LISTING_CARD_SELECTOR))
         
-        # Also try scrolling incrementally
-        driver.execute_script("window.scrollBy(0, 500);")
-        time.sleep(1)
+            # Scroll down and wait until lazy loading adds cards or grows the page
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            grew = waits.wait(driver, count_grew(LISTING_CARD_SELECTOR, card_count, last_height), SCROLL_GROWTH_TIMEOUT, "scroll_growth")
+            scroll_attempts += 1
         
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            no_change_count += 1
-            if no_change_count >= 3:  # If no change 3 times in a row, stop
-                break
-        else:
-            no_change_count = 0
-        last_height = new_height
-        scroll_attempts += 1
+            if not grew:
+                no_change_count += 1
+                if no_change_count >= 2:  # Nothing new within the budget twice in a row, stop
+                    break
+            else:
+                no_change_count = 0
         
-        # Check how many listings we have so far
-        current_cards = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
-        if scroll_attempts % 3 == 0:
-            print(f"    Scroll {scroll_attempts}: Found {len(current_cards)} listings so far...")
+            # Check how many listings we have so far
+            if scroll_attempts % 3 == 0:
+                current_cards = driver.find_elements(By.CSS_SELECTOR, LISTING_CARD_SELECTOR)
+                print(f"    Scroll {scroll_attempts}: Found {len(current_cards)} listings so far...")
     
-    # Final scroll to top to ensure everything is loaded
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(2)
+        # Make sure the card count has settled before reading the cards
+        waits.wait(driver, count_stable(LISTING_CARD_SELECTOR), SCROLL_GROWTH_TIMEOUT, "cards_settled")
+        metrics.observe("scroll_seconds", time.perf_counter() - scroll_start)
+        if archive.enabled:
+            archive.store(driver.current_url, driver.page_source, "listing")
     
-    # Try multiple selectors to find all listing cards
-    cards = []
-    card_selectors = [
-        'div.item-listing-wrap',
-        '.item-listing-wrap',
-        '[class*="item-listing"]',
-        '[class*="listing-item"]',
-        '.property-item',
-        '[class*="property-card"]'
-    ]
+        # Try multiple selectors to find all listing cards
+        cards = []
+        card_selectors = [
+            'div.item-listing-wrap',
+            '.item-listing-wrap',
+            '[class*="item-listing"]',
+            '[class*="listing-item"]',
+            '.property-item',
+            '[class*="property-card"]'
+        ]
     
-    for selector in card_selectors:
-        try:
-            found_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-            if len(found_cards) > len(cards):
-                cards = found_cards
-                print(f"Found {len(cards)} listings using selector: {selector}")
-        except:
-            continue
+        for selector in card_selectors:
+            try:
+                found_cards = driver.find_elements(By.CSS_SELECTOR, selector)
+                metrics.count("selector_tried", field="card", source=selector)
+                if found_cards:
+                    metrics.count("selector_hit", field="card", source=selector)
+                if len(found_cards) > len(cards):
+                    cards = found_cards
+                    print(f"Found {len(cards)} listings using selector: {selector}")
+            except:
+                continue
     
-    # Also try to find all property links directly (this catches everything)
-    direct_urls_found = 0
-    try:
-        property_links = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/property/"]')
-        print(f"Also found {len(property_links)} property links directly")
+        # Also try to find all property links directly (this catches everything)
+        direct_urls_found = 0
+        try:
+            property_links = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/property/"]')
+            print(f"Also found {len(property_links)} property links directly")
         
-        # Collect all unique property URLs
-        for link in property_links:
-            try:
-                url = link.get_attribute("href")
-                if url and url not in all_urls and "/property/" in url:
-                    # Clean URL (remove fragments, ensure it's complete)
-                    if "#" in url:
-                        url = url.split("#")[0]
-                    if url not in all_urls:
-                        all_urls.append(url)
-                        direct_urls_found += 1
-                        try:
-                            title = link.text.strip() or link.get_attribute("title") or "N/A"
-                        except:
-                            title = "N/A"
-                        
-                        # Try to get location and price from nearby elements
-                        location = None
-                        price = None
-                        try:
-                            # Look for parent or sibling elements
-                            parent = link.find_element(By.XPATH, "./ancestor::div[contains(@class, 'item') or contains(@class, 'listing')]")
+            # Collect all unique property URLs
+            for link in property_links:
+                try:
+                    url = link.get_attribute("href")
+                    if url and url not in all_urls and "/property/" in url:
+                        # Clean URL (remove fragments, ensure it's complete)
+                        if "#" in url:
+                            url = url.split("#")[0]
+                        if url not in all_urls:
+                            all_urls.append(url)
+                            direct_urls_found += 1
                             try:
-                                loc_elem = parent.find_element(By.CSS_SELECTOR, 'address, [class*="address"], [class*="location"]')
-                                location = loc_elem.text.strip()
+                                title = link.text.strip() or link.get_attribute("title") or "N/A"
                             except:
-                                pass
+                                title = "N/A"
+                        
+                            # Try to get location and price from nearby elements
+                            location = None
+                            price = None
                             try:
-                                price_elem = parent.find_element(By.CSS_SELECTOR, '[class*="price"]')
-                                price = price_elem.text.strip()
+                                # Look for parent or sibling elements
+                                parent = link.find_element(By.XPATH, "./ancestor::div[contains(@class, 'item') or contains(@class, 'listing')]")
+                                try:
+                                    loc_elem = parent.find_element(By.CSS_SELECTOR, 'address, [class*="address"], [class*="location"]')
+                                    location = loc_elem.text.strip()
+                                except:
+                                    pass
+                                try:
+                                    price_elem = parent.find_element(By.CSS_SELECTOR, '[class*="price"]')
+                                    price = price_elem.text.strip()
+                                except:
+                                    pass
                             except:
                                 pass
-                        except:
-                            pass
                         
-                        if url not in all_card_data:
-                            all_card_data[url] = {
-                                "title": title,
-                                "location": location,
-                                "price": price
-                            }
-            except:
-                continue
+                            if url not in all_card_data:
+                                all_card_data[url] = {
+                                    "title": title,
+                                    "location": location,
+                                    "price": price
+                                }
+                                journal.log_card(url, all_card_data[url])
+                                if tracker:
+                                    tracker.observe(url, all_card_data[url])
+                except:
+                    continue
         
-        if direct_urls_found > 0:
-            print(f"Added {direct_urls_found} new URLs from direct link search")
-    except Exception as e:
-        print(f"Error in direct link search: {e}")
+            if direct_urls_found > 0:
+                print(f"Added {direct_urls_found} new URLs from direct link search")
+        except Exception as e:
+            print(f"Error in direct link search: {e}")
     
-    print(f"Total listings found on page {page_num}: {len(cards)}")
+        print(f"Total listings found on page {page_num}: {len(cards)}")
     
-    if len(cards) == 0 and len(all_urls) == 0:
-        print("No listings found. Stopping.")
-        break
+        if len(cards) == 0 and len(all_urls) == 0:
+            print("No listings found. Stopping.")
+            break
     
-    # Collect URLs and basic info from current page cards
-    page_urls_count = 0
-    current_page_urls = set()
+        # Collect URLs and basic info from current page cards
+        page_urls_count = 0
+        current_page_urls = set()
     
-    for card in cards:
-        try:
-            # Try multiple selectors for the link
-            url = None
-            url_elem = None
-            
-            link_selectors = [
-                'h2.item-title a',
-                'h2 a',
-                '.item-title a',
-                'a[href*="/property/"]',
-                'a'
-            ]
+        for card in cards:
+            try:
+                # Try multiple selectors for the link
+                url = None
+                url_elem = None
             
-            for link_selector in link_selectors:
-                try:
-                    url_elem = card.find_element(By.CSS_SELECTOR, link_selector)
-                    url = url_elem.get_attribute("href")
-                    if url and "/property/" in url:
-                        break
-                except:
-                    continue
+                link_selectors = [
+                    'h2.item-title a',
+                    'h2 a',
+                    '.item-title a',
+                    'a[href*="/property/"]',
+                    'a'
+                ]
             
-            if not url or url in all_urls:
-                continue
+                for link_selector in link_selectors:
+                    try:
+                        url_elem = card.find_element(By.CSS_SELECTOR, link_selector)
+                        url = url_elem.get_attribute("href")
+                        if url and "/property/" in url:
+                            break
+                    except:
+                        continue
             
-            all_urls.append(url)
-            current_page_urls.add(url)
-            page_urls_count += 1
+                if not url or url in all_urls:
+                    continue
             
-            # Extract basic info from card
-            try:
-                title = url_elem.text.strip() if url_elem else "N/A"
-            except:
-                title = "N/A"
+                all_urls.append(url)
+                current_page_urls.add(url)
+                page_urls_count += 1
             
-            location = None
-            location_selectors = [
-                'address.item-address',
-                'address',
-                '.item-address',
-                '[class*="address"]',
-                '[class*="location"]'
-            ]
-            for loc_selector in location_selectors:
+                # Extract basic info from card
                 try:
-                    location = card.find_element(By.CSS_SELECTOR, loc_selector).text.strip()
-                    if location:
-                        break
+                    title = url_elem.text.strip() if url_elem else "N/A"
                 except:
-                    continue
+                    title = "N/A"
             
-            price = None
-            price_selectors = [
-                'span.item-price',
-                '.item-price',
-                '[class*="price"]'
-            ]
-            for price_selector in price_selectors:
-                try:
-                    price = card.find_element(By.CSS_SELECTOR, price_selector).text.strip()
-                    if price:
-                        break
-                except:
-                    continue
+                location = None
+                location_selectors = [
+                    'address.item-address',
+                    'address',
+                    '.item-address',
+                    '[class*="address"]',
+                    '[class*="location"]'
+                ]
+                for loc_selector in location_selectors:
+                    try:
+                        location = card.find_element(By.CSS_SELECTOR, loc_selector).text.strip()
+                        if location:
+                            break
+                    except:
+                        continue
             
-            # Store card data
-            all_card_data[url] = {
-                "title": title,
-                "location": location,
-                "price": price
-            }
-        except Exception as e:
-            print(f"    Error extracting from card: {e}")
-            continue
+                price = None
+                price_selectors = [
+                    'span.item-price',
+                    '.item-price',
+                    '[class*="price"]'
+                ]
+                for price_selector in price_selectors:
+                    try:
+                        price = card.find_element(By.CSS_SELECTOR, price_selector).text.strip()
+                        if price:
+                            break
+                    except:
+                        continue
+            
+                # Store card data
+                all_card_data[url] = {
+                    "title": title,
+                    "location": location,
+                    "price": price
+                }
+                journal.log_card(url, all_card_data[url])
+                if tracker:
+                    tracker.observe(url, all_card_data[url])
+            except Exception as e:
+                print(f"    Error extracting from card: {e}")
+                continue
     
-    print(f"Collected {page_urls_count} new URLs from cards on page {page_num}. Total: {len(all_urls)}")
+        print(f"Collected {page_urls_count} new URLs from cards on page {page_num}. Total: {len(all_urls)}")
     
-    # Debug: Show what we found
-    if page_num == 1 and len(all_urls) <= 20:
-        print(f"\n    DEBUG: First page analysis:")
-        print(f"      - Cards found: {len(cards)}")
-        print(f"      - Direct links found: {direct_urls_found}")
-        print(f"      - Total URLs collected: {len(all_urls)}")
-        if len(all_urls) > 0:
-            print(f"      - Sample URLs:")
-            for i, url in enumerate(all_urls[:5], 1):
-                print(f"        {i}. {url}")
+        # Debug: Show what we found
+        if page_num == 1 and len(all_urls) <= 20:
+            print(f"\n    DEBUG: First page analysis:")
+            print(f"      - Cards found: {len(cards)}")
+            print(f"      - Direct links found: {direct_urls_found}")
+            print(f"      - Total URLs collected: {len(all_urls)}")
+            if len(all_urls) > 0:
+                print(f"      - Sample URLs:")
+                for i, url in enumerate(all_urls[:5], 1):
+                    print(f"        {i}. {url}")
     
-    # Check if we're seeing the same URLs (stuck on same page)
-    if current_page_urls == previous_page_urls and page_num > 1:
-        print("    ⚠ Warning: Same URLs detected as previous page. May be stuck.")
-        # Still try to go to next page
+        # Check if we're seeing the same URLs (stuck on same page)
+        if current_page_urls == previous_page_urls and page_num > 1:
+            print("    ⚠ Warning: Same URLs detected as previous page. May be stuck.")
+            # Still try to go to next page
     
-    previous_page_urls = current_page_urls.copy()
+        previous_page_urls = current_page_urls.copy()
     
-    # Try to go to next page - try multiple methods
-    print(f"Looking for next page...")
-    current_url_before = driver.current_url
-    next_clicked = False
+        # Incremental mode: the rest of the listing pages are older, already-known listings
+        if tracker and tracker.end_page():
+            print(f"    {tracker.stop_after_pages} pages in a row had only known, unchanged listings. Stopping early.")
+            break
     
-    # Method 0: Collect all page numbers and navigate systematically
-    all_page_numbers = []
-    try:
-        page_links = driver.find_elements(By.CSS_SELECTOR, '.pagination a, [class*="pagination"] a, .page-numbers a, .pager a, nav a, [role="navigation"] a')
-        for link in page_links:
-            try:
-                link_text = link.text.strip()
-                link_href = link.get_attribute("href") or ""
+        # Try to go to next page - try multiple methods
+        print(f"Looking for next page...")
+        current_url_before = driver.current_url
+        next_clicked = False
+    
+        # Method 0: Collect all page numbers and navigate systematically
+        all_page_numbers = []
+        try:
+            page_links = driver.find_elements(By.CSS_SELECTOR, '.pagination a, [class*="pagination"] a, .page-numbers a, .pager a, nav a, [role="navigation"] a')
+            for link in page_links:
+                try:
+                    link_text = link.text.strip()
+                    link_href = link.get_attribute("href") or ""
                 
-                page_num_from_text = None
-                page_num_from_url = None
+                    page_num_from_text = None
+                    page_num_from_url = None
                 
-                # Get page number from text
-                if link_text.isdigit():
-                    page_num_from_text = int(link_text)
+                    # Get page number from text
+                    if link_text.isdigit():
+                        page_num_from_text = int(link_text)
                 
-                # Get page number from URL
-                if "page=" in link_href.lower():
-                    match = re.search(r'page[=_](\d+)', link_href, re.IGNORECASE)
-                    if match:
-                        page_num_from_url = int(match.group(1))
-                elif "/page/" in link_href.lower():
-                    match = re.search(r'/page/(\d+)', link_href, re.IGNORECASE)
-                    if match:
-                        page_num_from_url = int(match.group(1))
+                    # Get page number from URL
+                    if "page=" in link_href.lower():
+                        match = re.search(r'page[=_](\d+)', link_href, re.IGNORECASE)
+                        if match:
+                            page_num_from_url = int(match.group(1))
+                    elif "/page/" in link_href.lower():
+                        match = re.search(r'/page/(\d+)', link_href, re.IGNORECASE)
+                        if match:
+                            page_num_from_url = int(match.group(1))
                 
-                page_num_found = page_num_from_text or page_num_from_url
-                if page_num_found and page_num_found not in all_page_numbers:
-                    all_page_numbers.append(page_num_found)
-            except:
-                continue
+                    page_num_found = page_num_from_text or page_num_from_url
+                    if page_num_found and page_num_found not in all_page_numbers:
+                        all_page_numbers.append(page_num_found)
+                except:
+                    continue
         
-        if all_page_numbers:
-            all_page_numbers.sort()
-            print(f"    Found page numbers: {all_page_numbers}")
+            if all_page_numbers:
+                all_page_numbers.sort()
+                print(f"    Found page numbers: {all_page_numbers}")
             
-            # If we have page numbers, try to go to the next one
-            if page_num + 1 in all_page_numbers:
-                for link in page_links:
-                    try:
-                        link_text = link.text.strip()
-                        link_href = link.get_attribute("href") or ""
+                # If we have page numbers, try to go to the next one
+                if page_num + 1 in all_page_numbers:
+                    for link in page_links:
+                        try:
+                            link_text = link.text.strip()
+                            link_href = link.get_attribute("href") or ""
                         
-                        # Check if this link goes to page_num + 1
-                        is_target_page = False
-                        if link_text.isdigit() and int(link_text) == page_num + 1:
-                            is_target_page = True
-                        elif page_num + 1 in [int(m.group(1)) for m in re.finditer(r'page[=_](\d+)', link_href, re.IGNORECASE)]:
-                            is_target_page = True
-                        elif page_num + 1 in [int(m.group(1)) for m in re.finditer(r'/page/(\d+)', link_href, re.IGNORECASE)]:
-                            is_target_page = True
+                            # Check if this link goes to page_num + 1
+                            is_target_page = False
+                            if link_text.isdigit() and int(link_text) == page_num + 1:
+                                is_target_page = True
+                            elif page_num + 1 in [int(m.group(1)) for m in re.finditer(r'page[=_](\d+)', link_href, re.IGNORECASE)]:
+                                is_target_page = True
+                            elif page_num + 1 in [int(m.group(1)) for m in re.finditer(r'/page/(\d+)', link_href, re.IGNORECASE)]:
+                                is_target_page = True
                         
-                        if is_target_page and link.is_displayed() and link.is_enabled():
-                            driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                            time.sleep(0.5)
-                            link.click()
-                            time.sleep(3)
-                            print(f"    ✓ Clicked page {page_num + 1} from page numbers list")
-                            # Set next_clicked and skip other methods
-                            next_clicked = True
-                            break
-                    except:
-                        continue
-    except Exception as e:
-        print(f"    Error collecting page numbers: {e}")
+                            if is_target_page and link.is_displayed() and link.is_enabled():
+                                click_and_wait(driver, link)
+                                print(f"    ✓ Clicked page {page_num + 1} from page numbers list")
+                                metrics.count("pagination_method", method="page_numbers")
+                                # Set next_clicked and skip other methods
+                                next_clicked = True
+                                break
+                        except:
+                            continue
+        except Exception as e:
+            print(f"    Error collecting page numbers: {e}")
     
-    # Method 1: Try next button (only if Method 0 didn't work)
-    if not next_clicked:
-        next_clicked = find_and_click_next_button(driver)
+        # Method 1: Try next button (only if Method 0 didn't work)
+        if not next_clicked:
+            next_clicked = find_and_click_next_button(driver)
+            if next_clicked:
+                metrics.count("pagination_method", method="next_button")
     
-    # Method 2: If next button didn't work, try clicking page numbers
-    if not next_clicked:
-        try:
-            # Try to find and click the next page number
-            page_links = driver.find_elements(By.CSS_SELECTOR, '.pagination a, [class*="pagination"] a, .page-numbers a, .pager a, nav a, [role="navigation"] a')
-            print(f"    Found {len(page_links)} pagination links")
+        # Method 2: If next button didn't work, try clicking page numbers
+        if not next_clicked:
+            try:
+                # Try to find and click the next page number
+                page_links = driver.find_elements(By.CSS_SELECTOR, '.pagination a, [class*="pagination"] a, .page-numbers a, .pager a, nav a, [role="navigation"] a')
+                print(f"    Found {len(page_links)} pagination links")
+            
+                # Print all pagination links for debugging
+                if len(page_links) > 0:
+                    print(f"    Pagination links found:")
+                    for i, link in enumerate(page_links[:10]):  # Show first 10
+                        try:
+                            link_text = link.text.strip()
+                            link_href = link.get_attribute("href")
+                            print(f"      {i+1}. Text: '{link_text}', Href: {link_href[:80] if link_href else 'None'}")
+                        except:
+                            pass
             
-            # Print all pagination links for debugging
-            if len(page_links) > 0:
-                print(f"    Pagination links found:")
-                for i, link in enumerate(page_links[:10]):  # Show first 10
+                for link in page_links:
                     try:
                         link_text = link.text.strip()
-                        link_href = link.get_attribute("href")
-                        print(f"      {i+1}. Text: '{link_text}', Href: {link_href[:80] if link_href else 'None'}")
-                    except:
-                        pass
-            
-            for link in page_links:
-                try:
-                    link_text = link.text.strip()
-                    link_href = link.get_attribute("href") or ""
+                        link_href = link.get_attribute("href") or ""
                     
-                    # If we're on page N, look for page N+1
-                    if link_text.isdigit():
-                        link_num = int(link_text)
-                        if link_num == page_num + 1:
-                            if link.is_displayed() and link.is_enabled():
-                                driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                                time.sleep(0.5)
-                                link.click()
-                                next_clicked = True
-                                print(f"    ✓ Clicked page number {link_num}")
-                                break
-                    # Also check href for page numbers
-                    elif "page=" in link_href.lower() or "/page/" in link_href.lower():
-                        # Extract page number from URL
-                        if "page=" in link_href:
-                            page_match = re.search(r'page[=_](\d+)', link_href, re.IGNORECASE)
-                        elif "/page/" in link_href:
-                            page_match = re.search(r'/page/(\d+)', link_href, re.IGNORECASE)
-                        else:
-                            page_match = None
-                        
-                        if page_match:
-                            link_num = int(page_match.group(1))
+                        # If we're on page N, look for page N+1
+                        if link_text.isdigit():
+                            link_num = int(link_text)
                             if link_num == page_num + 1:
                                 if link.is_displayed() and link.is_enabled():
-                                    driver.execute_script("arguments[0].scrollIntoView(true);", link)
-                                    time.sleep(0.5)
-                                    link.click()
+                                    click_and_wait(driver, link)
                                     next_clicked = True
-                                    print(f"    ✓ Clicked page {link_num} via href")
+                                    print(f"    ✓ Clicked page number {link_num}")
+                                    metrics.count("pagination_method", method="page_number_text")
                                     break
-                except Exception as e:
-                    continue
-        except Exception as e:
-            print(f"    Error in page number method: {e}")
+                        # Also check href for page numbers
+                        elif "page=" in link_href.lower() or "/page/" in link_href.lower():
+                            # Extract page number from URL
+                            if "page=" in link_href:
+                                page_match = re.search(r'page[=_](\d+)', link_href, re.IGNORECASE)
+                            elif "/page/" in link_href:
+                                page_match = re.search(r'/page/(\d+)', link_href, re.IGNORECASE)
+                            else:
+                                page_match = None
+                        
+                            if page_match:
+                                link_num = int(page_match.group(1))
+                                if link_num == page_num + 1:
+                                    if link.is_displayed() and link.is_enabled():
+                                        click_and_wait(driver, link)
+                                        next_clicked = True
+                                        print(f"    ✓ Clicked page {link_num} via href")
+                                        metrics.count("pagination_method", method="page_number_href")
+                                        break
+                    except Exception as e:
+                        continue
+            except Exception as e:
+                print(f"    Error in page number method: {e}")
     
-    # Method 3: Try URL-based pagination
-    if not next_clicked:
-        try:
-            # Check if URL has page parameter we can modify
-            if "page=" in current_url_before:
-                parsed = urllib.parse.urlparse(current_url_before)
-                params = urllib.parse.parse_qs(parsed.query)
-                if 'page' in params:
-                    current_page = int(params['page'][0])
-                    next_page = current_page + 1
-                    # Build next page URL
-                    params['page'] = [str(next_page)]
-                    new_query = urllib.parse.urlencode(params, doseq=True)
-                    next_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{new_query}"
-                    driver.get(next_url)
-                    next_clicked = True
-                    print(f"Navigated to page {next_page} via URL")
-            elif page_num == 1:
-                # Try multiple URL patterns for page 2
-                url_patterns = [
-                    current_url_before + ("&" if "?" in current_url_before else "?") + "page=2",
-                    current_url_before + ("&" if "?" in current_url_before else "?") + "paged=2",
-                    current_url_before + "/page/2",
-                    current_url_before + "/2",
-                ]
-                
-                for next_url in url_patterns:
-                    try:
-                        print(f"    Trying URL pattern: {next_url}")
+        # Method 3: Try URL-based pagination
+        if not next_clicked:
+            try:
+                # Check if URL has page parameter we can modify
+                if "page=" in current_url_before:
+                    parsed = urllib.parse.urlparse(current_url_before)
+                    params = urllib.parse.parse_qs(parsed.query)
+                    if 'page' in params:
+                        current_page = int(params['page'][0])
+                        next_page = current_page + 1
+                        # Build next page URL
+                        params['page'] = [str(next_page)]
+                        new_query = urllib.parse.urlencode(params, doseq=True)
+                        next_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{new_query}"
                         driver.get(next_url)
-                        time.sleep(3)
-                        # Check if page loaded successfully
-                        cards_check = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
-                        if len(cards_check) > 0:
-                            # Verify we got different listings
-                            test_urls = []
-                            for card in cards_check[:3]:
-                                try:
-                                    url_elem = card.find_element(By.CSS_SELECTOR, 'h2.item-title a')
-                                    test_url = url_elem.get_attribute("href")
-                                    if test_url:
-                                        test_urls.append(test_url)
-                                except:
-                                    pass
+                        next_clicked = True
+                        print(f"Navigated to page {next_page} via URL")
+                        metrics.count("pagination_method", method="url_param")
+                elif page_num == 1:
+                    # Try multiple URL patterns for page 2
+                    url_patterns = [
+                        current_url_before + ("&" if "?" in current_url_before else "?") + "page=2",
+                        current_url_before + ("&" if "?" in current_url_before else "?") + "paged=2",
+                        current_url_before + "/page/2",
+                        current_url_before + "/2",
+                    ]
+                
+                    for next_url in url_patterns:
+                        try:
+                            print(f"    Trying URL pattern: {next_url}")
+                            driver.get(next_url)
+                            waits.wait(driver, element_present(LISTING_CARD_SELECTOR), URL_PROBE_TIMEOUT, "url_pattern_probe")
+                            # Check if page loaded successfully
+                            cards_check = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
+                            if len(cards_check) > 0:
+                                # Verify we got different listings
+                                test_urls = []
+                                for card in cards_check[:3]:
+                                    try:
+                                        url_elem = card.find_element(By.CSS_SELECTOR, 'h2.item-title a')
+                                        test_url = url_elem.get_attribute("href")
+                                        if test_url:
+                                            test_urls.append(test_url)
+                                    except:
+                                        pass
                             
-                            # If we got URLs and they're different from what we have, it worked
-                            if test_urls and any(url not in all_urls for url in test_urls):
-                                next_clicked = True
-                                print(f"    ✓ Navigated to page 2 via URL: {next_url}")
-                                break
-                    except Exception as e:
-                        continue
-        except Exception as e:
-            print(f"    URL pagination attempt failed: {e}")
+                                # If we got URLs and they're different from what we have, it worked
+                                if test_urls and any(url not in all_urls for url in test_urls):
+                                    next_clicked = True
+                                    print(f"    ✓ Navigated to page 2 via URL: {next_url}")
+                                    metrics.count("pagination_method", method="url_pattern")
+                                    break
+                        except Exception as e:
+                            continue
+            except Exception as e:
+                print(f"    URL pagination attempt failed: {e}")
     
-    if next_clicked:
-        time.sleep(3)  # Wait for page transition
-        current_url_after = driver.current_url
+        if next_clicked:
+            wait_for_listing_page(driver, "page_transition")
+            current_url_after = driver.current_url
         
-        # Check if URL actually changed or if we got new listings
-        if current_url_before != current_url_after:
-            page_num += 1
-            print(f"Successfully navigated to page {page_num}")
-        else:
-            # Check if we're getting new listings
-            time.sleep(2)
-            new_cards = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
-            if len(new_cards) > 0:
-                # Check if these are new URLs
-                new_urls_found = False
-                for card in new_cards[:3]:  # Check first 3
-                    try:
-                        url_elem = card.find_element(By.CSS_SELECTOR, 'h2.item-title a')
-                        url = url_elem.get_attribute("href")
-                        if url and url not in all_urls:
-                            new_urls_found = True
-                            break
-                    except:
-                        continue
+            # Check if URL actually changed or if we got new listings
+            if current_url_before != current_url_after:
+                page_num += 1
+                print(f"Successfully navigated to page {page_num}")
+            else:
+                # Check if we're getting new listings
+                new_cards = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
+                if len(new_cards) > 0:
+                    # Check if these are new URLs
+                    new_urls_found = False
+                    for card in new_cards[:3]:  # Check first 3
+                        try:
+                            url_elem = card.find_element(By.CSS_SELECTOR, 'h2.item-title a')
+                            url = url_elem.get_attribute("href")
+                            if url and url not in all_urls:
+                                new_urls_found = True
+                                break
+                        except:
+                            continue
                 
-                if new_urls_found:
-                    page_num += 1
-                    print(f"Found new listings, continuing to page {page_num}")
+                    if new_urls_found:
+                        page_num += 1
+                        print(f"Found new listings, continuing to page {page_num}")
+                    else:
+                        print("No new listings found. May have reached last page.")
+                        break
                 else:
-                    print("No new listings found. May have reached last page.")
+                    print("Next button clicked but no new listings. May have reached last page.")
                     break
-            else:
-                print("Next button clicked but no new listings. May have reached last page.")
-                break
-    else:
-        # Last resort: Try manually constructing page URLs
-        if page_num == 1 and len(all_urls) < 200:
-            print("    ⚠ Only found a few listings. Trying manual page navigation...")
-            manual_pages_tried = 0
-            max_manual_pages = 100  # Try up to 100 pages to get more listings
-            manual_page_found = False
+        else:
+            # Last resort: Try manually constructing page URLs
+            if page_num == 1 and len(all_urls) < 200:
+                print("    ⚠ Only found a few listings. Trying manual page navigation...")
+                manual_pages_tried = 0
+                max_manual_pages = 100  # Try up to 100 pages to get more listings
+                manual_page_found = False
             
-            for manual_page in range(2, max_manual_pages + 1):
-                try:
-                    # Try different URL patterns
-                    base_url = current_url_before.rstrip('/')
-                    test_urls = [
-                        f"{base_url}?page={manual_page}",
-                        f"{base_url}?paged={manual_page}",
-                        f"{base_url}/page/{manual_page}",
-                        f"{base_url}/{manual_page}",
-                    ]
+                for manual_page in range(2, max_manual_pages + 1):
+                    try:
+                        # Try different URL patterns
+                        base_url = current_url_before.rstrip('/')
+                        test_urls = [
+                            f"{base_url}?page={manual_page}",
+                            f"{base_url}?paged={manual_page}",
+                            f"{base_url}/page/{manual_page}",
+                            f"{base_url}/{manual_page}",
+                        ]
                     
-                    found_new_page = False
-                    for test_url in test_urls:
-                        try:
-                            print(f"    Trying manual page {manual_page}: {test_url}")
-                            driver.get(test_url)
-                            time.sleep(3)
+                        found_new_page = False
+                        for test_url in test_urls:
+                            try:
+                                print(f"    Trying manual page {manual_page}: {test_url}")
+                                driver.get(test_url)
+                                waits.wait(driver, element_present(LISTING_CARD_SELECTOR), URL_PROBE_TIMEOUT, "manual_page_probe")
                             
-                            # Check if we got listings
-                            test_cards = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
-                            if len(test_cards) > 0:
-                                # Check if these are new URLs
-                                new_urls_count = 0
-                                for card in test_cards[:5]:
-                                    try:
-                                        url_elem = card.find_element(By.CSS_SELECTOR, 'h2.item-title a')
-                                        test_url_val = url_elem.get_attribute("href")
-                                        if test_url_val and test_url_val not in all_urls:
-                                            new_urls_count += 1
-                                    except:
-                                        continue
+                                # Check if we got listings
+                                test_cards = driver.find_elements(By.CSS_SELECTOR, 'div.item-listing-wrap')
+                                if len(test_cards) > 0:
+                                    # Check if these are new URLs
+                                    new_urls_count = 0
+                                    for card in test_cards[:5]:
+                                        try:
+                                            url_elem = card.find_element(By.CSS_SELECTOR, 'h2.item-title a')
+                                            test_url_val = url_elem.get_attribute("href")
+                                            if test_url_val and test_url_val not in all_urls:
+                                                new_urls_count += 1
+                                        except:
+                                            continue
                                 
-                                if new_urls_count > 0:
-                                    found_new_page = True
-                                    page_num = manual_page
-                                    manual_page_found = True
-                                    print(f"    ✓ Found page {manual_page} with new listings! Continuing main loop...")
-                                    manual_pages_tried = 0  # Reset counter
-                                    break
-                        except:
-                            continue
+                                    if new_urls_count > 0:
+                                        found_new_page = True
+                                        page_num = manual_page
+                                        manual_page_found = True
+                                        print(f"    ✓ Found page {manual_page} with new listings! Continuing main loop...")
+                                        metrics.count("pagination_method", method="manual_url")
+                                        manual_pages_tried = 0  # Reset counter
+                                        break
+                            except:
+                                continue
                     
-                    if not found_new_page:
-                        manual_pages_tried += 1
-                        if manual_pages_tried >= 3:  # If 3 consecutive pages fail, stop
-                            print(f"    No more pages found after trying {manual_page - 1} pages")
+                        if not found_new_page:
+                            manual_pages_tried += 1
+                            if manual_pages_tried >= 3:  # If 3 consecutive pages fail, stop
+                                print(f"    No more pages found after trying {manual_page - 1} pages")
+                                break
+                        else:
+                            # Found a new page, continue the main loop
                             break
-                    else:
-                        # Found a new page, continue the main loop
-                        break
-                except Exception as e:
-                    print(f"    Error trying manual page {manual_page}: {e}")
-                    continue
+                    except Exception as e:
+                        print(f"    Error trying manual page {manual_page}: {e}")
+                        continue
             
-            if not manual_page_found:
+                if not manual_page_found:
+                    print("No next page found. Finished collecting URLs.")
+                    break
+                # If manual_page_found is True, we continue the main while loop
+            else:
                 print("No next page found. Finished collecting URLs.")
                 break
-            # If manual_page_found is True, we continue the main while loop
+
+    return page_num
+
+# Card recorded for a sitemap URL, which has no listing-card data to fingerprint
+SITEMAP_CARD = {"title": "N/A", "location": None, "price": None}
+
+def remember_card(url, card, all_urls, all_card_data, journal, tracker=None):
+    """Record a listing found in Step 1; returns False if the URL was already known."""
+    if url in all_card_data:
+        return False
+    all_urls.append(url)
+    all_card_data[url] = card
+    journal.log_card(url, card)
+    if tracker:
+        tracker.observe(url, card)
+    return True
+
+def crawl_listing_urls(http_session, journal, journal_state=None, tracker=None, source="listing",
+                       listing_mode=LISTING_MODE, listing_workers=LISTING_WORKERS,
+                       max_pages=MAX_PAGES, driver_factory=create_driver, start_url=URL):
+    """Step 1: collect every property URL and its listing-card data.
+
+    Tries the property sitemap (source="sitemap"), then the detected
+    pagination template over HTTP (listing_mode="direct"), then clicking
+    through the pages in Chrome. Returns (all_urls, all_card_data).
+    """
+    journal_state = journal_state or load_journal("")
+    print("\n" + "="*60)
+    print("STEP 1: Collecting all property URLs from all pages...")
+    print("="*60)
+    
+    all_urls = list(journal_state["urls"])
+    all_card_data = dict(journal_state["cards"])  # Store basic card data for each URL
+    page_num = 1
+    open_url = start_url  # Page to open first; later pages are reached by navigation
+    if tracker:
+        # Cards journaled before the interruption are not seen again by this run
+        tracker.replay((url, card) for url, card in all_card_data.items() if card != SITEMAP_CARD)
+    
+    if "step1" in journal_state["done_steps"]:
+        print(f"Resuming: Step 1 already finished with {len(all_urls)} URLs, skipping it.")
+        return all_urls, all_card_data
+    if journal_state["last_page"]:
+        page_num, open_url = journal_state["last_page"]
+        print(f"Resuming: {len(all_urls)} URLs known, continuing from page {page_num} ({open_url})")
+    
+    step1_done = False
+    if source == "sitemap":
+        # The property sitemap lists every URL without rendering any listing page
+        sitemap_urls = fetch_sitemap_urls(http_session, start_url)
+        for url, lastmod in sitemap_urls:
+            # No card data to fingerprint, so the change tracker only sees new URLs
+            remember_card(url, dict(SITEMAP_CARD), all_urls, all_card_data, journal)
+        if sitemap_urls:
+            print(f"Collected {len(all_urls)} property URLs from the sitemap")
+            metrics.count("step1_method", method="sitemap")
+            step1_done = True
+            if tracker:
+                tracker.complete = True
         else:
-            print("No next page found. Finished collecting URLs.")
-            break
+            print("No property sitemap found, collecting URLs from listing pages.")
+    
+    if not step1_done and listing_mode == "direct":
+        try:
+            template, total_pages, first_html = discover_pagination(http_session, start_url)
+            if template and not parse_listing_cards(first_html, start_url):
+                print("Listing cards are not in the server-rendered HTML.")
+                template = None
+        except Exception as e:
+            print(f"Pagination discovery failed: {e}")
+            template = None
+        
+        if template:
+            last_page = min(total_pages, max_pages)
+            print(f"Detected pagination template {template} with {total_pages} pages.")
+            print(f"Fetching pages {page_num}-{last_page} with {listing_workers} workers...")
+            for page_num, page_url, cards in crawl_listing_pages(http_session, start_url, template, page_num, last_page, listing_workers, first_html, archive):
+                journal.log_page(page_num, page_url)
+                if cards is None:
+                    # A failed page says nothing about whether the listings are unchanged
+                    if tracker:
+                        tracker.page_failed()
+                    continue
+                new_count = sum(remember_card(url, card, all_urls, all_card_data, journal, tracker) for url, card in cards)
+                print(f"Page {page_num}: {len(cards)} listings, {new_count} new. Total: {len(all_urls)}")
+                
+                if tracker and tracker.end_page():
+                    print(f"    {tracker.stop_after_pages} pages in a row had only known, unchanged listings. Stopping early.")
+                    break
+            if tracker and not tracker.stopped_early and last_page == total_pages:
+                tracker.complete = True
+            metrics.count("step1_method", method="direct")
+            step1_done = True
+        else:
+            print("No pagination template found, clicking through pages instead.")
+    
+    if not step1_done:
+        metrics.count("step1_method", method="click")
+        driver = driver_factory()
+        try:
+            page_num = crawl_by_clicking(driver, all_urls, all_card_data, journal, tracker, page_num, open_url, max_pages)
+        finally:
+            driver.quit()
+    
+    journal.mark_step_done("step1")
+    
+    print(f"\n{'='*60}")
+    print(f"STEP 1 Complete: Collected {len(all_urls)} total property URLs")
+    print(f"{'='*60}")
+    print(f"\nSummary:")
+    print(f"  - Total unique URLs collected: {len(all_urls)}")
+    print(f"  - Total pages processed: {page_num}")
+    print(f"  - Card data stored: {len(all_card_data)}")
+    if len(all_urls) > 0:
+        print(f"\nSample URLs (first 3):")
+        for i, url in enumerate(all_urls[:3], 1):
+            print(f"  {i}. {url}")
+    return all_urls, all_card_data
+
+def scrape_details(all_urls, all_card_data, http_session, journal, sink, completed=None, workers=NUM_WORKERS,
+                   fetch_mode=FETCH_MODE, driver_factory=create_driver, benchmark_workers=None,
+                   session_max_pages=SESSION_MAX_PAGES, session_max_rss_mb=SESSION_MAX_RSS_MB):
+    """Step 2: visit every detail page and write one record per URL to `sink` in discovery order.
 
-print(f"\n{'='*60}")
-print(f"STEP 1 Complete: Collected {len(all_urls)} total property URLs")
-print(f"{'='*60}")
-print(f"\nSummary:")
-print(f"  - Total unique URLs collected: {len(all_urls)}")
-print(f"  - Total pages processed: {page_num}")
-print(f"  - Card data stored: {len(all_card_data)}")
-if len(all_urls) > 0:
-    print(f"\nSample URLs (first 3):")
-    for i, url in enumerate(all_urls[:3], 1):
-        print(f"  {i}. {url}")
-
-# Step 2: Visit each URL to get detailed information
-print(f"\n{'='*60}")
-print(f"STEP 2: Visiting each property page to collect detailed information...")
-print(f"{'='*60}")
-
-data = []
-
-for idx, url in enumerate(all_urls, 1):
-    print(f"\n[{idx}/{len(all_urls)}] Processing: {url[:80]}...")
+    Records are written as soon as every earlier URL is done, so memory does
+    not grow with the crawl. URLs in `completed` (journaled or unchanged
+    records) are not visited again.
+    Browser sessions stay warm between pages (and from the benchmark into the
+    real run) and are recycled after `session_max_pages` pages or
+    `session_max_rss_mb` MB.
+    """
+    completed = completed or {}
+    print(f"\n{'='*60}")
+    print(f"STEP 2: Visiting each property page to collect detailed information...")
+    print(f"{'='*60}")
     
+    def scrape_record(get_driver, url):
+        """Visit one detail page and build its record (runs inside a pool worker)."""
+        with metrics.timer("detail_seconds", fetch_mode=fetch_mode):
+            if fetch_mode == "http":
+                detail = scrape_detail_fast(http_session, get_driver, url)
+            else:
+                detail = scrape_property_detail(get_driver(), url)
+        record = build_record(url, all_card_data.get(url, {}), detail)
+        journal.log_record(record)
+        metrics.count("records_built")
+        return record
+    
+    pool = DriverPool(driver_factory, session_max_pages, session_max_rss_mb)
     try:
-        # Get basic info from card data
-        card_info = all_card_data.get(url, {})
-        title = card_info.get("title", "N/A")
-        card_location = card_info.get("location")
-        card_price = card_info.get("price")
-        
-        # Extract info from title
-        title_info = extract_info_from_title(title)
-        
-        # Extract info from URL
-        url_info = extract_info_from_url(url)
+        if benchmark_workers:
+            print(f"Benchmarking worker counts {benchmark_workers} on {BENCHMARK_SAMPLE_SIZE} URLs...")
+            benchmark_worker_counts(all_urls[:BENCHMARK_SAMPLE_SIZE], scrape_record, driver_factory, benchmark_workers, pool)
         
-        # Visit detail page to get complete information
-        detail = scrape_property_detail(driver, url)
+        pending_urls = [url for url in all_urls if url not in completed]
+        if completed:
+            print(f"{len(all_urls) - len(pending_urls)} detail pages already done")
         
-        # Combine all sources: detail page > title > URL > card
-        area_sqft = detail["area_sqft"] or title_info["area_sqft"] or url_info["area_sqft"]
-        bedrooms = detail["bedrooms"] or title_info["bedrooms"] or url_info["bedrooms"]
-        price = detail["price"] or card_price
-        price_numeric = normalize_price(price) if price else None
-        location = detail["location"] or card_location or title_info["location"] or url_info["location"]
-        floor = detail["floor"]
-        for_rent_sell = detail["for_rent_sell"] or title_info["for_rent_sell"] or url_info["for_rent_sell"]
-        bathrooms = detail["bathrooms"]
-        property_type = detail["property_type"] or url_info["property_type"]
+        print(f"Visiting {len(pending_urls)} pages with {workers} workers...")
+        results = iter_scrape_in_parallel(pending_urls, scrape_record, driver_factory, workers, pool)
         
-        # Build the data record with all columns
-        record = {
-            "Location": location if location else "N/A",
-            "Area_sqft": area_sqft if area_sqft else "N/A",
-            "Price": price if price else "N/A",
-            "Price_BDT": price_numeric if price_numeric else "N/A",
-            "Bedroom": bedrooms if bedrooms else "N/A",
-            "Bathroom": bathrooms if bathrooms else "N/A",
-            "Floor": floor if floor else "N/A",
-            "For": for_rent_sell if for_rent_sell else "N/A",
-            "Property_Type": property_type if property_type else "N/A",
-            "URL": url
-        }
-        
-        data.append(record)
-        print(f"  ✓ Collected: Location={location[:25] if location else 'N/A'}, Area={area_sqft}, Bed={bedrooms}, Bath={bathrooms}, Floor={floor}, For={for_rent_sell}, Price={price[:25] if price else 'N/A'}")
-        
-    except Exception as e:
-        print(f"  ✗ Error processing URL: {e}")
-        # Still add a record with available data to ensure we don't lose rows
-        card_info = all_card_data.get(url, {})
-        title_info = extract_info_from_title(card_info.get("title", ""))
-        url_info = extract_info_from_url(url)
+        # Merge results with the completed records in discovery order
+        for url in all_urls:
+            if url in completed:
+                sink.write(completed[url])
+                continue
+            record, error = next(results)
+            if error is not None:
+                print(f"  ✗ Error processing URL {url[:80]}: {error}")
+                # Still add a record with available data to ensure we don't lose rows
+                record = build_fallback_record(url, all_card_data.get(url, {}))
+                metrics.count("fallback_records")
+            sink.write(record)
+    finally:
+        pool.close()
+    pool.report()
+
+def run(chromedriver_path=CHROME_DRIVER_PATH, output=RAW_OUTPUT_PATH, max_pages=MAX_PAGES, workers=NUM_WORKERS,
+        listing_workers=LISTING_WORKERS, resume=False, incremental=False, source="listing",
+        fetch_mode=FETCH_MODE, listing_mode=LISTING_MODE, profile=BROWSER_PROFILE,
+        journal_path=JOURNAL_PATH, benchmark_workers=None, start_url=URL,
+        request_rate=REQUEST_RATE, max_host_concurrency=MAX_HOST_CONCURRENCY,
+        metrics_path=None, metrics_interval=METRICS_INTERVAL, archive_dir=ARCHIVE_DIR,
+        session_max_pages=SESSION_MAX_PAGES, session_max_rss_mb=SESSION_MAX_RSS_MB):
+    """Full crawl: collect URLs (Step 1), scrape detail pages (Step 2) and save the records.
+
+    Records are streamed to `output` as they are scraped; its extension picks
+    the format (.csv, .jsonl, .db/.sqlite or .parquet). Returns the sink,
+    whose counters summarise the run.
+
+    With `metrics_path`, crawl telemetry is written there every
+    `metrics_interval` seconds and once more at the end (.json for JSON,
+    otherwise Prometheus text format). Fetched pages are archived in
+    `archive_dir` unless it is None.
+    """
+    if metrics_path:
+        metrics.enable(metrics_path, metrics_interval)
+    if archive_dir:
+        archive.open(archive_dir)
+    driver_factory = functools.partial(create_driver, chromedriver_path, profile)
+    
+    # Load previous progress before the journal is reopened (a fresh run truncates it)
+    journal_state = load_journal(journal_path if resume else "")
+    journal = CrawlJournal(journal_path, resume=resume)
+    
+    # Previous snapshot used to skip unchanged listings in incremental mode
+    tracker = None
+    previous_records = {}
+    if incremental:
+        previous_fingerprints, previous_records = load_snapshot(SNAPSHOT_INDEX_PATH, output)
+        tracker = ChangeTracker(previous_fingerprints, INCREMENTAL_STOP_AFTER_PAGES)
+        print(f"Incremental mode: {len(previous_fingerprints)} listings known from the last snapshot")
+    
+    # Shared keep-alive HTTP client for listing pages and the fast detail-page path
+    scheduler = HostScheduler(rate=request_rate, max_concurrency=max_host_concurrency)
+    http_session = create_session(pool_size=max(workers, listing_workers), scheduler=scheduler)
+    
+    print("="*60)
+    print("Starting scraping process...")
+    print("="*60)
+    
+    try:
+        with metrics.timer("step_seconds", step="step1"):
+            all_urls, all_card_data = crawl_listing_urls(http_session, journal, journal_state, tracker, source,
+                                                         listing_mode, listing_workers, max_pages, driver_factory, start_url)
         
-        # Normalize price if available
-        price_text = card_info.get("price") or "N/A"
-        price_bdt = normalize_price(price_text) if price_text != "N/A" else None
+        # Detail records finished by an earlier, interrupted run are reused as-is
+        completed = dict(journal_state["records"])
+        if tracker:
+            # Unchanged listings keep their record from the last snapshot
+            reused = [url for url in all_urls if url not in completed and not tracker.needs_visit(url) and url in previous_records]
+            completed.update((url, previous_records[url]) for url in reused)
+            print(f"Incremental mode: {len(all_urls) - len(completed)} new or changed listings, {len(reused)} unchanged")
         
-        record = {
-            "Location": card_info.get("location") or title_info["location"] or url_info["location"] or "N/A",
-            "Area_sqft": title_info["area_sqft"] or url_info["area_sqft"] or "N/A",
-            "Price": price_text,
-            "Price_BDT": price_bdt if price_bdt else "N/A",
-            "Bedroom": title_info["bedrooms"] or url_info["bedrooms"] or "N/A",
-            "Bathroom": "N/A",
-            "Floor": "N/A",
-            "For": title_info["for_rent_sell"] or url_info["for_rent_sell"] or "N/A",
-            "Property_Type": url_info["property_type"] or "N/A",
-            "URL": url
-        }
-        data.append(record)
-        continue
-
-driver.quit()
-
-# Check if data is collected correctly
-if not data:
-    print("\n" + "="*60)
-    print("No data was collected. Please check the CSS selectors.")
-    print("="*60)
-else:
-    # Create DataFrame and save
-    df = pd.DataFrame(data)
+        # Opened only now: in incremental mode the previous output was read above
+        sink = open_sink(output)
+        with sink:
+            with metrics.timer("step_seconds", step="step2"):
+                scrape_details(all_urls, all_card_data, http_session, journal, sink, completed, workers,
+                               fetch_mode, driver_factory, benchmark_workers, session_max_pages, session_max_rss_mb)
+            
+            if tracker:
+                # Listings past the early stop were not re-seen; carry them over from the last snapshot
+                carried = tracker.carried_over(all_urls)
+                sink.write_all(previous_records[url] for url in carried if url in previous_records)
+                if tracker.dropped:
+                    print(f"Incremental mode: {len(tracker.dropped)} listings no longer listed, dropped")
+    finally:
+        journal.close()
+        archive.close()
+        metrics.close()
     
-    # Remove duplicates based on URL
-    initial_count = len(df)
-    df = df.drop_duplicates(subset=['URL'], keep='first')
-    duplicates_removed = initial_count - len(df)
+    print_summary(sink)
+    if sink.written:
+        # Card fingerprints let the next incremental run skip unchanged listings
+        if tracker:
+            save_snapshot_index(SNAPSHOT_INDEX_PATH, tracker.merged_index())
+        else:
+            save_snapshot_index(SNAPSHOT_INDEX_PATH, {url: card_fingerprint(card) for url, card in all_card_data.items()})
     
-    # Save using utils function
-    save_raw_data(df, "brokeragebd_raw.csv")
+    # Where the crawl spent its waiting time, and what the browser downloaded
+    waits.report()
+    bandwidth.report()
+    scheduler.report()
+    archive.report()
+    if metrics_path:
+        print(f"\nCrawl metrics → {metrics_path}")
+    return sink
+
+def command_crawl(args):
+    profile = BrowserProfile(headless=not args.show_browser, page_load_strategy="eager",
+                             block_resources=True, allow_only=args.allow_only)
+    benchmark = [int(n) for n in args.benchmark_workers.split(",")] if args.benchmark_workers else None
+    run(args.chromedriver_path, args.output, args.max_pages, args.workers, args.listing_workers,
+        args.resume, args.incremental, args.source, args.fetch_mode, args.listing_mode, profile,
+        args.journal, benchmark, args.base_url, args.rate, args.max_host_concurrency,
+        args.metrics, args.metrics_interval, None if args.no_archive else args.archive,
+        args.session_max_pages, args.session_max_rss)
+
+def reextract_detail(url, html):
+    """Detail fields of one archived page (runs in a reextract worker process)."""
+    return parse_property_detail(html, url)
+
+def reextract_cards(url, html):
+    """Listing cards of one archived listing page (runs in a reextract worker process)."""
+    return parse_listing_cards(html, url)
+
+def reextract(archive_dir=ARCHIVE_DIR, output=RAW_OUTPUT_PATH, workers=None):
+    """Rebuild the raw CSV from archived pages with the current extractors, no browser.
+
+    Uses the newest archived copy of every page. Listing pages are parsed
+    first for card data; each detail page then becomes a record, and a
+    listing without an archived detail page gets a fallback record, just
+    as in a crawl. Pages are parsed across `workers` processes (default:
+    one per core).
+    """
+    listing_entries = list(latest_entries(archive_dir, "listing").values())
+    detail_entries = latest_entries(archive_dir, "detail")
+    if not listing_entries and not detail_entries:
+        print(f"No archived pages in {archive_dir}")
+        return None
+    print(f"Re-extracting {len(listing_entries)} listing pages and {len(detail_entries)} detail pages from {archive_dir}")
     
-    # Also save to the original location for compatibility
-    output_path = r"E:\Cohor8\Capstone_1\dhaka_real_estate.csv"
-    df.to_csv(output_path, index=False)
+    all_card_data = {}
+    for cards in map_pages(archive_dir, listing_entries, reextract_cards, workers):
+        for url, card in cards or []:
+            all_card_data.setdefault(url, card)
     
-    print(f"\n{'='*60}")
-    print(f"Scraping completed successfully!")
-    print(f"{'='*60}")
-    print(f"Total listings collected: {len(df)}")
-    if duplicates_removed > 0:
-        print(f"Duplicates removed: {duplicates_removed}")
-    print(f"\nSaved to:")
-    print(f"  - {output_path}")
-    print(f"  - data/raw/brokeragebd_raw.csv")
-    print(f"\n{'='*60}")
-    print(f"Data summary:")
-    print(f"{'='*60}")
-    print(f"  - Records with Location: {df[df['Location'] != 'N/A'].shape[0]}")
-    print(f"  - Records with Area_sqft: {df[df['Area_sqft'] != 'N/A'].shape[0]}")
-    print(f"  - Records with Price: {df[df['Price'] != 'N/A'].shape[0]}")
-    if "Price_BDT" in df.columns:
-        print(f"  - Records with Price_BDT: {df[df['Price_BDT'] != 'N/A'].shape[0]}")
-    print(f"  - Records with Bedroom: {df[df['Bedroom'] != 'N/A'].shape[0]}")
-    print(f"  - Records with Bathroom: {df[df['Bathroom'] != 'N/A'].shape[0]}")
-    print(f"  - Records with Floor: {df[df['Floor'] != 'N/A'].shape[0]}")
-    print(f"  - Records with For (Rent/Sell): {df[df['For'] != 'N/A'].shape[0]}")
-    print(f"  - Records with Property_Type: {df[df['Property_Type'] != 'N/A'].shape[0]}")
-    print(f"  - Total URLs: {df['URL'].notna().sum()}")
+    details = dict(zip(detail_entries, map_pages(archive_dir, list(detail_entries.values()), reextract_detail, workers)))
     
-    # Show breakdown by For (Rent/Sell)
-    if 'For' in df.columns:
-        print(f"\n  Breakdown by For (Rent/Sell):")
-        for_breakdown = df[df['For'] != 'N/A']['For'].value_counts()
-        for for_type, count in for_breakdown.items():
-            print(f"    - {for_type}: {count}")
-    print(f"\nFirst 5 records:")
-    print(df.head().to_string())
-    print(f"\n{'='*60}")
+    with open_sink(output) as sink:
+        for url in list(all_card_data) + [url for url in detail_entries if url not in all_card_data]:
+            card = all_card_data.get(url, {})
+            detail = details.get(url)
+            sink.write(build_record(url, card, detail) if detail else build_fallback_record(url, card))
+    print_summary(sink)
+    return sink
+
+def command_reextract(args):
+    start = time.perf_counter()
+    reextract(args.archive, args.output, args.workers)
+    print(f"Re-extraction took {time.perf_counter() - start:.1f}s")
+
+def command_ingest_rest(args):
+    records = fetch_rest_records(create_session(), args.base_url)
+    if records:
+        with open_sink(args.output) as sink:
+            sink.write_all(records)
+        print(f"Saved {sink.written} listings → {args.output}")
+    else:
+        print("The REST API returned no properties.")
+
+def command_parse(args):
+    if os.path.exists(args.source):
+        with open(args.source, encoding="utf-8") as f:
+            page_source = f.read()
+        url = args.url or args.source
+    else:
+        page_source = fetch_html(create_session(), args.source)
+        url = args.url or args.source
+    
+    if args.listing:
+        result = [{"url": card_url, **card} for card_url, card in parse_listing_cards(page_source, url)]
+    else:
+        result = parse_property_detail(page_source, url)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+COMMANDS = {
+    "crawl": command_crawl,
+    "ingest-rest": command_ingest_rest,
+    "reextract": command_reextract,
+    "parse": command_parse,
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape property listings from brokeragebd.com")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    crawl = subparsers.add_parser("crawl", help="crawl listing and detail pages (default command)")
+    crawl.add_argument("--chromedriver_path", "--chromedriver-path", dest="chromedriver_path", default=CHROME_DRIVER_PATH,
+                       help="path to chromedriver (default: $CHROMEDRIVER_PATH, else Selenium Manager)")
+    crawl.add_argument("--base-url", default=URL, help="listing page to start from")
+    crawl.add_argument("--output", default=RAW_OUTPUT_PATH, help=f"CSV to write (default: {RAW_OUTPUT_PATH})")
+    crawl.add_argument("--max-pages", type=int, default=MAX_PAGES, help="listing pages to walk at most")
+    crawl.add_argument("--workers", type=int, default=NUM_WORKERS, help="parallel detail-page workers")
+    crawl.add_argument("--listing-workers", type=int, default=LISTING_WORKERS, help="parallel listing-page fetches")
+    crawl.add_argument("--resume", action="store_true",
+                       help="continue an interrupted crawl from the journal instead of starting over")
+    crawl.add_argument("--incremental", action="store_true",
+                       help="only visit listings that are new or changed since the last snapshot")
+    crawl.add_argument("--source", choices=["listing", "sitemap"], default="listing",
+                       help="where Step 1 finds property URLs: the listing pages or the WordPress property sitemap")
+    crawl.add_argument("--fetch-mode", choices=["http", "selenium"], default=FETCH_MODE,
+                       help="detail pages over HTTP with Selenium fallback, or always in Chrome")
+    crawl.add_argument("--listing-mode", choices=["direct", "click"], default=LISTING_MODE,
+                       help="fetch listing pages from the pagination template, or click through them")
+    crawl.add_argument("--rate", type=float, default=REQUEST_RATE,
+                       help="starting HTTP requests/second per host; adapts to throttling")
+    crawl.add_argument("--max-host-concurrency", type=int, default=MAX_HOST_CONCURRENCY,
+                       help="HTTP requests in flight per host at most")
+    crawl.add_argument("--session-max-pages", type=int, default=SESSION_MAX_PAGES,
+                       help="restart a browser session after this many detail pages")
+    crawl.add_argument("--session-max-rss", type=int, default=SESSION_MAX_RSS_MB, metavar="MB",
+                       help="restart a browser session whose memory exceeds this (needs psutil)")
+    crawl.add_argument("--journal", default=JOURNAL_PATH, help="crawl journal used by --resume")
+    crawl.add_argument("--show-browser", action="store_true", help="run Chrome with a visible window")
+    crawl.add_argument("--allow-only", action="store_true", help="block every host outside the site itself")
+    crawl.add_argument("--benchmark-workers", metavar="N,N,...",
+                       help="before Step 2, report pages/min for these worker counts on a sample")
+    crawl.add_argument("--metrics", metavar="PATH",
+                       help="write crawl telemetry to PATH (.json for JSON, otherwise Prometheus text)")
+    crawl.add_argument("--metrics-interval", type=float, default=METRICS_INTERVAL,
+                       help="seconds between metric snapshots during the crawl")
+    crawl.add_argument("--archive", default=ARCHIVE_DIR, help="folder of the compressed HTML archive")
+    crawl.add_argument("--no-archive", action="store_true", help="do not keep the fetched HTML")
+    
+    ingest = subparsers.add_parser("ingest-rest", help="download every listing from the WordPress REST API")
+    ingest.add_argument("--base-url", default=URL)
+    ingest.add_argument("--output", default=RAW_OUTPUT_PATH)
+    
+    reextract_parser = subparsers.add_parser("reextract", help="rebuild the raw CSV from the HTML archive without crawling")
+    reextract_parser.add_argument("--archive", default=ARCHIVE_DIR, help="folder of the compressed HTML archive")
+    reextract_parser.add_argument("--output", default=RAW_OUTPUT_PATH, help=f"CSV to write (default: {RAW_OUTPUT_PATH})")
+    reextract_parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per core)")
+    
+    parse = subparsers.add_parser("parse", help="parse a saved page (or URL) and print the extracted fields")
+    parse.add_argument("source", help="HTML file or URL")
+    parse.add_argument("--url", help="listing URL the saved page came from")
+    parse.add_argument("--listing", action="store_true", help="parse a listing page's cards instead of a detail page")
+    return parser
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `scraping.py --chromedriver_path ...` without a command means `crawl`
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["crawl"] + argv
+    args = build_parser().parse_args(argv)
+    COMMANDS[args.command](args)
+
+if __name__ == "__main__":
+    main()
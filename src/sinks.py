@@ -0,0 +1,242 @@
+import csv
+import json
+import os
+import sqlite3
+from collections import Counter
+
+# Column order of the raw listings file
+RECORD_COLUMNS = ["Location", "Area_sqft", "Price", "Price_BDT", "Bedroom", "Bathroom",
+                  "Floor", "For", "Property_Type", "URL"]
+
+MISSING = ("N/A", None, "")
+
+
+class RecordSink:
+    """Write records as they are produced, in batches, keeping the first record per URL.
+
+    Only the set of URLs written so far and per-column fill counts are kept
+    in memory. Every batch is flushed to disk, so readers can follow the file
+    while the crawl is still running.
+    """
+
+    def __init__(self, path, batch_size=100):
+        self.path = path
+        self.batch_size = batch_size
+        self.seen = set()
+        self.written = 0
+        self.duplicates = 0
+        self.filled = Counter()
+        self.for_counts = Counter()
+        self.head = []
+        self._batch = []
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def write(self, record):
+        url = record.get("URL")
+        if url in self.seen:
+            self.duplicates += 1
+            return False
+        self.seen.add(url)
+        row = {column: record.get(column, "N/A") for column in RECORD_COLUMNS}
+        self._batch.append(row)
+        self.written += 1
+        for column, value in row.items():
+            if value not in MISSING:
+                self.filled[column] += 1
+        if row["For"] not in MISSING:
+            self.for_counts[row["For"]] += 1
+        if len(self.head) < 5:
+            self.head.append(row)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+        return True
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._batch:
+            self._write_batch(self._batch)
+            self._batch = []
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _write_batch(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class CsvSink(RecordSink):
+    def __init__(self, path, batch_size=100):
+        super().__init__(path, batch_size)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=RECORD_COLUMNS)
+        self._writer.writeheader()
+        self._file.flush()
+
+    def _write_batch(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class JsonlSink(RecordSink):
+    def __init__(self, path, batch_size=100):
+        super().__init__(path, batch_size)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def _write_batch(self, rows):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class SqliteSink(RecordSink):
+    """Records in a `listings` table keyed by URL; WAL mode lets readers query mid-crawl."""
+
+    def __init__(self, path, batch_size=100, table="listings"):
+        super().__init__(path, batch_size)
+        self.table = table
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f'"{column}" TEXT' for column in RECORD_COLUMNS if column != "URL")
+        self._conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self._conn.execute(f'CREATE TABLE "{table}" ({columns}, "URL" TEXT PRIMARY KEY)')
+        self._conn.commit()
+
+    def _write_batch(self, rows):
+        placeholders = ", ".join("?" for _ in RECORD_COLUMNS)
+        names = ", ".join(f'"{column}"' for column in RECORD_COLUMNS)
+        self._conn.executemany(f'INSERT OR IGNORE INTO "{self.table}" ({names}) VALUES ({placeholders})',
+                               [[as_text(row[column]) for column in RECORD_COLUMNS] for row in rows])
+        self._conn.commit()
+
+    def _close(self):
+        self._conn.close()
+
+
+class ParquetSink(RecordSink):
+    """One Parquet row group per batch; needs pyarrow. Readers see the file once it is closed."""
+
+    def __init__(self, path, batch_size=1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        super().__init__(path, batch_size)
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in RECORD_COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_batch(self, rows):
+        columns = {column: [as_text(row[column]) for row in rows] for column in RECORD_COLUMNS}
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+
+    def _close(self):
+        self._writer.close()
+
+
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".ndjson": JsonlSink,
+    ".db": SqliteSink,
+    ".sqlite": SqliteSink,
+    ".parquet": ParquetSink,
+}
+
+
+def as_text(value):
+    return None if value is None else str(value)
+
+
+def open_sink(path, batch_size=None):
+    """Sink for `path`, chosen by its extension (.csv, .jsonl, .db/.sqlite, .parquet)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output format '{extension}', use one of {', '.join(SINKS)}")
+    sink_class = SINKS[extension]
+    return sink_class(path) if batch_size is None else sink_class(path, batch_size)
+
+
+def read_records(path):
+    """Yield the records of a file written by any sink, as dicts of strings."""
+    if not os.path.exists(path):
+        return
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield {key: as_text(value) for key, value in json.loads(line).items()}
+                except json.JSONDecodeError:
+                    continue  # A line still being written
+    elif extension in (".db", ".sqlite"):
+        conn = sqlite3.connect(path)
+        try:
+            conn.row_factory = sqlite3.Row
+            for row in conn.execute("SELECT * FROM listings"):
+                yield dict(row)
+        finally:
+            conn.close()
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches():
+            yield from batch.to_pylist()
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def print_summary(sink):
+    """The end-of-crawl data summary, computed from the sink's running counts."""
+    if not sink.written:
+        print("\n" + "="*60)
+        print("No data was collected. Please check the CSS selectors.")
+        print("="*60)
+        return
+
+    print(f"\n{'='*60}")
+    print("Scraping completed successfully!")
+    print(f"{'='*60}")
+    print(f"Total listings collected: {sink.written}")
+    if sink.duplicates > 0:
+        print(f"Duplicates removed: {sink.duplicates}")
+    print("\nSaved to:")
+    print(f"  - {sink.path}")
+    print(f"\n{'='*60}")
+    print("Data summary:")
+    print(f"{'='*60}")
+    for column, label in [("Location", "Location"), ("Area_sqft", "Area_sqft"), ("Price", "Price"),
+                          ("Price_BDT", "Price_BDT"), ("Bedroom", "Bedroom"), ("Bathroom", "Bathroom"),
+                          ("Floor", "Floor"), ("For", "For (Rent/Sell)"), ("Property_Type", "Property_Type")]:
+        print(f"  - Records with {label}: {sink.filled[column]}")
+    print(f"  - Total URLs: {sink.filled['URL']}")
+
+    print("\n  Breakdown by For (Rent/Sell):")
+    for for_type, count in sink.for_counts.most_common():
+        print(f"    - {for_type}: {count}")
+    print("\nFirst 5 records:")
+    for row in sink.head:
+        print(f"  {row}")
+    print(f"\n{'='*60}")
@@ -0,0 +1,202 @@
+import argparse
+import functools
+import re
+import time
+
+# Area and bedroom counts are both "<number> <unit>", so one pattern finds
+# both in a single scan (a number is followed by one unit or the other, never
+# both, so neither match can hide the other). Location is a second search.
+# The units are exactly the ones the per-field regexes matched ("sft" only),
+# so results are the same as legacy_title_info/legacy_url_info.
+TITLE_NUMBERS = re.compile(r'(\d+)(?:\s*(sft)|[-\s]*(bedroom))', re.IGNORECASE)
+TITLE_LOCATION = re.compile(r'in\s+([^,]+?)(?:\s|$|,|\.)', re.IGNORECASE)
+
+SLUG_NUMBERS = re.compile(r'(\d+)-(?:(sft)|(bedroom))')
+SLUG_LOCATION = re.compile(r'in-([^/]+)')
+
+PROPERTY_TYPES = (("flat", "Flat"), ("apartment", "Apartment"), ("house", "House"))
+
+FIELDS = ("area_sqft", "bedrooms", "location", "for_rent_sell", "property_type")
+
+CACHE_SIZE = 65536
+
+
+def scan(numbers, location_pattern, text):
+    """First area, bedrooms and location in `text`; the number scan stops once both are found."""
+    area = bedrooms = None
+    for match in numbers.finditer(text):
+        if match.group(2):
+            if area is None:
+                area = match.group(1)
+        elif bedrooms is None:
+            bedrooms = match.group(1)
+        if area is not None and bedrooms is not None:
+            break
+    location = location_pattern.search(text)
+    return area, bedrooms, location.group(1) if location else None
+
+
+def rent_or_sell(text_lower):
+    if "rent" in text_lower:
+        return "Rent"
+    if "sale" in text_lower:
+        return "Sell"
+    return None
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_title(title):
+    area, bedrooms, location = scan(TITLE_NUMBERS, TITLE_LOCATION, title)
+    return (int(area) if area else None,
+            int(bedrooms) if bedrooms else None,
+            location.strip() if location else None,
+            rent_or_sell(title.lower()),
+            None)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_slug(url):
+    url_lower = url.lower()
+    area, bedrooms, location = scan(SLUG_NUMBERS, SLUG_LOCATION, url_lower)
+    property_type = None
+    for keyword, name in PROPERTY_TYPES:
+        if keyword in url_lower:
+            property_type = name
+            break
+    return (int(area) if area else None,
+            int(bedrooms) if bedrooms else None,
+            location.replace('-', ' ').title() if location else None,
+            rent_or_sell(url_lower),
+            property_type)
+
+
+EMPTY = (None,) * len(FIELDS)
+
+
+def parse_title(title):
+    """Area, bedrooms, location and sale/rent from a listing title.
+
+    Example: '1437 sft 3-bedroom flat is ready for sale in Uttara'.
+    Returns a dict with every key in FIELDS (property_type is always None for
+    titles); repeated titles are served from a cache.
+    """
+    if not isinstance(title, str) or not title or title == "N/A":
+        return dict(zip(FIELDS, EMPTY))
+    return dict(zip(FIELDS, _parse_title(title)))
+
+
+def parse_slug(url):
+    """Area, bedrooms, location, sale/rent and property type from a listing URL.
+
+    Example: '.../1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/'.
+    """
+    if not isinstance(url, str) or not url or url == "N/A":
+        return dict(zip(FIELDS, EMPTY))
+    return dict(zip(FIELDS, _parse_slug(url)))
+
+
+def parse_column(values, kind="title"):
+    """Parse a whole pandas Series of titles ("title") or URLs ("slug") into a DataFrame.
+
+    Each distinct value is parsed once; the result has one column per field
+    in FIELDS and the same index as `values`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    parse = _parse_title if kind == "title" else _parse_slug
+    codes, uniques = pd.factorize(values)
+    rows = [parse(value) if isinstance(value, str) and value and value != "N/A" else EMPTY
+            for value in uniques]
+    rows.append(EMPTY)  # Row for missing values (code -1)
+    table = pd.DataFrame.from_records(rows, columns=FIELDS)
+    table["area_sqft"] = table["area_sqft"].astype("Int64")
+    table["bedrooms"] = table["bedrooms"].astype("Int64")
+    result = table.take(np.where(codes < 0, len(rows) - 1, codes))
+    result.index = values.index
+    return result
+
+
+def legacy_title_info(title):
+    """The per-field regex version parse_title replaced; kept for the benchmark."""
+    info = {"area_sqft": None, "bedrooms": None, "location": None, "for_rent_sell": None}
+    if title and title != "N/A":
+        title_lower = title.lower()
+        area_match = re.search(r'(\d+)\s*sft', title_lower)
+        if area_match:
+            info["area_sqft"] = int(area_match.group(1))
+        bedroom_match = re.search(r'(\d+)[-\s]*bedroom', title_lower)
+        if bedroom_match:
+            info["bedrooms"] = int(bedroom_match.group(1))
+        location_match = re.search(r'in\s+([^,]+?)(?:\s|$|,|\.)', title, re.IGNORECASE)
+        if location_match:
+            info["location"] = location_match.group(1).strip()
+        if "for rent" in title_lower or "rent" in title_lower:
+            info["for_rent_sell"] = "Rent"
+        elif "for sale" in title_lower or "sale" in title_lower:
+            info["for_rent_sell"] = "Sell"
+    return info
+
+
+def legacy_url_info(url):
+    """The per-field regex version parse_slug replaced; kept for the benchmark."""
+    info = {"area_sqft": None, "bedrooms": None, "location": None, "for_rent_sell": None, "property_type": None}
+    if url and url != "N/A":
+        url_lower = url.lower()
+        area_match = re.search(r'(\d+)-sft', url_lower)
+        bedroom_match = re.search(r'(\d+)-bedroom', url_lower)
+        location_match = re.search(r'in-([^/]+)', url_lower)
+        if area_match:
+            info["area_sqft"] = int(area_match.group(1))
+        if bedroom_match:
+            info["bedrooms"] = int(bedroom_match.group(1))
+        if location_match:
+            info["location"] = location_match.group(1).replace('-', ' ').title()
+        if "for-rent" in url_lower or "rent" in url_lower:
+            info["for_rent_sell"] = "Rent"
+        elif "for-sale" in url_lower or "sale" in url_lower:
+            info["for_rent_sell"] = "Sell"
+        if "flat" in url_lower:
+            info["property_type"] = "Flat"
+        elif "apartment" in url_lower:
+            info["property_type"] = "Apartment"
+        elif "house" in url_lower:
+            info["property_type"] = "House"
+    return info
+
+
+def benchmark(path="data/raw/brokeragebd_raw.csv", rows=200_000):
+    """Print rows/s of the old per-field functions against the cached parser and parse_column."""
+    import pandas as pd
+
+    urls = pd.read_csv(path, usecols=["URL"])["URL"].dropna()
+    urls = urls.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+    titles = urls.str.rstrip("/").str.rsplit("/", n=1).str[-1].str.replace("-", " ")
+    print(f"{len(urls)} rows, {urls.nunique()} distinct URLs")
+
+    def timed(label, func):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<34} {elapsed:7.3f}s  {len(urls) / elapsed:>12,.0f} rows/s")
+
+    for kind, values, legacy, parse, uncached in [("slug", urls, legacy_url_info, parse_slug, _parse_slug.__wrapped__),
+                                                  ("title", titles, legacy_title_info, parse_title, _parse_title.__wrapped__)]:
+        print(f"{kind}:")
+        timed("legacy per-field regexes", lambda: [legacy(v) for v in values])
+        timed("parser, no cache", lambda: [uncached(v) for v in values])
+        _parse_title.cache_clear()
+        _parse_slug.cache_clear()
+        timed("parser, cold cache", lambda: [parse(v) for v in values])
+        timed("parser, warm cache", lambda: [parse(v) for v in values])
+        _parse_title.cache_clear()
+        _parse_slug.cache_clear()
+        timed("parse_column (distinct values)", lambda: parse_column(values, kind))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark the slug/title parser")
+    parser.add_argument("--input", default="data/raw/brokeragebd_raw.csv")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    benchmark(args.input, args.rows)
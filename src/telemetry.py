@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds (Prometheus `le` labels)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+
+class Telemetry:
+    """Counters and latency histograms for crawl stages, keyed by name and labels.
+
+    Disabled by default: every recording call returns after one attribute
+    check, so instrumented code costs next to nothing unless `enable()` was
+    called.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.histograms = {}
+        self.path = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def enable(self, path=None, interval=None):
+        """Start recording; with `path`, also write the metrics every `interval` seconds."""
+        self.enabled = True
+        self.path = path
+        if path and interval:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._write_periodically, args=(interval,), daemon=True)
+            self._thread.start()
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def _timed(self, name, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timer(self, name, **labels):
+        """Context manager recording the block's duration into histogram `name`."""
+        if not self.enabled:
+            return NULL_TIMER
+        return self._timed(name, labels)
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, (list(h.counts), h.total, h.count)) for key, h in self.histograms.items())
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE crawl_{name} counter")
+                typed.add(name)
+            lines.append(f"crawl_{name}{format_labels(labels)} {value}")
+        for (name, labels), (counts, total, count) in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE crawl_{name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"crawl_{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"crawl_{name}_sum{format_labels(labels)} {total:.6f}")
+            lines.append(f"crawl_{name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            histograms = [{"name": name, "labels": dict(labels), "count": h.count, "sum": h.total,
+                           "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], h.counts))}
+                          for (name, labels), h in sorted(self.histograms.items())]
+        return json.dumps({"written_at": time.time(), "counters": counters, "histograms": histograms}, indent=2)
+
+    def write(self, path=None):
+        """Write the metrics to `path` (.json → JSON, anything else → Prometheus text)."""
+        path = path or self.path
+        if not self.enabled or not path:
+            return
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        content = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _write_periodically(self, interval):
+        while not self._stop.wait(interval):
+            self.write()
+
+    def close(self):
+        """Stop the periodic writer and write the final metrics."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+def escape_label(value):
+    """Escape a label value for the text format: backslash, double quote and newline."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+
+# Shared instance imported by the crawler modules
+metrics = Telemetry()
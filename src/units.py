@@ -0,0 +1,128 @@
+import argparse
+import re
+import time
+
+# Price unit spellings seen on brokeragebd.com (including typos) → multiplier
+PRICE_UNITS = {
+    "crore": 10_000_000, "crores": 10_000_000, "croe": 10_000_000, "cr": 10_000_000,
+    "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "lacs": 100_000,
+    "million": 1_000_000, "mn": 1_000_000,
+    "thousand": 1_000, "k": 1_000,
+}
+
+# Area units → square feet
+AREA_UNITS = {
+    "sqft": 1.0, "sq ft": 1.0, "sq. ft": 1.0, "sq.ft": 1.0, "sft": 1.0, "ft": 1.0,
+    "sqm": 10.7639, "sq m": 10.7639, "m2": 10.7639,
+    "katha": 720.0, "kathas": 720.0, "decimal": 435.6, "decimals": 435.6,
+}
+
+
+def unit_alternation(units):
+    """Regex alternation of the unit spellings, longest first so 'crores' beats 'cr'."""
+    return "|".join(re.escape(unit) for unit in sorted(units, key=len, reverse=True))
+
+
+# First number in the text and the unit word right after it. A unit only
+# counts as a whole word, so the "k" in "bdt 5 per week" is not a thousand.
+PRICE_PATTERN = re.compile(r'(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>' + unit_alternation(PRICE_UNITS) + r')?\b')
+AREA_PATTERN = re.compile(r'(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>' + unit_alternation(AREA_UNITS) + r')?\b')
+
+
+def prepare(text):
+    return text.lower().replace(",", "")
+
+
+def parse_money(text, pattern=PRICE_PATTERN, units=PRICE_UNITS):
+    """Scalar version of parse_prices with the same pattern and unit table."""
+    if isinstance(text, (int, float)):
+        return None if text != text else round(float(text), 2)
+    if not isinstance(text, str):
+        return None
+    match = pattern.search(prepare(text))
+    if not match:
+        return None
+    return round(float(match.group("number")) * units.get(match.group("unit"), 1), 2)
+
+
+def parse_price(text):
+    """'BDT 1.45 Crore' → 14500000.0, '44 Thousand Per Month' → 44000.0; None without a number."""
+    return parse_money(text, PRICE_PATTERN, PRICE_UNITS)
+
+
+def parse_area(text):
+    """'1437 sft' → 1437.0, '3 katha' → 2160.0 (square feet); None without a number."""
+    return parse_money(text, AREA_PATTERN, AREA_UNITS)
+
+
+def parse_column(values, pattern=PRICE_PATTERN, units=PRICE_UNITS):
+    """Vectorized parse of a pandas Series: str.extract plus a unit-multiplier lookup.
+
+    Listing columns repeat the same few thousand texts, so each distinct text
+    is extracted once and the amounts are mapped back by factorize codes.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    if not len(uniques):
+        # Nothing but missing values (or an empty chunk): no amounts to look up
+        return pd.Series(np.nan, index=values.index, dtype="float64")
+    text = pd.Series(uniques, dtype="string").str.lower().str.replace(",", "", regex=False)
+    parts = text.str.extract(pattern)
+    number = pd.to_numeric(parts["number"], errors="coerce")
+    multiplier = parts["unit"].map(units).astype("float64").fillna(1.0)
+    amounts = (number * multiplier).round(2).to_numpy(dtype="float64")
+    return pd.Series(np.where(codes >= 0, amounts[np.where(codes >= 0, codes, 0)], np.nan), index=values.index)
+
+
+def parse_prices(values):
+    """Series of price texts → Series of BDT amounts (NaN where no number was found)."""
+    return parse_column(values, PRICE_PATTERN, PRICE_UNITS)
+
+
+def parse_areas(values):
+    """Series of areas (numbers or texts like '1437 sft') → Series of square feet."""
+    return parse_column(values, AREA_PATTERN, AREA_UNITS)
+
+
+def benchmark(path="data/raw/brokeragebd_raw.csv", rows=1_000_000):
+    """Time parse_prices/parse_areas against Series.apply with the scalar versions."""
+    import pandas as pd
+
+    raw = pd.read_csv(path, usecols=["Price", "Area_sqft"], dtype=str)
+    sample = raw.sample(rows, replace=True, random_state=0).reset_index(drop=True)
+    print(f"{len(sample):,} rows")
+
+    for label, column, vectorized, scalar in [("price", "Price", parse_prices, parse_price),
+                                              ("area", "Area_sqft", parse_areas, parse_area)]:
+        values = sample[column]
+        start = time.perf_counter()
+        applied = values.apply(scalar)
+        apply_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extracted = vectorized(values)
+        vector_seconds = time.perf_counter() - start
+
+        same = applied.astype("float64").equals(extracted.astype("float64"))
+        print(f"  {label:<6} apply {apply_seconds:6.2f}s | vectorized {vector_seconds:6.2f}s "
+              f"| {apply_seconds / vector_seconds:5.1f}x faster | identical: {same}")
+
+        # Worst case: every text distinct, so nothing is shared between rows
+        unique_values = (values.fillna("") + " #" + pd.Series(range(len(values))).astype(str)).head(rows // 10)
+        start = time.perf_counter()
+        unique_values.apply(scalar)
+        apply_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        vectorized(unique_values)
+        vector_seconds = time.perf_counter() - start
+        print(f"  {'':<6} all-distinct {len(unique_values):,} rows: apply {apply_seconds:6.2f}s "
+              f"| vectorized {vector_seconds:6.2f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized price/area parsing against Series.apply")
+    parser.add_argument("--input", default="data/raw/brokeragebd_raw.csv")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    benchmark(args.input, args.rows)
@@ -1,9 +1,32 @@
 import os
-import pandas as pd
+import datetime
 
 RAW_DIR = "data/raw/"
 CLEAN_DIR = "data/cleaned/"
 
+# Typed, date-partitioned copies of the datasets (Parquet or Arrow IPC)
+STORE_DIR = "data/store/"
+
+# Column types of the listings dataset: nullable integers instead of "N/A"
+# strings, and categoricals for the low-cardinality text columns
+LISTING_SCHEMA = {
+    "Location": "category",
+    "Neighborhood": "category",
+    "Sub_Area": "category",
+    "Area_sqft": "Int64",
+    "Price": "string",
+    "Price_BDT": "Float64",
+    "Bedroom": "Int64",
+    "Bathroom": "Int64",
+    "Floor": "Int64",
+    "For": "category",
+    "Property_Type": "category",
+    "URL": "string",
+    "Cluster_ID": "Int64",
+}
+
+PARTITION_COLUMN = "scrape_date"
+
 def ensure_dir(path):
     """Create folder if it doesn't exist."""
     if not os.path.exists(path):
@@ -18,3 +41,107 @@ def save_clean_data(df, filename):
     ensure_dir(CLEAN_DIR)
     df.to_csv(os.path.join(CLEAN_DIR, filename), index=False)
     print(f"Saved cleaned data → {CLEAN_DIR}{filename}")
+
+def apply_schema(df, schema=LISTING_SCHEMA):
+    """Cast the listing columns present in `df` to their LISTING_SCHEMA types ("N/A" → missing)."""
+    import pandas as pd
+
+    df = df.copy()
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column].replace("N/A", pd.NA)
+        if dtype in ("Int64", "Float64"):
+            values = pd.to_numeric(values, errors="coerce")
+            if dtype == "Int64":
+                values = values.round()
+        df[column] = values.astype(dtype)
+    return df
+
+def read_listings(path):
+    """Read a listings CSV with the typed schema; works without pyarrow."""
+    import pandas as pd
+
+    return apply_schema(pd.read_csv(path, na_values=["N/A"]))
+
+def arrow_schema(df):
+    """Explicit Arrow schema for `df`: LISTING_SCHEMA columns typed, others inferred."""
+    import pyarrow as pa
+
+    arrow_types = {
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "Int64": pa.int64(),
+        "Float64": pa.float64(),
+        "string": pa.string(),
+    }
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in inferred:
+        dtype = LISTING_SCHEMA.get(field.name)
+        fields.append(pa.field(field.name, arrow_types[dtype]) if dtype else field)
+    return pa.schema(fields)
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        return pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow storage needs pyarrow: pip install pyarrow")
+
+def stored_format(path):
+    """"parquet" or "arrow" for the files already in a dataset folder; None if it has none."""
+    for _, _, filenames in os.walk(path):
+        for filename in filenames:
+            extension = os.path.splitext(filename)[1].lstrip(".")
+            if extension in ("parquet", "arrow"):
+                return extension
+    return None
+
+def check_format(path, fmt):
+    """ValueError if the dataset at `path` was written in another format than `fmt`."""
+    stored = stored_format(path)
+    if stored and stored != fmt:
+        raise ValueError(f"{path} holds {stored} files, not {fmt}; use fmt=\"{stored}\" or another dataset name")
+
+def save_dataset(df, name, fmt="parquet", scrape_date=None, root=STORE_DIR):
+    """Write `df` typed to root/name/scrape_date=YYYY-MM-DD/ as Parquet or Arrow IPC ("arrow").
+
+    Writing the same date again replaces that partition; other dates are kept.
+    A dataset keeps the format it was first written in (ValueError otherwise).
+    """
+    pa = import_pyarrow()
+
+    path = os.path.join(root, name)
+    check_format(path, fmt)
+    df = apply_schema(df)
+    df[PARTITION_COLUMN] = str(scrape_date or datetime.date.today())
+    table = pa.Table.from_pandas(df, schema=arrow_schema(df), preserve_index=False)
+    ensure_dir(path)
+    pa.dataset.write_dataset(table, path, format="ipc" if fmt == "arrow" else fmt,
+                             basename_template=f"part-{{i}}.{fmt}",
+                             partitioning=[PARTITION_COLUMN], partitioning_flavor="hive",
+                             existing_data_behavior="delete_matching")
+    print(f"Saved {len(df)} rows → {path}/{PARTITION_COLUMN}={df[PARTITION_COLUMN].iat[0]}/")
+    return path
+
+def load_dataset(name, columns=None, filters=None, fmt="parquet", root=STORE_DIR):
+    """Load a dataset written by save_dataset, reading only what is asked for.
+
+    `columns` projects the columns read from disk and `filters` is a list of
+    (column, op, value) tuples (ops: ==, !=, <, <=, >, >=, in, not in) pushed
+    down to the reader, so partitions and row groups that cannot match are
+    skipped, e.g. filters=[("Location", "==", "Gulshan, Dhaka")].
+    """
+    pa = import_pyarrow()
+    import pandas as pd
+    from pyarrow.parquet import filters_to_expression
+
+    path = os.path.join(root, name)
+    check_format(path, fmt)
+    dataset = pa.dataset.dataset(path, format="ipc" if fmt == "arrow" else fmt, partitioning="hive")
+    expression = filters_to_expression(filters) if filters else None
+    table = dataset.to_table(columns=columns, filter=expression)
+    df = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype(), pa.float64(): pd.Float64Dtype(),
+                                       pa.string(): pd.StringDtype()}.get)
+    return apply_schema(df)
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import defaultdict
+from telemetry import metrics
+
+# Selenium is imported inside the functions that use it, so importing this
+# module (e.g. for `scraping.py --help`) stays cheap.
+
+
+def dom_ready():
+    """The DOM is parsed (readyState 'interactive' or 'complete'); enough with eager page loads."""
+    return lambda driver: driver.execute_script("return document.readyState") in ("interactive", "complete")
+
+
+def element_present(css_selector):
+    """At least one element matches the CSS selector."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    return EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+
+
+def page_changed(old_url, old_element=None):
+    """The URL changed or `old_element` was detached from the DOM (AJAX pagination)."""
+    from selenium.common.exceptions import StaleElementReferenceException
+
+    def condition(driver):
+        if driver.current_url != old_url:
+            return True
+        if old_element is None:
+            return False
+        try:
+            old_element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+    return condition
+
+
+def count_grew(css_selector, old_count, old_height=None):
+    """More elements match the selector than before, or the page got taller (lazy loading)."""
+    from selenium.webdriver.common.by import By
+
+    def condition(driver):
+        if len(driver.find_elements(By.CSS_SELECTOR, css_selector)) > old_count:
+            return True
+        if old_height is not None:
+            return driver.execute_script("return document.body.scrollHeight") > old_height
+        return False
+    return condition
+
+
+def count_stable(css_selector, settle=0.75):
+    """The number of matching elements has stopped changing for `settle` seconds."""
+    from selenium.webdriver.common.by import By
+    state = {"count": -1, "since": time.monotonic()}
+
+    def condition(driver):
+        count = len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return count > 0 and now - state["since"] >= settle
+    return condition
+
+
+class WaitEngine:
+    """Wait on readiness signals with a timeout budget and record how long each wait took."""
+
+    def __init__(self, poll_frequency=0.1):
+        self.poll_frequency = poll_frequency
+        self.timings = defaultdict(list)
+        self.timeouts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def wait(self, driver, condition, timeout, label):
+        """Block until `condition(driver)` is truthy or `timeout` seconds pass.
+
+        Returns the condition's value, or None if the budget ran out.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            result = None
+        elapsed = time.perf_counter() - start
+        metrics.observe("wait_seconds", elapsed, label=label)
+        if result is None:
+            metrics.count("wait_timeouts", label=label)
+        with self._lock:
+            self.timings[label].append(elapsed)
+            if result is None:
+                self.timeouts[label] += 1
+        return result
+
+    def report(self):
+        """Print count, total, mean and max wait time per label."""
+        with self._lock:
+            rows = sorted(self.timings.items(), key=lambda item: -sum(item[1]))
+            timeouts = dict(self.timeouts)
+        if not rows:
+            return
+        print(f"\n{'wait':<22} {'count':>6} {'timeouts':>8} {'total s':>8} {'mean s':>7} {'max s':>6}")
+        for label, samples in rows:
+            print(f"{label:<22} {len(samples):>6} {timeouts.get(label, 0):>8} "
+                  f"{sum(samples):>8.1f} {sum(samples) / len(samples):>7.2f} {max(samples):>6.2f}")
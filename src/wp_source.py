@@ -0,0 +1,155 @@
+import re
+import urllib.parse
+from lxml import etree
+from http_fetch import get
+from page_parser import PROPERTY_URL
+from units import parse_price
+
+# Houzez registers its listings as the "property" post type under this REST base
+REST_ROUTE = "wp-json/wp/v2/properties"
+REST_PAGE_SIZE = 100
+
+# Sitemap indexes written by WordPress core and by Yoast SEO
+SITEMAP_INDEXES = ["wp-sitemap.xml", "sitemap_index.xml", "sitemap.xml"]
+
+SITEMAP_NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+
+
+def fetch_rest_properties(session, base_url, per_page=REST_PAGE_SIZE):
+    """Yield every property object from the WordPress REST API, one page of 100 at a time."""
+    endpoint = urllib.parse.urljoin(base_url, REST_ROUTE)
+    page = 1
+    total_pages = 1
+    while page <= total_pages:
+        response = get(session, endpoint, timeout=30, params={"per_page": per_page, "page": page, "_embed": 1})
+        if response.status_code == 400 and page > 1:
+            break  # WordPress answers 400 past the last page
+        response.raise_for_status()
+        total_pages = int(response.headers.get("X-WP-TotalPages", total_pages))
+        items = response.json()
+        print(f"REST page {page}/{total_pages}: {len(items)} properties")
+        if not items:
+            break
+        yield from items
+        page += 1
+
+
+def meta_value(meta, *keys):
+    """First non-empty value among `keys` in a Houzez property_meta dict (values may be lists)."""
+    for key in keys:
+        value = meta.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def embedded_terms(item):
+    """taxonomy → [term names] from an item fetched with _embed."""
+    terms = {}
+    for group in item.get("_embedded", {}).get("wp:term", []):
+        for term in group:
+            terms.setdefault(term.get("taxonomy"), []).append(term.get("name"))
+    return terms
+
+
+def first_int(value):
+    match = re.search(r'\d+', str(value or "").replace(',', ''))
+    return int(match.group(0)) if match else None
+
+
+def map_rest_property(item):
+    """Map one REST property onto the raw record schema built in Step 2 of scraping.py."""
+    meta = item.get("property_meta") or {}
+    terms = embedded_terms(item)
+
+    location_parts = (terms.get("property_area") or [])[:1] + (terms.get("property_city") or [])[:1]
+    location = ", ".join(location_parts) or meta_value(meta, "fave_property_address", "fave_property_map_address")
+
+    price_value = meta_value(meta, "fave_property_price")
+    price_bdt = parse_price(price_value)
+    postfix = meta_value(meta, "fave_property_price_postfix")
+    price = f"BDT {price_value}" + (f" {postfix}" if postfix else "") if price_value else None
+
+    status = " ".join(terms.get("property_status") or []).lower()
+    for_rent_sell = "Rent" if "rent" in status else "Sell" if "sale" in status or "sell" in status else None
+    if price and not for_rent_sell and "month" in price.lower():
+        for_rent_sell = "Rent"
+
+    property_type = None
+    for name in terms.get("property_type") or []:
+        if name.lower() in ("flat", "apartment", "house"):
+            property_type = name.title()
+            break
+
+    area_sqft = first_int(meta_value(meta, "fave_property_size"))
+    bedrooms = first_int(meta_value(meta, "fave_property_bedrooms", "fave_property_rooms"))
+    bathrooms = first_int(meta_value(meta, "fave_property_bathrooms"))
+    floor = first_int(meta_value(meta, "fave_floor-no", "fave_property_floor", "fave_floor"))
+
+    return {
+        "Location": location if location else "N/A",
+        "Area_sqft": area_sqft if area_sqft else "N/A",
+        "Price": price if price else "N/A",
+        "Price_BDT": price_bdt if price_bdt else "N/A",
+        "Bedroom": bedrooms if bedrooms else "N/A",
+        "Bathroom": bathrooms if bathrooms else "N/A",
+        "Floor": floor if floor else "N/A",
+        "For": for_rent_sell if for_rent_sell else "N/A",
+        "Property_Type": property_type if property_type else "N/A",
+        "URL": item.get("link")
+    }
+
+
+def fetch_rest_records(session, base_url):
+    """All properties from the REST API as raw records, deduplicated by URL."""
+    records = {}
+    for item in fetch_rest_properties(session, base_url):
+        record = map_rest_property(item)
+        if record["URL"] and record["URL"] not in records:
+            records[record["URL"]] = record
+    return list(records.values())
+
+
+def sitemap_locations(session, url):
+    """(loc, lastmod) pairs from a sitemap or sitemap index."""
+    response = get(session, url, timeout=30)
+    response.raise_for_status()
+    root = etree.fromstring(response.content)
+    entries = []
+    for node in root.xpath("//sm:sitemap | //sm:url", namespaces=SITEMAP_NS):
+        loc = node.findtext("sm:loc", namespaces=SITEMAP_NS)
+        if loc:
+            entries.append((loc.strip(), node.findtext("sm:lastmod", namespaces=SITEMAP_NS)))
+    return entries
+
+
+def fetch_sitemap_urls(session, base_url):
+    """Property URLs (with lastmod) listed in the site's property sitemaps."""
+    for index_name in SITEMAP_INDEXES:
+        try:
+            entries = sitemap_locations(session, urllib.parse.urljoin(base_url, index_name))
+        except Exception:
+            continue
+
+        property_sitemaps = [loc for loc, _ in entries if loc.endswith(".xml") and "propert" in loc]
+        if not property_sitemaps:
+            property_urls = [(loc, lastmod) for loc, lastmod in entries if PROPERTY_URL.search(loc)]
+            if property_urls:
+                return property_urls
+            continue
+
+        urls = []
+        for sitemap_url in property_sitemaps:
+            # One broken sub-sitemap should not cost the URLs of the others
+            try:
+                entries = sitemap_locations(session, sitemap_url)
+            except Exception as e:
+                print(f"    Error reading sitemap {sitemap_url}: {e}")
+                continue
+            urls.extend((loc, lastmod) for loc, lastmod in entries if PROPERTY_URL.search(loc))
+        print(f"Found {len(urls)} property URLs in {len(property_sitemaps)} sitemaps")
+        return urls
+    return []
+
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning import FingerprintSet, clean_dataset, clean_dataset_streaming, extract_area
+
+COLUMNS = ["Location", "Area_sqft", "Price", "Price_BDT", "Bedroom", "Bathroom", "Floor", "For", "Property_Type",
+           "URL"]
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("1200 sqft flat in Mirpur", 1200),
+    ("1200 ft flat in Mirpur", 1200),
+    ("1200 sq ft flat in Mirpur", 1200),
+    ("1437 SFT 3 Bedroom Flat Is Ready For Sale In Uttara K8", 1437),
+    ("2 sft balcony", None),
+    ("3 Bedroom Flat", None),
+    (None, None),
+])
+def test_extract_area(title, expected):
+    assert extract_area(title) == expected
+
+
+def test_fingerprint_set_spills_to_disk(tmp_path):
+    fingerprints = FingerprintSet(max_in_memory=5, spill_dir=str(tmp_path))
+    assert fingerprints.add_new([1, 2, 2, 3]).tolist() == [True, True, False, True]
+    assert fingerprints.db is None
+    assert fingerprints.add_new([3, 4, 5, 6]).tolist() == [False, True, True, True]
+    assert fingerprints.db is not None and len(fingerprints.values) == 0
+    # Values above 2**63 survive the signed SQLite column
+    big = np.uint64(2 ** 64 - 1)
+    keep = fingerprints.add_new(np.array([6, big, 1, 7, big], dtype=np.uint64))
+    assert keep.tolist() == [False, True, False, True, False]
+    assert fingerprints.add_new(np.array([big], dtype=np.uint64)).tolist() == [False]
+    assert fingerprints.count == 8
+    fingerprints.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture
+def raw(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    neighborhoods = rng.choice(["Uttara", "Mirpur", "Gulshan"], 2500)
+    rows = [(f"{name}, Dhaka", str(area), f"BDT {price / 100:.2f} Lakh", str(float(price * 1000)), "3", "2", "5",
+             "Sell", "Flat", f"https://brokeragebd.com/property/{i}-sft-flat-in-{name.lower()}/")
+            for i, (name, area, price) in enumerate(zip(neighborhoods, rng.integers(800, 2500, 2500),
+                                                       rng.integers(5000, 20000, 2500)))]
+    rows[1500:1600] = rows[:100]  # Duplicates in a later chunk
+    rows[2000] = rows[2000][:2] + ("Call for price", "N/A") + rows[2000][4:]
+    path = tmp_path / "raw.csv"
+    pd.DataFrame(rows, columns=COLUMNS).to_csv(path, index=False)
+    return str(path)
+
+
+def test_streaming_matches_clean_dataset(raw):
+    expected = clean_dataset(raw)
+    assert len(expected) == 2399
+    assert clean_dataset_streaming(raw, "streamed.csv", memory_mb=1) == 2399
+    streamed = pd.read_csv("data/cleaned/streamed.csv")
+    pd.testing.assert_frame_equal(streamed, pd.read_csv("data/cleaned/brokeragebd_clean.csv"))
+    assert streamed["URL"].is_unique
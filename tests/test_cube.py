@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import AggregateCube, SKETCH_ACCURACY
+
+
+def listings(size, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Neighborhood": rng.choice(["Gulshan", "Mirpur", "Uttara"], size),
+        "Property_Type": "Flat",
+        "For": rng.choice(["Sell", "Rent"], size),
+        "Bedroom": pd.array(rng.integers(2, 5, size), dtype="Int64"),
+        "Price_BDT": np.round(rng.lognormal(16, 0.5, size), -3),
+        "Area_sqft": rng.integers(800, 2500, size).astype("float64"),
+    })
+
+
+@pytest.fixture
+def cube(tmp_path):
+    cube = AggregateCube(str(tmp_path / "cube.db"))
+    yield cube
+    cube.close()
+
+
+def test_query_matches_pandas(cube):
+    first, second = listings(500, 1), listings(300, 2)
+    cube.update(first, "2026-10-01")
+    cube.update(second, "2026-10-08")
+    both = pd.concat([first, second])
+
+    result = {row["Neighborhood"]: row for row in cube.query(["Neighborhood"], quantiles=(0.5, 0.9))}
+    for neighborhood, group in both.groupby("Neighborhood"):
+        row = result[neighborhood]
+        prices = np.sort(group["Price_BDT"].to_numpy())
+        assert row["listings"] == len(group)
+        assert row["price_mean"] == pytest.approx(prices.mean())
+        assert row["price_std"] == pytest.approx(prices.std(), rel=1e-6)
+        assert (row["price_min"], row["price_max"]) == (prices.min(), prices.max())
+        for q in (0.5, 0.9):
+            exact = prices[int(q * (len(prices) - 1))]
+            assert abs(row[f"price_p{round(q * 100)}"] - exact) <= SKETCH_ACCURACY * exact
+        ppsf = (group["Price_BDT"] / group["Area_sqft"]).mean()
+        assert row["ppsf_mean"] == pytest.approx(ppsf)
+
+
+def test_filters_and_dates(cube):
+    first, second = listings(200, 3), listings(100, 4)
+    cube.update(first, "2026-10-01")
+    cube.update(second, "2026-10-08")
+    rows = cube.query(["For"], filters=[("scrape_date", ">=", "2026-10-08"), ("Neighborhood", "==", "Mirpur")])
+    expected = second[second["Neighborhood"] == "Mirpur"].groupby("For").size().to_dict()
+    assert {row["For"]: row["listings"] for row in rows} == expected
+    with pytest.raises(ValueError):
+        cube.query(filters=[("Price_BDT", ">", 1)])
+
+
+def test_chunks_add_up_and_replace_does_not_double_count(cube):
+    snapshot = listings(400, 5)
+    cube.update(snapshot.iloc[:150], "2026-10-01")
+    cube.update(snapshot.iloc[150:], "2026-10-01")
+    chunked = cube.query(["Neighborhood", "Bedroom"])
+    cube.update(snapshot, "2026-10-01", replace=True)
+    whole = cube.query(["Neighborhood", "Bedroom"])
+    assert [row["listings"] for row in whole] == [row["listings"] for row in chunked]
+    for merged, direct in zip(chunked, whole):
+        assert merged["price_mean"] == pytest.approx(direct["price_mean"])
+        assert merged["price_p50"] == direct["price_p50"]
+    assert sum(row["listings"] for row in whole) == len(snapshot)
+
+
+def test_missing_prices_count_as_listings_only(cube):
+    df = listings(10, 6)
+    df.loc[:4, "Price_BDT"] = np.nan
+    df["Neighborhood"] = "Gulshan"
+    cube.update(df, "2026-10-01")
+    (row,) = cube.query(["Neighborhood"])
+    assert (row["listings"], row["price_count"]) == (10, 5)
+
+
+def test_export_csv(cube, tmp_path):
+    cube.update(listings(50, 7), "2026-10-01")
+    path = tmp_path / "out" / "cube.csv"
+    assert cube.export_csv(str(path), group_by=["Neighborhood"]) == 3
+    exported = pd.read_csv(path)
+    assert list(exported.columns[:2]) == ["Neighborhood", "listings"]
+    assert exported["listings"].sum() == 50
@@ -0,0 +1,90 @@
+import itertools
+import random
+import threading
+import time
+
+from driver_pool import DriverPool, iter_scrape_in_parallel, scrape_in_parallel
+
+
+class FakeDriver:
+    """Stands in for a WebDriver: numbered, and remembers whether it was quit."""
+
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self.ids)
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        driver = FakeDriver()
+        with self.lock:
+            self.drivers.append(driver)
+        return driver
+
+
+def test_sessions_are_recycled_after_max_pages():
+    factory = FakeFactory()
+    pool = DriverPool(factory, max_pages=3, max_rss_mb=None)
+    used = [driver.id for driver, _ in scrape_in_parallel(
+        [f"u{i}" for i in range(7)], lambda get_driver, url: get_driver(), factory, workers=1, pool=pool)]
+    assert len(factory.drivers) == 3
+    first, second, third = (driver.id for driver in factory.drivers)
+    assert used == [first] * 3 + [second] * 3 + [third]
+    assert pool.stats["recycled_pages"] == 2
+    assert [driver.quit_called for driver in factory.drivers] == [True, True, False]
+    pool.close()
+    assert factory.drivers[2].quit_called
+
+
+def test_crashed_session_is_retried_on_a_new_one():
+    factory = FakeFactory()
+    crashes = {"bad": 1, "dead": 5}
+
+    def task(get_driver, url):
+        driver = get_driver()
+        if crashes.get(url):
+            crashes[url] -= 1
+            raise RuntimeError("invalid session id")
+        if url == "broken":
+            raise ValueError("no price on page")
+        return url, driver.id
+
+    pool = DriverPool(factory, max_rss_mb=None)
+    results = scrape_in_parallel(["ok", "bad", "broken", "dead"], task, factory, workers=1, pool=pool,
+                                 crash_retries=2)
+    assert results[0][0][0] == "ok" and results[1][0][0] == "bad"
+    assert results[1][0][1] != results[0][0][1]  # Retried on a fresh session
+    assert isinstance(results[2][1], ValueError)
+    assert results[3][0] is None and "invalid session id" in str(results[3][1])
+    assert pool.stats["crashed"] == 4 and pool.stats["retried"] == 3
+    pool.close()
+    assert all(driver.quit_called for driver in factory.drivers)
+
+
+def test_results_follow_url_order():
+    factory = FakeFactory()
+    urls = [f"u{i}" for i in range(20)]
+    delays = random.Random(0)
+    pauses = {url: delays.uniform(0, 0.02) for url in urls}
+
+    def task(get_driver, url):
+        time.sleep(pauses[url])
+        return url
+
+    assert [result for result, _ in iter_scrape_in_parallel(urls, task, factory, workers=4)] == urls
+
+
+def test_tasks_that_never_ask_for_a_driver_start_no_browser():
+    factory = FakeFactory()
+    results = scrape_in_parallel(["a", "b"], lambda get_driver, url: url.upper(), factory)
+    assert results == [("A", None), ("B", None)]
+    assert factory.drivers == []
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from history import SnapshotHistory, read_records
+
+BASE_URL = "https://brokeragebd.com/property/"
+UTTARA = BASE_URL + "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/"
+MIRPUR = BASE_URL + "1257-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur/"
+GULSHAN = BASE_URL + "2522-sft-3-bedroom-flat-is-ready-for-sale-in-gulshan/"
+
+
+def record(location, price, floor="8"):
+    return {"Location": location, "Area_sqft": "1437", "Price": None, "Price_BDT": price, "Bedroom": "3",
+            "Bathroom": "2", "Floor": floor, "For": "Sell", "Property_Type": "Flat"}
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = SnapshotHistory(str(tmp_path / "history.db"), checkpoint_every=2)
+    yield store
+    store.close()
+
+
+def test_deltas_and_state_replay(history):
+    first = {UTTARA: record("Uttara, Dhaka", "14500000.0"), MIRPUR: record("Mirpur, Dhaka", "12600000.0")}
+    second = {UTTARA: record("Uttara, Dhaka", "13900000.0"), GULSHAN: record("Gulshan, Dhaka", "50000000.0")}
+    third = {UTTARA: record("Uttara, Dhaka", "13900000.0", floor="9"), GULSHAN: second[GULSHAN]}
+
+    assert history.add_snapshot(first, "2026-09-01") == {"snapshot": 1, "added": 2, "removed": 0, "changed": 0,
+                                                         "checkpoint": True}
+    assert history.add_snapshot(second, "2026-09-15") == {"snapshot": 2, "added": 1, "removed": 1, "changed": 1,
+                                                          "checkpoint": False}
+    assert history.add_snapshot(third, "2026-10-01")["checkpoint"] is True
+
+    assert history.state_at("2026-08-31") == {}
+    assert history.state_at("2026-09-01") == first
+    assert history.state_at("2026-09-20") == second
+    assert history.state_at("2026-10-16") == third
+    assert history.price_history(UTTARA) == [("2026-09-01", 14500000.0), ("2026-09-15", 13900000.0)]
+
+
+def test_price_drops_by_neighborhood_and_date(history):
+    history.add_snapshot({UTTARA: record("Uttara, Dhaka", "14500000.0"),
+                          MIRPUR: record("Mirpur, Dhaka", "12600000.0")}, "2026-09-01")
+    history.add_snapshot({UTTARA: record("Uttara, Dhaka", "13900000.0"),
+                          MIRPUR: record("Mirpur, Dhaka", "13000000.0")}, "2026-10-01")
+    (drop,) = history.price_drops()
+    assert (drop["url"], drop["neighborhood"], drop["change_pct"]) == (UTTARA, "Uttara", -4.14)
+    assert history.price_drops(neighborhood="uttara", since="2026-10-01") == [drop]
+    assert history.price_drops(neighborhood="Mirpur") == []
+    assert history.price_drops(until="2026-09-30") == []
+
+
+def test_zero_old_price_is_not_a_drop(history):
+    history.add_snapshot({UTTARA: record("Uttara, Dhaka", "0")}, "2026-09-01")
+    history.add_snapshot({UTTARA: record("Uttara, Dhaka", "-1")}, "2026-10-01")
+    assert history.price_drops() == []
+
+
+def test_out_of_order_snapshot_is_rejected(history):
+    history.add_snapshot({UTTARA: record("Uttara, Dhaka", "14500000.0")}, "2026-10-01")
+    history.add_snapshot({UTTARA: record("Uttara, Dhaka", "14500000.0")}, "2026-10-01")
+    with pytest.raises(ValueError):
+        history.add_snapshot({UTTARA: record("Uttara, Dhaka", "13900000.0")}, "2026-09-15")
+    assert [snapshot["scrape_date"] for snapshot in history.snapshots()] == ["2026-10-01", "2026-10-01"]
+
+
+def test_read_records_skips_missing_urls_and_duplicates(tmp_path):
+    path = tmp_path / "raw.csv"
+    path.write_text("Location,Area_sqft,Price,Price_BDT,Bedroom,Bathroom,Floor,For,Property_Type,URL\n"
+                    f"\"Uttara, Dhaka\",1437,BDT 1.45 Crore,14500000.0,3,2,N/A,Sell,Flat,{UTTARA}\n"
+                    f"\"Uttara, Dhaka\",1437,BDT 1.5 Crore,15000000.0,3,2,8,Sell,Flat,{UTTARA}\n"
+                    "\"Mirpur, Dhaka\",1257,BDT 1.26 Crore,12600000.0,3,3,2,Sell,Flat,N/A\n", encoding="utf-8")
+    records = read_records(str(path))
+    assert list(records) == [UTTARA]
+    assert records[UTTARA]["Floor"] is None and records[UTTARA]["Price_BDT"] == "14500000.0"
+
+
+def test_read_records_from_jsonl(tmp_path):
+    path = tmp_path / "raw.jsonl"
+    rows = [{"URL": UTTARA, "Location": "Uttara, Dhaka", "Price_BDT": 14500000.0, "Floor": "N/A", "Bedroom": 3},
+            {"URL": "N/A", "Location": "Mirpur, Dhaka"}]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    records = read_records(str(path))
+    assert list(records) == [UTTARA]
+    assert records[UTTARA]["Price_BDT"] == "14500000.0" and records[UTTARA]["Bedroom"] == "3"
+    assert records[UTTARA]["Floor"] is None and records[UTTARA]["Bathroom"] is None
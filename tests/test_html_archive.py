@@ -0,0 +1,76 @@
+import gzip
+import os
+
+from html_archive import HtmlArchive, latest_entries, load_index, map_pages, read_page
+from scraping import reextract
+from sinks import read_records
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+BASE_URL = "https://brokeragebd.com/property/"
+MIRPUR = BASE_URL + "1257-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur/"
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def page_length(url, html):
+    return url, len(html)
+
+
+def test_pages_round_trip_and_duplicates_are_stored_once(tmp_path):
+    folder = str(tmp_path)
+    archive = HtmlArchive()
+    archive.store(BASE_URL, "<html>ignored</html>", "listing")  # Not opened yet
+    archive.open(folder, run_id="1")
+    archive.store(BASE_URL, fixture("listing_page.html"), "listing")
+    archive.store(MIRPUR, fixture("detail_table.html"), "detail")
+    archive.store(BASE_URL + "page/2/", fixture("listing_page.html"), "listing")
+    archive.close()
+    assert (archive.stored, archive.deduplicated) == (2, 1)
+
+    first, second, third = load_index(folder)
+    assert (first["segment"], first["offset"]) == ("segment-1.gz", 0)
+    assert second["offset"] == first["length"]
+    assert (third["offset"], third["length"]) == (first["offset"], first["length"])
+    assert os.path.getsize(os.path.join(folder, "segment-1.gz")) == first["length"] + second["length"]
+    # Members are complete gzip streams, so the whole segment decompresses too
+    with gzip.open(os.path.join(folder, "segment-1.gz"), "rt", encoding="utf-8") as f:
+        assert f.read() == fixture("listing_page.html") + fixture("detail_table.html")
+    assert read_page(folder, second) == fixture("detail_table.html")
+    assert read_page(folder, third) == fixture("listing_page.html")
+
+    # A later run points unchanged pages at the earlier segment
+    archive = HtmlArchive()
+    archive.open(folder, run_id="2")
+    archive.store(MIRPUR, fixture("detail_table.html"), "detail")
+    archive.store(MIRPUR, fixture("detail_meta.html"), "detail")
+    archive.close()
+    assert (archive.stored, archive.deduplicated) == (1, 1)
+    unchanged, changed = load_index(folder)[3:]
+    assert unchanged["segment"] == "segment-1.gz" and changed["segment"] == "segment-2.gz"
+    assert latest_entries(folder, "detail") == {MIRPUR: changed}
+    assert map_pages(folder, load_index(folder), page_length, workers=1, batch_size=2) == [
+        (BASE_URL, len(fixture("listing_page.html"))), (MIRPUR, len(fixture("detail_table.html"))),
+        (BASE_URL + "page/2/", len(fixture("listing_page.html"))), (MIRPUR, len(fixture("detail_table.html"))),
+        (MIRPUR, len(fixture("detail_meta.html")))]
+
+
+def test_reextract_rebuilds_records_from_the_archive(tmp_path):
+    folder = str(tmp_path / "archive")
+    archive = HtmlArchive()
+    archive.open(folder, run_id="1")
+    archive.store(BASE_URL, fixture("listing_page.html"), "listing")
+    archive.store(MIRPUR, fixture("detail_table.html"), "detail")
+    archive.close()
+
+    output = str(tmp_path / "raw.csv")
+    reextract(folder, output, workers=1)
+    records = {record["URL"]: record for record in read_records(output)}
+    assert len(records) == 4
+    mirpur = records[MIRPUR]
+    assert (mirpur["Floor"], mirpur["Bathroom"], mirpur["Price"]) == ("2", "3", "BDT 1.26 Crore")
+    # Listings without an archived detail page get a record built from their card
+    uttara = records[BASE_URL + "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/"]
+    assert (uttara["Location"], uttara["Price"]) == ("Uttara, Dhaka", "BDT 1.45 Crore")
@@ -0,0 +1,112 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_fetch import create_session
+from incremental import ChangeTracker, card_fingerprint
+from journal import CrawlJournal, load_journal
+from pagination import crawl_listing_pages
+from scraping import SITEMAP_CARD, crawl_listing_urls
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    """Serves the saved listing page for every page except page 2, which fails."""
+
+    def do_GET(self):
+        if self.path.startswith("/property/page/2/"):
+            self.send_response(500)
+            self.end_headers()
+            return
+        with open(os.path.join(FIXTURES, "listing_page.html"), "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def card(price):
+    return {"title": "flat", "location": "Uttara, Dhaka", "price": price}
+
+
+def test_failed_listing_page_yields_none(site):
+    start = site + "/property/"
+    pages = list(crawl_listing_pages(create_session(retries=0), start, start + "page/{page}/", 1, 3, workers=2))
+    assert [page_num for page_num, _, _ in pages] == [1, 2, 3]
+    assert pages[1][2] is None
+    assert len(pages[0][2]) == len(pages[2][2]) == 4
+
+
+def test_failed_pages_do_not_count_toward_early_stop():
+    tracker = ChangeTracker({"a": card_fingerprint(card("1"))}, stop_after_pages=2)
+    tracker.observe("a", card("1"))
+    assert not tracker.end_page()
+    tracker.page_failed()
+    tracker.page_failed()
+    assert not tracker.stopped_early
+    assert tracker.end_page()
+
+
+def test_only_listings_past_the_early_stop_are_carried_over():
+    # Previous index in page order: a, b, c on crawled pages; d, e past the stop
+    previous = {url: card_fingerprint(card("1")) for url in "abcde"}
+    tracker = ChangeTracker(previous, stop_after_pages=1)
+    tracker.observe("new", card("1"))
+    tracker.observe("a", card("1"))
+    assert not tracker.end_page()
+    tracker.observe("c", card("1"))
+    assert tracker.end_page()
+    assert tracker.carried_over(["new", "a", "c"]) == ["d", "e"]
+    assert tracker.dropped == {"b"}
+    assert list(tracker.merged_index()) == ["new", "a", "c", "d", "e"]
+
+
+def test_failed_or_complete_crawls_change_what_is_carried_over():
+    previous = {url: None for url in "abc"}
+    tracker = ChangeTracker(previous)
+    tracker.observe("c", card("1"))
+    tracker.page_failed()
+    assert tracker.carried_over(["c"]) == ["a", "b"]
+
+    tracker = ChangeTracker(previous)
+    tracker.observe("a", card("1"))
+    tracker.complete = True
+    assert tracker.carried_over(["a"]) == []
+    assert tracker.dropped == {"b", "c"}
+
+
+def test_resumed_step1_replays_journaled_cards(tmp_path):
+    path = str(tmp_path / "crawl.jsonl")
+    journal = CrawlJournal(path)
+    journal.log_card("a", card("1"))
+    journal.log_card("b", card("2"))
+    journal.log_card("c", SITEMAP_CARD)
+    journal.mark_step_done("step1")
+    journal.close()
+
+    previous = {"a": card_fingerprint(card("1")), "b": card_fingerprint(card("1")), "c": card_fingerprint(card("1"))}
+    tracker = ChangeTracker(previous)
+    journal = CrawlJournal(path, resume=True)
+    all_urls, _ = crawl_listing_urls(None, journal, load_journal(path), tracker)
+    journal.close()
+    assert all_urls == ["a", "b", "c"]
+    # b was repriced before the interruption, so its stale record must not be reused
+    assert [tracker.needs_visit(url) for url in all_urls] == [False, True, False]
+    assert list(tracker.merged_index()) == ["a", "b", "c"]
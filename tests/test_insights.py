@@ -0,0 +1,91 @@
+import csv
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from insights import InsightsService, make_handler
+
+ROWS = [
+    ("Mirpur, Dhaka", "Mirpur", 1200, 9600000, 3, "Sell", "Flat"),
+    ("Mirpur, Dhaka", "Mirpur", 1500, 12000000, 3, "Sell", "Flat"),
+    ("Mirpur, Dhaka", "Mirpur", 900, 25000, 2, "Rent", "Flat"),
+    ("Gulshan, Dhaka", "Gulshan", 2500, 50000000, 4, "Sell", "Apartment"),
+    ("Uttara, Dhaka", "Uttara", 1437, 14500000, 3, "Sell", "Flat"),
+]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = str(tmp_path / "clean.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Location", "Neighborhood", "Area_sqft", "Price_BDT", "Bedroom", "For", "Property_Type"])
+        writer.writerows(ROWS)
+    return path
+
+
+@pytest.fixture
+def server(dataset):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(InsightsService(dataset)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, method="GET"):
+    request = urllib.request.Request(url, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_stats_with_category_and_range_filters(server):
+    status, body = get(server + "/stats?metric=price&Location=Mirpur&For=Sell&min_Area_sqft=1000")
+    assert status == 200
+    assert (body["count"], body["mean"], body["min"], body["max"]) == (2, 10800000.0, 9600000.0, 12000000.0)
+    status, body = get(server + "/stats?metric=ppsf&Neighborhood=Uttara")
+    assert body["mean"] == pytest.approx(14500000 / 1437)
+
+
+def test_distribution_and_listings(server):
+    status, body = get(server + "/distribution?column=Bedroom&Location=Mirpur")
+    assert (status, body["distribution"]) == (200, {"3": 2, "2": 1})
+    status, body = get(server + "/listings?Bedroom=3&limit=1&offset=1")
+    assert (status, body["count"], len(body["listings"])) == (200, 3, 1)
+    assert body["listings"][0]["Price_BDT"] == 12000000.0
+
+
+def test_bad_queries_are_rejected(server):
+    assert get(server + "/stats?min_Price_BDT=abc")[0] == 400
+    assert get(server + "/stats?Bedroom=three")[0] == 400
+    assert get(server + "/stats?Colour=red")[0] == 400
+    assert get(server + "/stats?metric=volume")[0] == 400
+    assert get(server + "/distribution?column=price&bins=0")[0] == 400
+    assert get(server + "/distribution?column=price&bins=-3")[0] == 400
+    assert get(server + "/listings?limit=-1")[0] == 400
+    assert get(server + "/listings?offset=-2")[0] == 400
+    assert get(server + "/listings?limit=ten")[0] == 400
+    assert get(server + "/nothing")[0] == 404
+
+
+def test_missing_dataset_is_unavailable(server, dataset):
+    assert get(server + "/health")[0] == 200
+    os.remove(dataset)
+    status, body = get(server + "/stats?metric=price")
+    assert status == 503 and "dataset unavailable" in body["error"]
+    assert get(server + "/reload", method="POST")[0] == 503
+
+
+def test_new_snapshot_is_picked_up(server, dataset):
+    assert get(server + "/stats?metric=price")[1]["count"] == 5
+    with open(dataset, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(("Banani, Dhaka", "Banani", 3000, 90000000, 4, "Sell", "Flat"))
+    assert get(server + "/stats?metric=price")[1]["count"] == 6
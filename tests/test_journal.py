@@ -0,0 +1,43 @@
+from journal import CrawlJournal, load_journal
+
+
+def test_resume_rebuilds_state(tmp_path):
+    path = str(tmp_path / "crawl.jsonl")
+    journal = CrawlJournal(path, fsync_every=2)
+    journal.log_page(1, "https://brokeragebd.com/property/")
+    journal.log_card("https://brokeragebd.com/property/a/", {"title": "A"})
+    journal.log_card("https://brokeragebd.com/property/b/", {"title": "B"})
+    journal.log_page(2, "https://brokeragebd.com/property/page/2/")
+    journal.log_card("https://brokeragebd.com/property/a/", {"title": "A again"})
+    journal.mark_step_done("step1")
+    journal.log_record({"URL": "https://brokeragebd.com/property/a/", "Price": "BDT 1 Crore"})
+    journal.close()
+
+    state = load_journal(path)
+    assert state["urls"] == ["https://brokeragebd.com/property/a/", "https://brokeragebd.com/property/b/"]
+    assert state["cards"]["https://brokeragebd.com/property/a/"] == {"title": "A again"}
+    assert state["last_page"] == (2, "https://brokeragebd.com/property/page/2/")
+    assert state["done_steps"] == {"step1"}
+    assert list(state["records"]) == ["https://brokeragebd.com/property/a/"]
+
+
+def test_resume_appends_and_skips_torn_line(tmp_path):
+    path = str(tmp_path / "crawl.jsonl")
+    journal = CrawlJournal(path)
+    journal.log_card("https://brokeragebd.com/property/a/", {"title": "A"})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"kind": "record", "record": {"URL": "https://brok')  # Crash mid-write
+
+    journal = CrawlJournal(path, resume=True)
+    journal.log_card("https://brokeragebd.com/property/b/", {"title": "B"})
+    journal.close()
+
+    state = load_journal(path)
+    assert state["urls"] == ["https://brokeragebd.com/property/a/", "https://brokeragebd.com/property/b/"]
+    assert state["records"] == {}
+
+
+def test_missing_journal_is_empty_state(tmp_path):
+    state = load_journal(str(tmp_path / "none.jsonl"))
+    assert state == {"urls": [], "cards": {}, "records": {}, "last_page": None, "done_steps": set()}
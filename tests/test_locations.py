@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from locations import normalize_locations, resolve, resolve_column
+
+
+def listed(column):
+    return [None if pd.isna(value) else value for value in column]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Uttara, Dhaka", ("Uttara", None)),
+    ("Uttara K8", ("Uttara", None)),
+    ("mirpur-10", ("Mirpur", "Mirpur 10")),
+    ("Section 6, Mirpur, Dhaka", ("Mirpur", "Mirpur 6")),
+    ("Sector 13, Uttara, Dhaka", ("Uttara", "Uttara 13")),
+    ("Gulshan 2", ("Gulshan", "Gulshan 2")),
+    ("Banani DOHS, Dhaka", ("Banani DOHS", None)),
+    ("Road 5, Mirpur DOHS", ("Mirpur DOHS", None)),
+    ("Pallabi, Mirpur", ("Mirpur", "Pallabi")),
+    ("Bashundhara R/A", ("Bashundhara", None)),
+    ("Basundhara", ("Bashundhara", None)),
+    ("Mohammedpur, Dhaka", ("Mohammadpur", None)),
+    ("Dhaka", (None, None)),
+    ("Chittagong", (None, None)),
+    ("N/A", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+])
+def test_resolve(text, expected):
+    assert resolve(text) == expected
+
+
+def test_resolve_column_keeps_index_and_missing_values():
+    values = pd.Series(["Uttara, Dhaka", None, "mirpur-10", "Uttara, Dhaka"], index=[10, 11, 12, 13])
+    table = resolve_column(values)
+    assert table.index.equals(values.index)
+    assert listed(table["Neighborhood"]) == ["Uttara", None, "Mirpur", "Uttara"]
+    assert listed(table["Sub_Area"]) == [None, None, "Mirpur 10", None]
+    assert resolve_column(pd.Series([None, None], dtype=object))["Neighborhood"].isna().all()
+
+
+def test_slug_fills_neighborhood_and_sub_area():
+    locations = pd.Series(["Mirpur, Dhaka", None, "Gulshan, Dhaka"])
+    urls = pd.Series(["https://brokeragebd.com/property/1257-sft-3-bedroom-flat-for-sale-in-mirpur-2/",
+                      "https://brokeragebd.com/property/1437-sft-3-bedroom-flat-for-sale-in-uttara-k8/",
+                      "https://brokeragebd.com/property/2000-sft-4-bedroom-flat-for-sale-in-banani/"])
+    result = normalize_locations(locations, urls)
+    assert listed(result["Neighborhood"]) == ["Mirpur", "Uttara", "Gulshan"]
+    # The slug's sub-area only counts when it names the same neighborhood
+    assert listed(result["Sub_Area"]) == ["Mirpur 2", None, None]
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from near_dups import assign_clusters, block_key, cluster_rows, drop_near_duplicates, unit_code
+
+BASE_URL = "https://brokeragebd.com/property/"
+
+# Real listings from the raw crawl: same building and size, but different
+# units (floor and unit code in the slug), sometimes a different price
+ROWS = [
+    ("Uttara, Dhaka", 1437, 13900000.0, 3, 9, "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-e9/"),
+    ("Uttara, Dhaka", 1437, 13900000.0, 3, 6, "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-h6/"),
+    ("Uttara, Dhaka", 1437, 13900000.0, 3, 2, "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-j2-2/"),
+    ("Uttara, Dhaka", 1437, 13900000.0, 3, 9, "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-f9/"),
+    ("Uttara, Dhaka", 1437, 14500000.0, 3, 8, "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-b8/"),
+    ("Uttara, Dhaka", 1437, 14400000.0, 3, 8, "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-l8-2/"),
+    ("Mirpur, Dhaka", 1042, 12000000.0, 3, 7, "1042-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur-b7/"),
+    ("Mirpur, Dhaka", 1042, 12000000.0, 3, 6, "1042-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur-c6/"),
+    ("Mirpur, Dhaka", 1042, 12000000.0, 3, 6, "1042-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur-d6/"),
+    ("Savar, Dhaka", 1015, 4700000.0, 3, 5, "1015-sft-3-bedroom-flat-is-ready-for-sale-in-savar-e5/"),
+    ("Savar, Dhaka", 1015, 5000000.0, 3, 1, "1015-sft-3-bedroom-flat-is-ready-for-sale-in-savar/"),
+    # Reposts of one flat under WordPress's "-2"/"-3" slugs
+    ("Mirpur, Dhaka", 1166, 15300000.0, 3, 9, "1166-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur/"),
+    ("Mirpur, Dhaka", 1166, 15300000.0, 3, 9, "1166-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur-2/"),
+    ("Mirpur, Dhaka", 1631, 44000.0, 3, 5, "1631-sft-3-bedroom-flat-is-ready-for-rent-in-mirpur/"),
+    ("Mirpur, Dhaka", 1631, 44000.0, 3, 5, "1631-sft-3-bedroom-flat-is-ready-for-rent-in-mirpur-3/"),
+]
+
+
+def frame(rows):
+    return pd.DataFrame([{"Location": location, "Area_sqft": area, "Price_BDT": price, "Bedroom": bedrooms,
+                          "Floor": floor, "URL": BASE_URL + slug}
+                         for location, area, price, bedrooms, floor, slug in rows])
+
+
+def test_different_units_are_kept_and_reposts_are_clustered():
+    result = assign_clusters(frame(ROWS))
+    ids = result["Cluster_ID"].tolist()
+    assert len(set(ids[:11])) == 11
+    assert ids[11] == ids[12] and ids[13] == ids[14]
+    assert len(drop_near_duplicates(frame(ROWS))) == 13
+
+
+def test_unit_code_is_the_trailing_slug_token():
+    assert unit_code(BASE_URL + ROWS[0][5]) == "e9"
+    assert unit_code(BASE_URL + ROWS[2][5]) == "j2"  # the repost suffix is not a code
+    assert unit_code(BASE_URL + ROWS[10][5]) is None
+
+
+def test_price_must_match_within_tolerance():
+    same_slug = "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara/"
+    rows = [("Uttara, Dhaka", 1437, 13900000.0, 3, 8, same_slug),
+            ("Uttara, Dhaka", 1437, 14000000.0, 3, 8, same_slug.replace("/", "-2/")),
+            ("Uttara, Dhaka", 1437, 14400000.0, 3, 8, same_slug.replace("/", "-3/"))]
+    ids = assign_clusters(frame(rows))["Cluster_ID"].tolist()
+    assert ids[0] == ids[1] != ids[2]
+
+
+def test_rows_missing_block_fields_are_never_matched():
+    slug = BASE_URL + "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara/"
+    assert block_key(None, 1437, 3, 8) is None
+    assert block_key("Uttara, Dhaka", float("nan"), 3, 8) is None
+    assert block_key("Uttara, Dhaka", 1437, None) is None
+    assert block_key("Uttara, Dhaka", 1437, 3) == ("uttara", 1437, 3, None)
+    keys = [block_key(None, 1437, 3, 8), block_key("N/A", 1437, 3, 8)]
+    assert cluster_rows(keys, [slug, slug], [1.0, 1.0]) == [0, 1]
@@ -0,0 +1,68 @@
+import os
+
+from page_parser import missing_required, parse_listing_cards, parse_pagination_links, parse_property_detail
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+BASE_URL = "https://brokeragebd.com/property/"
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_listing_cards_in_page_order_with_card_fields():
+    cards = parse_listing_cards(fixture("listing_page.html"), BASE_URL)
+    urls = [url for url, _ in cards]
+    assert urls == [
+        BASE_URL + "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/",
+        BASE_URL + "1257-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur/",
+        BASE_URL + "1200-sft-2-bedroom-flat-for-rent-in-gulshan-2/",
+        BASE_URL + "2522-sft-3-bedroom-flat-is-ready-for-sale-in-gulshan/",
+    ]
+    first = cards[0][1]
+    assert first == {"title": "1437 sft 3-bedroom flat is ready for sale in Uttara",
+                     "location": "Uttara, Dhaka", "price": "BDT 1.45 Crore"}
+    # Relative href with a fragment is made absolute and the fragment dropped
+    assert cards[1][1]["location"] == "Mirpur, Dhaka"
+    assert cards[2][1] == {"title": "1200 sft 2-bedroom flat for rent in Gulshan 2", "location": None,
+                           "price": "BDT 44 Thousand Per Month"}
+    # Links outside the cards only give the URL and link text
+    assert cards[3][1] == {"title": "2522 sft flat in Gulshan", "location": None, "price": None}
+
+
+def test_listing_cards_skip_archive_and_pagination_links():
+    urls = [url for url, _ in parse_listing_cards(fixture("listing_page.html"), BASE_URL)]
+    assert BASE_URL not in urls
+    assert not any("/page/" in url for url in urls)
+
+
+def test_pagination_links_are_absolute():
+    links = parse_pagination_links(fixture("listing_page.html"), BASE_URL)
+    assert set(links) == {BASE_URL, BASE_URL + "page/2/", BASE_URL + "page/3/"}
+
+
+def test_detail_from_json_ld():
+    detail = parse_property_detail(fixture("detail_json_ld.html"), BASE_URL + "1437-sft-3-bedroom-flat-in-uttara/")
+    assert detail == {"area_sqft": 1437, "bedrooms": 3, "bathrooms": 2, "floor": 8, "for_rent_sell": "Sell",
+                      "price": "BDT 14500000", "location": "Uttara, Dhaka", "property_type": "Apartment"}
+
+
+def test_detail_from_houzez_table():
+    detail = parse_property_detail(fixture("detail_table.html"), BASE_URL + "1257-sft-flat-in-mirpur/")
+    assert detail == {"area_sqft": 1257, "bedrooms": 3, "bathrooms": 3, "floor": 2, "for_rent_sell": "Sell",
+                      "price": "BDT 1.26 Crore", "location": "Mirpur, Dhaka", "property_type": "Flat"}
+
+
+def test_detail_from_meta_tags_and_text():
+    detail = parse_property_detail(fixture("detail_meta.html"), BASE_URL + "1200-sft-2-bedroom-flat-for-rent/")
+    assert detail["price"] == "BDT 44000"
+    assert detail["for_rent_sell"] == "Rent"
+    assert (detail["area_sqft"], detail["bedrooms"], detail["bathrooms"], detail["floor"]) == (1200, 2, 2, 5)
+    assert detail["location"] == "Gulshan 2, Dhaka"
+    assert missing_required(detail) == []
+
+
+def test_missing_required_fields_trigger_fallback():
+    detail = parse_property_detail("<html><body><p>Nothing here</p></body></html>", BASE_URL + "x/")
+    assert missing_required(detail) == ["area_sqft", "price", "location"]
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pricing import RidgePriceModel, refit, train_or_load
+
+
+def listings(size, seed, neighborhoods=("Gulshan", "Mirpur", "Uttara")):
+    rng = np.random.default_rng(seed)
+    base = {"Gulshan": 20000.0, "Mirpur": 9000.0, "Uttara": 11000.0, "Bashundhara": 13000.0}
+    neighborhood = rng.choice(list(neighborhoods), size)
+    area = rng.integers(800, 2500, size).astype("float64")
+    return pd.DataFrame({
+        "Neighborhood": neighborhood, "For": "Sell", "Property_Type": "Flat",
+        "Area_sqft": area, "Bedroom": rng.integers(2, 5, size), "Bathroom": rng.integers(1, 4, size),
+        "Floor": rng.integers(1, 12, size),
+        "Price_BDT": area * np.array([base[name] for name in neighborhood]) * rng.lognormal(0, 0.05, size),
+    })
+
+
+def test_fit_recovers_neighborhood_prices():
+    df = listings(400, 1)
+    model = RidgePriceModel(alpha=0.1).fit(df)
+    estimates = model.predict(df)
+    assert np.median(np.abs(estimates / df["Price_BDT"] - 1)) < 0.1
+    gulshan, mirpur = model.predict(pd.DataFrame({
+        "Neighborhood": ["Gulshan", "Mirpur"], "For": "Sell", "Property_Type": "Flat",
+        "Area_sqft": 1500.0, "Bedroom": 3, "Bathroom": 2, "Floor": 5}))
+    assert gulshan > 1.8 * mirpur
+
+
+def test_save_load_round_trip(tmp_path):
+    df = listings(200, 2)
+    model = RidgePriceModel().fit(df)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = RidgePriceModel.load(path)
+    assert loaded.rows == model.rows == 200
+    assert loaded.feature_names == model.feature_names
+    np.testing.assert_allclose(loaded.predict(df), model.predict(df))
+
+
+def test_refit_from_disk_adds_a_new_category(tmp_path):
+    old, new = listings(200, 3), listings(100, 4, neighborhoods=("Mirpur", "Bashundhara"))
+    path = str(tmp_path / "model.npz")
+    RidgePriceModel().fit(old).save(path)
+
+    refitted = refit(path, new, model_dir=str(tmp_path))
+    assert "Neighborhood=Bashundhara" in refitted.feature_names
+    # Refitting the saved file gives the same model as folding the rows in without saving
+    combined = pd.concat([old, new], ignore_index=True)
+    in_memory = RidgePriceModel().fit(old).partial_fit(new)
+    np.testing.assert_allclose(refitted.predict(combined), in_memory.predict(combined))
+    assert refitted.rows == 300
+    # Refitting the same snapshot again is a cache hit
+    assert refit(path, new, model_dir=str(tmp_path)).rows == 300
+
+
+def test_refitting_the_same_rows_changes_nothing(tmp_path):
+    df = listings(200, 7).assign(URL=[f"https://brokeragebd.com/property/{i}/" for i in range(200)])
+    path = str(tmp_path / "model.npz")
+    model = RidgePriceModel().fit(df)
+    model.save(path)
+
+    refitted = refit(path, df.sample(frac=1, random_state=0), model_dir=str(tmp_path))
+    np.testing.assert_array_equal(refitted.weights, model.weights)
+    assert refitted.rows == 200
+    # A live listing repeated in the next snapshot is not counted again; a new or repriced one is
+    snapshot = pd.concat([df, df.iloc[:1], listings(1, 8).assign(URL="https://brokeragebd.com/property/new/")],
+                         ignore_index=True)
+    snapshot.loc[1, "Price_BDT"] *= 0.9
+    assert model.partial_fit(snapshot).rows == 202
+    assert model.partial_fit(snapshot).rows == 202
+
+
+def test_rows_without_prices():
+    df = listings(50, 5)
+    unpriced = df.assign(Price_BDT=np.nan)
+    with pytest.raises(ValueError):
+        RidgePriceModel().fit(unpriced)
+    model = RidgePriceModel().fit(df)
+    weights = model.weights.copy()
+    model.partial_fit(unpriced.assign(Neighborhood="Banani"))
+    np.testing.assert_array_equal(model.weights, weights)
+    assert model.rows == 50
+
+
+def test_train_or_load_caches_by_data_hash(tmp_path, capsys):
+    df = listings(100, 6)
+    first = train_or_load(df, model_dir=str(tmp_path))
+    second = train_or_load(df, model_dir=str(tmp_path))
+    assert "Loaded cached model" in capsys.readouterr().out
+    np.testing.assert_allclose(first.predict(df), second.predict(df))
+    assert len(list(tmp_path.iterdir())) == 1
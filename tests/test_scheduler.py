@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_fetch import create_session
+from scheduler import HostScheduler
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers /flaky with 429 (Retry-After: 1), then 503, then 200s; /slow holds each request briefly."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.times.append(time.monotonic())
+            status = server.script.pop(0) if self.path == "/flaky" and server.script else 200
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        if self.path == "/slow":
+            time.sleep(0.1)
+        with server.lock:
+            server.in_flight -= 1
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.lock = threading.Lock()
+    server.script = [429, 503]
+    server.times = []
+    server.in_flight = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_throttling_halves_rate_honours_retry_after_and_recovers(server):
+    scheduler = HostScheduler(rate=8.0, burst=1, increase_after=2, increase_step=0.5, base_backoff=0.01)
+    session = create_session(scheduler=scheduler)
+    url = f"http://127.0.0.1:{server.server_port}/flaky"
+
+    assert scheduler.request(session, url).status_code == 200
+    host = scheduler.hosts[f"127.0.0.1:{server.server_port}"]
+    # 429 then 503: halved twice
+    assert host.rate == 2.0
+    assert scheduler.stats == {"requests": 3, "throttled": 2, "retries": 2, "failed": 0}
+    assert server.times[1] - server.times[0] >= 1.0
+
+    # Every second healthy response adds 0.5 requests/second
+    for _ in range(3):
+        scheduler.request(session, url)
+    assert host.rate == 3.0
+
+
+def test_retry_after_is_capped_at_max_backoff(server):
+    scheduler = HostScheduler(rate=8.0, burst=1, base_backoff=0.01, max_backoff=0.2)
+    session = create_session(scheduler=scheduler)
+    assert scheduler.request(session, f"http://127.0.0.1:{server.server_port}/flaky").status_code == 200
+    assert 0.2 <= server.times[1] - server.times[0] < 1.0
+
+
+def test_max_concurrency_caps_requests_in_flight(server):
+    scheduler = HostScheduler(rate=1000.0, burst=100, max_concurrency=2)
+    session = create_session(pool_size=8, scheduler=scheduler)
+    url = f"http://127.0.0.1:{server.server_port}/slow"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda _: scheduler.request(session, url).status_code, range(8)))
+    assert statuses == [200] * 8
+    assert server.peak == 2
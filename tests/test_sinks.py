@@ -0,0 +1,53 @@
+import importlib.util
+
+import pytest
+
+from sinks import RECORD_COLUMNS, open_sink, print_summary, read_records
+
+RECORDS = [
+    {"Location": "Uttara, Dhaka", "Area_sqft": 1437, "Price": "BDT 1.45 Crore", "Price_BDT": 14500000.0,
+     "Bedroom": 3, "Bathroom": 3, "Floor": 8, "For": "Sell", "Property_Type": "Apartment",
+     "URL": "https://brokeragebd.com/property/1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/"},
+    {"Location": "Gulshan 2, Dhaka", "Area_sqft": 1200, "Price": "BDT 44 Thousand Per Month",
+     "Price_BDT": 44000.0, "Bedroom": 2, "Bathroom": 2, "For": "Rent", "Property_Type": "Flat",
+     "URL": "https://brokeragebd.com/property/1200-sft-2-bedroom-flat-for-rent-in-gulshan-2/"},
+]
+
+FORMATS = [".csv", ".jsonl", ".db",
+           pytest.param(".parquet", marks=pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None,
+                                                             reason="needs pyarrow"))]
+
+
+@pytest.mark.parametrize("extension", FORMATS)
+def test_round_trip_keeps_first_record_per_url(tmp_path, extension):
+    path = str(tmp_path / f"listings{extension}")
+    with open_sink(path, batch_size=1) as sink:
+        sink.write_all(RECORDS + [dict(RECORDS[0], Price="BDT 1.5 Crore")])
+    assert (sink.written, sink.duplicates) == (2, 1)
+
+    rows = list(read_records(path))
+    assert [row["URL"] for row in rows] == [record["URL"] for record in RECORDS]
+    assert list(rows[0]) == RECORD_COLUMNS
+    assert rows[0]["Price"] == "BDT 1.45 Crore"
+    assert rows[0]["Area_sqft"] == "1437" and rows[0]["Price_BDT"] == "14500000.0"
+    # Columns the record did not have are written as N/A
+    assert rows[1]["Floor"] == "N/A"
+
+
+def test_unknown_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(str(tmp_path / "listings.xlsx"))
+
+
+def test_missing_file_reads_as_empty(tmp_path):
+    assert list(read_records(str(tmp_path / "nothing.csv"))) == []
+
+
+def test_summary_counts_filled_columns(tmp_path, capsys):
+    with open_sink(str(tmp_path / "listings.csv")) as sink:
+        sink.write_all(RECORDS)
+    print_summary(sink)
+    out = capsys.readouterr().out
+    assert "Total listings collected: 2" in out
+    assert "Records with Floor: 1" in out
+    assert "- Rent: 1" in out and "- Sell: 1" in out
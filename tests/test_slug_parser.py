@@ -0,0 +1,72 @@
+import itertools
+import random
+
+import pandas as pd
+
+from slug_parser import FIELDS, legacy_title_info, legacy_url_info, parse_column, parse_slug, parse_title
+
+BASE_URL = "https://brokeragebd.com/property/"
+
+TITLES = [
+    "1437 sft 3-bedroom flat is ready for sale in Uttara",
+    "1200 sft 2-bedroom flat for rent in Gulshan 2",
+    "1257sft 3 Bedroom Flat For Sale In Mirpur, Dhaka",
+    "3 bedroom 1650 SFT apartment for sale in Bashundhara R/A.",
+    "2000 sqft 4-bedroom duplex in Dhanmondi",
+    "1500 ft commercial space for rent in Banani",
+    "Plot for sale at Purbachal",
+    "Duplex house in Savar",
+    "",
+    "N/A",
+]
+
+SLUGS = [
+    "1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/",
+    "1200-sft-2-bedroom-flat-for-rent-in-gulshan-2/",
+    "2522-sft-3-bedroom-flat-is-ready-for-sale-in-gulshan/",
+    "2000-sqft-4-bedroom-apartment-for-sale-in-dhanmondi/",
+    "3-bedroom-house-for-rent-in-banani-dohs/",
+    "3-katha-plot-for-sale-in-purbachal/",
+    "1650-sft-apartment-in-bashundhara-r-a-block-d/",
+]
+
+
+def random_texts(separator, count=2000):
+    """Titles or slugs built from shuffled number/unit/location pieces."""
+    rng = random.Random(0)
+    pieces = ["1437", "3", "sft", "sqft", "ft", "bedroom", "bedrooms", "flat", "house", "apartment",
+              "for", "rent", "sale", "in", "Uttara", "Mirpur", "10", "-", ",", "."]
+    return [separator.join(rng.choice(pieces) for _ in range(rng.randint(1, 10))) for _ in range(count)]
+
+
+def test_title_parser_matches_legacy_regexes():
+    for title in TITLES + random_texts(" ") + random_texts(""):
+        parsed = parse_title(title)
+        legacy = legacy_title_info(title)
+        assert {key: parsed[key] for key in legacy} == legacy, title
+
+
+def test_slug_parser_matches_legacy_regexes():
+    for slug in SLUGS + random_texts("-"):
+        url = BASE_URL + slug
+        assert parse_slug(url) == legacy_url_info(url), url
+
+
+def test_only_sft_is_an_area_unit():
+    # The legacy regexes never read "sqft" or "ft" as an area
+    assert parse_title("2000 sqft 4-bedroom duplex in Dhanmondi")["area_sqft"] is None
+    assert parse_slug(BASE_URL + SLUGS[3])["area_sqft"] is None
+    assert parse_slug(BASE_URL + SLUGS[0]) == {"area_sqft": 1437, "bedrooms": 3, "location": "Uttara K8",
+                                               "for_rent_sell": "Sell", "property_type": "Flat"}
+
+
+def test_parse_column_matches_per_value_parsing():
+    values = pd.Series(list(itertools.islice(itertools.cycle(TITLES + [None]), 40)), index=range(100, 140))
+    table = parse_column(values, "title")
+    assert list(table.columns) == list(FIELDS)
+    assert table.index.equals(values.index)
+    for index, title in values.items():
+        expected = parse_title(title)
+        row = table.loc[index]
+        for field in FIELDS:
+            assert (None if pd.isna(row[field]) else row[field]) == expected[field], (title, field)
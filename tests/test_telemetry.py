@@ -0,0 +1,60 @@
+import json
+
+from telemetry import BUCKETS, Telemetry
+
+
+def enabled():
+    telemetry = Telemetry()
+    telemetry.enable()
+    return telemetry
+
+
+def test_disabled_records_nothing(tmp_path):
+    telemetry = Telemetry()
+    telemetry.count("pages")
+    with telemetry.timer("fetch_seconds"):
+        pass
+    telemetry.write(str(tmp_path / "metrics.prom"))
+    assert (telemetry.counters, telemetry.histograms) == ({}, {})
+    assert not (tmp_path / "metrics.prom").exists()
+
+
+def test_prometheus_text():
+    telemetry = enabled()
+    telemetry.count("pages", step="listing")
+    telemetry.count("pages", 2, step="listing")
+    telemetry.observe("fetch_seconds", 0.02, step="detail")
+    telemetry.observe("fetch_seconds", 100, step="detail")
+    lines = telemetry.to_prometheus().splitlines()
+    assert lines[:2] == ["# TYPE crawl_pages counter", 'crawl_pages{step="listing"} 3']
+    assert lines[2] == "# TYPE crawl_fetch_seconds histogram"
+    assert 'crawl_fetch_seconds_bucket{step="detail",le="0.01"} 0' in lines
+    assert 'crawl_fetch_seconds_bucket{step="detail",le="0.025"} 1' in lines
+    assert 'crawl_fetch_seconds_bucket{step="detail",le="60"} 1' in lines
+    assert 'crawl_fetch_seconds_bucket{step="detail",le="+Inf"} 2' in lines
+    assert lines[-2:] == ['crawl_fetch_seconds_sum{step="detail"} 100.020000',
+                          'crawl_fetch_seconds_count{step="detail"} 2']
+
+
+def test_label_values_are_escaped():
+    telemetry = enabled()
+    telemetry.count("selector_misses", source='[class*="item-listing"]')
+    telemetry.count("selector_misses", source="C:\\pages\nlisting")
+    lines = telemetry.to_prometheus().splitlines()
+    assert 'crawl_selector_misses{source="C:\\\\pages\\nlisting"} 1' in lines
+    assert 'crawl_selector_misses{source="[class*=\\"item-listing\\"]"} 1' in lines
+
+
+def test_json_export(tmp_path):
+    telemetry = enabled()
+    telemetry.count("pages", step="listing")
+    telemetry.observe("fetch_seconds", 0.3)
+    path = tmp_path / "out" / "metrics.json"
+    telemetry.write(str(path))
+    written = json.loads(path.read_text(encoding="utf-8"))
+    assert written["counters"] == [{"name": "pages", "labels": {"step": "listing"}, "value": 1}]
+    (histogram,) = written["histograms"]
+    assert (histogram["name"], histogram["labels"], histogram["count"]) == ("fetch_seconds", {}, 1)
+    assert histogram["sum"] == 0.3
+    assert list(histogram["buckets"]) == [str(b) for b in BUCKETS] + ["+Inf"]
+    assert histogram["buckets"]["0.5"] == 1 and sum(histogram["buckets"].values()) == 1
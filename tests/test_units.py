@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from cleaning import clean_rows
+from units import parse_area, parse_areas, parse_price, parse_prices
+
+
+def test_prices_and_areas_match_the_scalar_parsers():
+    prices = pd.Series(["BDT 1.45 Crore", "Tk 45 lakh", "BDT 44 Thousand Per Month", "1,20,00,000",
+                        "Call for price", None, "BDT 1.45 Crore", "bdt 5 per week"], index=list("abcdefgh"))
+    parsed = parse_prices(prices)
+    assert parsed.index.equals(prices.index)
+    assert parsed.tolist()[:4] == [14500000.0, 4500000.0, 44000.0, 12000000.0]
+    assert parsed.isna().tolist()[4:6] == [True, True]
+    assert parsed["h"] == 5.0
+    for key, text in prices.items():
+        expected = parse_price(text)
+        assert np.isnan(parsed[key]) if expected is None else parsed[key] == expected
+
+    areas = pd.Series(["1437 sft", "3 katha", "1,200", None, "120 sqm"])
+    assert parse_areas(areas).round(1).tolist()[:3] == [1437.0, 2160.0, 1200.0]
+    assert np.isnan(parse_areas(areas)[3])
+    assert parse_areas(areas)[4] == parse_area("120 sqm")
+
+
+def test_all_missing_or_empty_series_parse_to_nan():
+    # Regression: an all-missing column gave factorize no uniques and raised IndexError
+    missing = pd.Series([None, np.nan, None], index=[5, 6, 7], dtype=object)
+    parsed = parse_prices(missing)
+    assert parsed.index.equals(missing.index)
+    assert parsed.isna().all()
+    assert len(parse_areas(pd.Series([], dtype=object))) == 0
+
+
+def test_chunk_without_price_text_falls_back_to_price_bdt():
+    chunk = pd.DataFrame({
+        "Location": ["Uttara, Dhaka", "Mirpur, Dhaka"], "Area_sqft": [None, None], "Price": [None, None],
+        "Price_BDT": ["14500000", None], "Bedroom": ["3", "3"], "Bathroom": ["3", "2"], "Floor": ["8", None],
+        "For": ["Sell", "Sell"], "Property_Type": ["Flat", "Flat"],
+        "URL": ["https://brokeragebd.com/property/1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/",
+                "https://brokeragebd.com/property/3-bedroom-flat-for-sale-in-mirpur/"],
+    })
+    cleaned = clean_rows(chunk)
+    assert len(cleaned) == 1
+    assert cleaned["Price_BDT"].iloc[0] == 14500000.0
+    assert cleaned["Area_sqft"].iloc[0] == 1437.0
@@ -0,0 +1,31 @@
+import importlib.util
+
+import pandas as pd
+import pytest
+
+from utils import check_format, load_dataset, save_dataset
+
+needs_pyarrow = pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None, reason="needs pyarrow")
+
+
+def test_a_dataset_keeps_its_format(tmp_path):
+    partition = tmp_path / "listings_clean" / "scrape_date=2026-10-01"
+    partition.mkdir(parents=True)
+    check_format(str(tmp_path / "listings_clean"), "arrow")
+    (partition / "part-0.parquet").write_bytes(b"PAR1")
+    check_format(str(tmp_path / "listings_clean"), "parquet")
+    with pytest.raises(ValueError, match="parquet"):
+        check_format(str(tmp_path / "listings_clean"), "arrow")
+
+
+@needs_pyarrow
+def test_store_round_trip_rejects_a_second_format(tmp_path):
+    df = pd.DataFrame({"Location": ["Uttara, Dhaka", "Mirpur, Dhaka"], "Price_BDT": [14500000.0, None],
+                       "Bedroom": ["3", "N/A"]})
+    save_dataset(df, "listings", fmt="arrow", scrape_date="2026-10-01", root=str(tmp_path))
+    loaded = load_dataset("listings", columns=["Location", "Bedroom"], fmt="arrow", root=str(tmp_path))
+    assert loaded["Bedroom"].tolist()[0] == 3 and loaded["Bedroom"].isna().tolist() == [False, True]
+    with pytest.raises(ValueError):
+        save_dataset(df, "listings", fmt="parquet", scrape_date="2026-10-02", root=str(tmp_path))
+    with pytest.raises(ValueError):
+        load_dataset("listings", fmt="parquet", root=str(tmp_path))
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_fetch import create_session
+from wp_source import fetch_rest_records, fetch_sitemap_urls, map_rest_property
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "wp")
+
+
+class WordPressHandler(BaseHTTPRequestHandler):
+    """Replays recorded REST pages and sitemaps; anything else is a 404.
+
+    wp-sitemap.xml is missing, so the Yoast index is the fallback, and one
+    of the property sub-sitemaps it lists is missing too.
+    """
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/wp-json/wp/v2/properties":
+            page = int(urllib.parse.parse_qs(query)["page"][0])
+            if page > 2:
+                return self.reply(400, b'{"code": "rest_post_invalid_page_number"}')
+            return self.reply(200, self.fixture(f"properties_page{page}.json"), {"X-WP-TotalPages": "2"})
+        name = path.lstrip("/")
+        if os.path.exists(os.path.join(FIXTURES, name)):
+            return self.reply(200, self.fixture(name))
+        self.reply(404, b"Not Found")
+
+    def fixture(self, name):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            return f.read().replace("{base}", f"http://{self.headers['Host']}").encode()
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WordPressHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_rest_records_are_mapped_and_deduplicated(site):
+    records = fetch_rest_records(create_session(retries=0), site)
+    assert [record["URL"] for record in records] == [
+        "https://brokeragebd.com/property/1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/",
+        "https://brokeragebd.com/property/1200-sft-2-bedroom-flat-for-rent-in-gulshan-2/",
+        "https://brokeragebd.com/property/3-katha-plot-for-sale-in-purbachal/",
+    ]
+    assert records[0] == {
+        "Location": "Uttara, Dhaka", "Area_sqft": 1437, "Price": "BDT 14500000", "Price_BDT": 14500000.0,
+        "Bedroom": 3, "Bathroom": 3, "Floor": 8, "For": "Sell", "Property_Type": "Apartment",
+        "URL": "https://brokeragebd.com/property/1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/",
+    }
+
+
+def test_map_rest_property_fallbacks():
+    with open(os.path.join(FIXTURES, "properties_page1.json"), encoding="utf-8") as f:
+        rent = json.load(f)[1]
+    record = map_rest_property(rent)
+    # No area term leaves just the city; with no status term, "Per Month" marks a rental
+    assert record["Location"] == "Dhaka"
+    assert (record["Price"], record["Price_BDT"], record["For"]) == ("BDT 44,000 Per Month", 44000.0, "Rent")
+    assert (record["Area_sqft"], record["Bedroom"], record["Floor"]) == (1200, 2, "N/A")
+
+    with open(os.path.join(FIXTURES, "properties_page2.json"), encoding="utf-8") as f:
+        plot = json.load(f)[1]
+    record = map_rest_property(plot)
+    assert (record["Price"], record["Price_BDT"], record["Property_Type"]) == ("BDT Call for price", "N/A", "N/A")
+
+    plot["property_meta"]["fave_property_price"] = "1.2 Crore"
+    assert map_rest_property(plot)["Price_BDT"] == 12000000.0
+
+
+def test_sitemap_fallback_skips_missing_sub_sitemap(site, capsys):
+    urls = fetch_sitemap_urls(create_session(retries=0), site)
+    assert urls == [
+        (site + "property/1437-sft-3-bedroom-flat-is-ready-for-sale-in-uttara-k8/", "2026-10-14T10:02:11+00:00"),
+        (site + "property/1257-sft-3-bedroom-flat-is-ready-for-sale-in-mirpur/", "2026-10-12T15:20:37+00:00"),
+        (site + "property/1200-sft-2-bedroom-flat-for-rent-in-gulshan-2/", "2026-10-15T06:40:09+00:00"),
+    ]
+    assert "property-sitemap2.xml" in capsys.readouterr().out